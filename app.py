@@ -1,12 +1,38 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime, timedelta
-import base64
+import os
+import sqlite3
+import tempfile
+import time
 from io import BytesIO
 
+from charts import bar_chart, heatmap_chart, binned_histogram_chart, line_chart, pie_chart, tornado_chart
+from tables import paged_table
+from valuation.cache import get_cache, memoize
+from valuation import core
+from valuation.core import format_number
+from valuation.cube import CubeStore
+from valuation.export import XLSX_MIME, write_excel
+from valuation.formatting import format_numbers, format_percents
+from valuation.gradient import GRADIENT_INPUTS, calculate_stock_value_gradient
+from valuation.graph import SHARED_CACHE_SIZE, SHARED_CACHE_TTL, ValuationGraph
+from valuation.history import KIND_FUTURE, KIND_PRESENT, EvaluationHistory
+from valuation.importer import IMPORT_FORMATS, import_portfolio
+from valuation.jobs import CANCELLED, DONE, FAILED, JobRunner
+from valuation.metrics import finish_run, get_registry, instrument, lap, start_run, timed
+from valuation.montecarlo import iter_monte_carlo
+from valuation.optimizer import optimize_gift_schedule
+from valuation.parallel import default_workers, parallel_future_stock_value_grid
+from valuation.params import get_parameters, parameter_key, parameter_versions
+from valuation.portfolio import value_portfolio
+from valuation.sensitivity import PRESENT_INPUTS, heatmap_analysis, tornado_analysis
+from valuation.simulation import growth_rate_range
+
+# 이번 재실행의 단계별 소요 시간 기록 시작 (사이드바 '성능 진단' 패널에 표시)
+start_run()
+
 # 페이지 설정
 st.set_page_config(
     page_title="기업가치 약식 평가계산기",
@@ -62,11 +88,12 @@ with st.sidebar:
     st.markdown("상속세 및 증여세법에 따른 비상장주식 가치평가와 세금 계산을 도와드립니다.")
     st.markdown("---")
     
-    pages = ["1. 비상장주식 평가", "2. 주식가치 결과", "3. 현시점 세금계산", "4. 미래 주식가치", "5. 미래 세금계산"]
+    pages = ["1. 비상장주식 평가", "2. 주식가치 결과", "3. 현시점 세금계산", "4. 미래 주식가치", "5. 미래 세금계산", "6. 포트폴리오 일괄평가"]
     page = st.radio("페이지 선택", pages)
     
     st.markdown("---")
     st.info("이 앱은 참고용으로만 사용하세요. 정확한 평가는 전문가와 상담하세요.")
+lap("sidebar")
 
 # 세션 상태 초기화 (값 유지를 위해)
 if 'evaluated' not in st.session_state:
@@ -78,179 +105,235 @@ if 'stock_value' not in st.session_state:
 if 'future_stock_value' not in st.session_state:
     st.session_state.future_stock_value = None
 
-# 숫자 형식화 함수
-def format_number(num):
-    if num is None:
-        return "0"
-    return f"{int(num):,}"
+# 백그라운드 작업 (스크립트 실행을 막지 않으며, 다른 위젯을 조작해 재실행되어도 계속 진행됨)
+# 현재 페이지에 진행률을 표시한 작업이 실행 중이면 이 간격으로 다시 실행해 진행률을 갱신
+JOB_POLL_SECONDS = 0.5
+# 이번 실행에서 진행률을 표시한 실행 중인 작업 slot (스크립트가 실행될 때마다 비워짐)
+displayed_jobs = set()
+
+@st.cache_resource
+def get_job_runner():
+    # 모든 세션이 하나의 스레드 풀과 작업 목록을 공유
+    return JobRunner()
+
+def submit_job(slot, kind, func, *args, **kwargs):
+    # 같은 slot 에서 실행 중인 이전 작업은 취소하고, 새 작업 id 를 세션에 저장
+    jobs = st.session_state.setdefault("jobs", {})
+    if slot in jobs:
+        get_job_runner().cancel(jobs[slot])
+    jobs[slot] = get_job_runner().submit(kind, func, *args, **kwargs)
+
+def job_progress(slot):
+    """slot 작업의 진행률과 취소 버튼을 표시하고 Job 을 반환합니다 (없으면 None).
+
+    끝난 작업은 한 번만 반환되며(slot 을 비움), 오류나 취소는 메시지로 표시합니다.
+    """
+    jobs = st.session_state.setdefault("jobs", {})
+    job = get_job_runner().get(jobs[slot]) if slot in jobs else None
+    if job is None:
+        jobs.pop(slot, None)
+        return None
+    if not job.finished:
+        displayed_jobs.add(slot)
+        col1, col2 = st.columns([5, 1])
+        with col1:
+            st.progress(job.progress, text=f"{job.label}: {job.message or '대기 중...'}")
+        with col2:
+            if st.button("취소", key=f"{slot}_cancel", use_container_width=True):
+                get_job_runner().cancel(job.id)
+        return job
+    del jobs[slot]
+    if job.status == FAILED:
+        st.error(f"{job.label} 오류: {job.error}")
+    elif job.status == CANCELLED:
+        st.info(f"{job.label} 작업이 취소되었습니다.")
+    return job
+
+def write_excel_job(job, df, fingerprint):
+    # 큰 표의 엑셀 파일을 임시 파일에 기록한 뒤 내용만 읽어 반환 (임시 파일은 성공·취소 모두 바로 삭제)
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        with timed("export") as measurement:
+            write_excel(df, path, progress=lambda done, total: job.report(
+                done / total, f"{format_number(done)}/{format_number(total)}행"))
+            with open(path, "rb") as f:
+                data = f.read()
+            measurement.payload = len(data)
+    finally:
+        os.remove(path)
+    return {"fingerprint": fingerprint, "data": data}
+
+def future_valuation_job(job, history, company_name, inputs, stock_value):
+    # 같은 입력값·파라미터의 이전 결과가 있으면 사용하고, 결과를 평가 이력에 기록
+    job.report(0.1, "평가 이력 확인 중")
+    try:
+        future_stock_value = history.lookup(KIND_FUTURE, inputs)
+    except (sqlite3.Error, OSError):
+        future_stock_value = None
+    if future_stock_value is None:
+        job.report(0.3, "미래 가치 계산 중")
+        with timed("valuation"):
+            future_stock_value = calculate_future_stock_value(
+                stock_value, inputs["total_equity"], inputs["shares"], inputs["owned_shares"],
+                inputs["interest_rate"], inputs["evaluation_method"], inputs["growth_rate"], inputs["future_years"])
+    job.report(0.9, "평가 이력 저장 중")
+    history_error = None
+    try:
+        history.record(company_name, KIND_FUTURE, inputs, future_stock_value)
+    except (sqlite3.Error, OSError) as e:
+        history_error = str(e)
+    return {"value": future_stock_value, "inputs": inputs, "historyError": history_error}
+
+def monte_carlo_job(job, *args, **kwargs):
+    # 경로가 추가될 때마다 진행률과 수렴 과정(중간 결과)을 기록
+    convergence = []
+    summary = None
+    with timed("simulation"):
+        for summary in iter_monte_carlo(*args, **kwargs):
+            percentiles = summary["percentiles"]["finalValue"]
+            convergence.append({"경로 수": summary["paths"], "P5": percentiles[5], "중앙값": percentiles[50],
+                                "P95": percentiles[95]})
+            job.report(summary["paths"] / summary["totalPaths"],
+                       f"{format_number(summary['paths'])}/{format_number(summary['totalPaths'])} 경로",
+                       partial=list(convergence))
+    return summary
+
+def scenario_cube_job(job, store, *args):
+    with timed("simulation"):
+        return store.get_or_create(*args, progress=lambda done, total: job.report(
+            done / total, f"{format_number(done)}/{format_number(total)}개 회사"))
+
+# 파라미터 파일의 비율(0.4)을 화면 표시용 퍼센트 문자열(40%)로 변환
+def format_rate(rate):
+    return f"{rate * 100:g}%"
 
 # 엑셀 다운로드 함수
+@instrument("export", payload=True)
 def to_excel(df):
     output = BytesIO()
-    writer = pd.ExcelWriter(output, engine='xlsxwriter')
-    df.to_excel(writer, index=False, sheet_name='Sheet1')
-    writer.close()
-    processed_data = output.getvalue()
-    return processed_data
+    write_excel(df, output)
+    return output.getvalue()
 
-def get_table_download_link(df, filename, text):
-    """Generates a link allowing the data in a given dataframe to be downloaded as Excel"""
-    val = to_excel(df)
-    b64 = base64.b64encode(val)
-    return f'<a href="data:application/octet-stream;base64,{b64.decode()}" download="{filename}.xlsx">{text}</a>'
+# 작은 표의 엑셀 파일 (표 지문 → 파일 내용, 모든 세션 공유). 표가 바뀌지 않으면 재실행 때 다시 만들지 않음
+_excel_cache = get_cache("excel_export", maxsize=64)
 
-# 세금 계산 함수
-def calculate_tax_details(value, owned_shares, share_price):
-    if not value:
-        return None
-    
-    owned_value = value["ownedValue"]
-    
-    # 상속증여세 (40%)
-    inheritance_tax = owned_value * 0.4
-    
-    # 양도소득세 (22%)
-    acquisition_value = owned_shares * share_price
-    transfer_profit = owned_value - acquisition_value
-    transfer_tax = transfer_profit * 0.22 if transfer_profit > 0 else 0
-    
-    # 청산소득세 계산
-    corporate_tax = owned_value * 0.25
-    after_tax_value = owned_value - corporate_tax
-    liquidation_tax = after_tax_value * 0.154
-    
-    return {
-        "inheritanceTax": inheritance_tax,
-        "transferTax": transfer_tax,
-        "corporateTax": corporate_tax,
-        "liquidationTax": liquidation_tax,
-        "acquisitionValue": acquisition_value,
-        "transferProfit": transfer_profit,
-        "afterTaxValue": after_tax_value,
-        "totalTax": corporate_tax + liquidation_tax
-    }
+def frame_fingerprint(df):
+    # 값과 컬럼 이름 기준의 표 지문 (행 인덱스 제외)
+    return int(pd.util.hash_pandas_object(df, index=False).sum()), tuple(map(str, df.columns))
 
-# 비상장주식 가치 계산 함수
-def calculate_stock_value(total_equity, net_income1, net_income2, net_income3, shares, 
-                         interest_rate, evaluation_method, owned_shares):
-    # 1. 순자산가치 계산
-    net_asset_per_share = total_equity / shares
-    
-    # 2. 영업권 계산
-    weighted_income = (net_income1 * 3 + net_income2 * 2 + net_income3 * 1) / 6
-    weighted_income_per_share = weighted_income / shares
-    weighted_income_per_share_50 = weighted_income_per_share * 0.5
-    equity_return = (total_equity * (interest_rate / 100)) / shares
-    annuity_factor = 3.7908
-    goodwill = max(0, (weighted_income_per_share_50 - equity_return) * annuity_factor)
-    
-    # 3. 순자산가치 + 영업권
-    asset_value_with_goodwill = net_asset_per_share + goodwill
-    
-    # 4. 손익가치 계산
-    income_value = weighted_income_per_share * (100 / interest_rate)
-    
-    # 5. 최종가치 계산
-    if evaluation_method == '부동산 과다법인':
-        # 부동산 과다법인
-        stock_value = (asset_value_with_goodwill * 0.6) + (income_value * 0.4)
-        net_asset_80_percent = net_asset_per_share * 0.8
-        final_value = max(stock_value, net_asset_80_percent)
-        method_text = '부동산 과다법인: (자산가치×0.6 + 수익가치×0.4)'
-    elif evaluation_method == '순자산가치만 평가':
-        # 순자산가치만 적용
-        final_value = net_asset_per_share
-        method_text = '순자산가치만 평가'
-    else:
-        # 일반법인
-        stock_value = (income_value * 0.6) + (asset_value_with_goodwill * 0.4)
-        net_asset_80_percent = net_asset_per_share * 0.8
-        final_value = max(stock_value, net_asset_80_percent)
-        method_text = '일반법인: (수익가치×0.6 + 자산가치×0.4)'
-    
-    # 총 가치
-    total_value = final_value * shares
-    owned_value = final_value * owned_shares
-    
-    # 증가율 계산
-    increase_percentage = round((final_value / net_asset_per_share) * 100)
+# 이 행 수 이하의 표는 바로 엑셀 파일을 만들어 캐시하고, 더 큰 표는 버튼을 누를 때에만 만듦
+EAGER_EXPORT_ROWS = 1000
+
+def excel_download_button(df, filename, label, key=None):
+    """DataFrame 을 엑셀 파일로 내려받는 버튼을 표시합니다.
+
+    base64 링크를 페이지에 넣지 않고 Streamlit 파일 전송(st.download_button)을 사용합니다.
+    같은 데이터면 만든 파일을 재사용하며, 큰 표는 백그라운드 작업에서 constant_memory 모드로 만듭니다.
+    """
+    key = key or filename
+    fingerprint = frame_fingerprint(df)
+    if len(df) <= EAGER_EXPORT_ROWS:
+        data = _excel_cache.get(fingerprint)
+        if data is None:
+            data = to_excel(df)
+            _excel_cache.set(fingerprint, data)
+        st.download_button(label, data=data, file_name=f"{filename}.xlsx", mime=XLSX_MIME, key=key)
+        return
+
+    exports = st.session_state.setdefault("exports", {})
+    export = exports.get(key)
+    # 파일은 백그라운드 작업으로 만들고, 끝나면 다음 실행에서 내려받기 버튼을 표시
+    slot = f"export:{key}"
+    job = job_progress(slot)
+    if job is not None and job.status == DONE:
+        export = exports[key] = job.result
+    if export is None or export["fingerprint"] != fingerprint:
+        if (job is None or job.finished) and st.button(f"{label} 파일 만들기", key=f"{key}_prepare"):
+            submit_job(slot, "export", write_excel_job, df, fingerprint, label="엑셀 파일 생성")
+            job_progress(slot)
+        return
     
-    return {
-        "netAssetPerShare": net_asset_per_share,
-        "assetValueWithGoodwill": asset_value_with_goodwill,
-        "incomeValue": income_value,
-        "finalValue": final_value,
-        "totalValue": total_value,
-        "ownedValue": owned_value,
-        "methodText": method_text,
-        "increasePercentage": increase_percentage,
-        "weightedIncome": weighted_income
-    }
+    st.download_button(label, data=export["data"], file_name=f"{filename}.xlsx", mime=XLSX_MIME, key=key)
+
+# 포트폴리오 평가 결과 캐시 (같은 파일이면 재계산하지 않음)
+@instrument("valuation", payload=True)
+@st.cache_data(show_spinner=False)
+def load_portfolio_results(file_bytes, filename, parameters):
+    # parameters 는 캐시 키용 (파라미터 버전, 파일 해시). 검증을 통과한 행만 평가하고 오류 목록을 함께 반환
+    imported = import_portfolio(file_bytes, filename)
+    return (value_portfolio(imported["data"], parameter_version=parameters[0], workers=default_workers()),
+            imported["errors"], imported["rows"])
+
+def show_import_errors(errors, total_rows):
+    # 검증에 실패한 행 (가져오기는 중단하지 않음)
+    if len(errors):
+        bad_rows = errors["행 번호"].nunique()
+        with st.expander(f"⚠️ 입력값 오류 {format_number(bad_rows)}행 (전체 {format_number(total_rows)}행 중 제외됨)"):
+            st.dataframe(errors, hide_index=True, use_container_width=True)
+
+# 민감도 분석 항목 이름
+INPUT_LABELS = {
+    "total_equity": "자본총계",
+    "net_income1": "당기순이익 1년 전",
+    "net_income2": "당기순이익 2년 전",
+    "net_income3": "당기순이익 3년 전",
+    "shares": "총 발행주식수",
+    "interest_rate": "환원율",
+    "owned_shares": "대표이사 보유 주식수",
+    "growth_rate": "연간 성장률",
+    "future_years": "예측 기간",
+    "evaluation_method": "평가 방식",
+}
+SENSITIVITY_OUTPUTS = {
+    "finalValue": "최종 주당 평가액",
+    "ownedValue": "대표이사 보유주식 가치",
+    "totalValue": "회사 총 주식가치",
+}
+
+# 평가 이력 저장소 (모든 세션이 하나의 SQLite 연결을 공유)
+@st.cache_resource
+def get_evaluation_history():
+    return EvaluationHistory()
 
-# 미래 주식가치 계산 함수
-def calculate_future_stock_value(stock_value, total_equity, shares, owned_shares, 
-                               interest_rate, evaluation_method, growth_rate, future_years):
-    if not stock_value:
+# 시나리오 격자 저장소 (디스크에 저장되며 같은 시나리오는 다시 계산하지 않음)
+@st.cache_resource
+def get_cube_store():
+    return CubeStore()
+
+def lookup_history(kind, inputs):
+    # 같은 입력값·파라미터로 평가한 적이 있으면 저장된 결과를 사용
+    try:
+        return get_evaluation_history().lookup(kind, inputs)
+    except (sqlite3.Error, OSError):
         return None
-    
-    # 복리 성장률 적용
-    growth_factor = (1 + (growth_rate / 100)) ** future_years
-    
-    # 미래 자산 및 수익 계산
-    future_total_equity = total_equity * growth_factor
-    future_weighted_income = stock_value["weightedIncome"] * growth_factor
-    
-    # 1. 순자산가치 계산
-    net_asset_per_share = future_total_equity / shares
-    
-    # 2. 영업권 계산
-    weighted_income_per_share = future_weighted_income / shares
-    weighted_income_per_share_50 = weighted_income_per_share * 0.5
-    equity_return = (future_total_equity * (interest_rate / 100)) / shares
-    annuity_factor = 3.7908
-    goodwill = max(0, (weighted_income_per_share_50 - equity_return) * annuity_factor)
-    
-    # 3. 순자산가치 + 영업권
-    asset_value_with_goodwill = net_asset_per_share + goodwill
-    
-    # 4. 손익가치 계산
-    income_value = weighted_income_per_share * (100 / interest_rate)
-    
-    # 5. 최종가치 계산
-    if evaluation_method == '부동산 과다법인':
-        # 부동산 과다법인
-        stock_value_calc = (asset_value_with_goodwill * 0.6) + (income_value * 0.4)
-        net_asset_80_percent = net_asset_per_share * 0.8
-        final_value = max(stock_value_calc, net_asset_80_percent)
-        method_text = '부동산 과다법인: (자산가치×0.6 + 수익가치×0.4)'
-    elif evaluation_method == '순자산가치만 평가':
-        # 순자산가치만 적용
-        final_value = net_asset_per_share
-        method_text = '순자산가치만 평가'
-    else:
-        # 일반법인
-        stock_value_calc = (income_value * 0.6) + (asset_value_with_goodwill * 0.4)
-        net_asset_80_percent = net_asset_per_share * 0.8
-        final_value = max(stock_value_calc, net_asset_80_percent)
-        method_text = '일반법인: (수익가치×0.6 + 자산가치×0.4)'
-    
-    # 총 가치
-    total_value = final_value * shares
-    owned_value = final_value * owned_shares
-    
-    return {
-        "netAssetPerShare": net_asset_per_share,
-        "assetValueWithGoodwill": asset_value_with_goodwill,
-        "incomeValue": income_value,
-        "finalValue": final_value,
-        "totalValue": total_value,
-        "ownedValue": owned_value,
-        "methodText": method_text,
-        "futureTotalEquity": future_total_equity,
-        "futureWeightedIncome": future_weighted_income,
-        "growthRate": growth_rate,
-        "futureYears": future_years
-    }
+
+def record_history(company_name, kind, inputs, outputs):
+    try:
+        get_evaluation_history().record(company_name, kind, inputs, outputs)
+    except (sqlite3.Error, OSError) as e:
+        st.warning(f"평가 이력을 저장하지 못했습니다: {str(e)}")
+
+# 계산 함수 (계산 결과는 세션 간 공유 캐시에 저장하며, 평가 계산 그래프의 결과 노드와 같은 캐시를 사용)
+calculate_tax_details = memoize("calculate_tax_details", maxsize=SHARED_CACHE_SIZE, ttl=SHARED_CACHE_TTL)(
+    core.calculate_tax_details
+)
+calculate_future_stock_value = memoize("calculate_future_stock_value", maxsize=SHARED_CACHE_SIZE,
+                                       ttl=SHARED_CACHE_TTL)(core.calculate_future_stock_value)
+
+# 평가 계산 그래프 (세션별로 유지하며 바뀐 입력에 영향을 받는 단계만 다시 계산)
+def get_valuation_graph():
+    if "valuation_graph" not in st.session_state:
+        st.session_state.valuation_graph = ValuationGraph()
+    return st.session_state.valuation_graph
+
+# 시뮬레이션 격자 캐시 (설정이 바뀌지 않으면 재계산하지 않음, 큰 격자는 여러 프로세스로 나누어 계산)
+cached_future_stock_value_grid = instrument("simulation", payload=True)(
+    memoize("calculate_future_stock_value_grid", maxsize=256, ttl=3600)(parallel_future_stock_value_grid)
+)
+cached_optimize_gift_schedule = instrument("simulation")(
+    memoize("optimize_gift_schedule", maxsize=64, ttl=3600)(optimize_gift_schedule)
+)
 
 # 1. 비상장주식 평가 페이지
 if page == "1. 비상장주식 평가":
@@ -323,16 +406,19 @@ if page == "1. 비상장주식 평가":
             help="상속세 및 증여세법 시행령 제54조 근거"
         )
         
-        st.markdown("""
+        weights = get_parameters()["valuation"]
+        general, real_estate = weights["general"], weights["realEstate"]
+        st.markdown(f"""
         <div class="highlight-box">
         <h4>📌 평가방식 설명</h4>
         <ul>
-            <li><strong>일반법인</strong>: 대부분의 법인에 적용 (수익가치 60% + 자산가치 40%)</li>
-            <li><strong>부동산 과다법인</strong>: 부동산이 자산의 50% 이상인 법인 (자산가치 60% + 수익가치 40%)</li>
+            <li><strong>일반법인</strong>: 대부분의 법인에 적용 (수익가치 {format_rate(general["income"])} + 자산가치 {format_rate(general["asset"])})</li>
+            <li><strong>부동산 과다법인</strong>: 부동산이 자산의 50% 이상인 법인 (자산가치 {format_rate(real_estate["asset"])} + 수익가치 {format_rate(real_estate["income"])})</li>
             <li><strong>순자산가치만 평가</strong>: 특수한 경우 (설립 1년 미만 등) (순자산가치 100%)</li>
         </ul>
         </div>
         """, unsafe_allow_html=True)
+    lap("inputs")
     
     # 데이터 불러오기/저장 기능
     with st.expander("데이터 저장 및 불러오기", expanded=False):
@@ -340,54 +426,80 @@ if page == "1. 비상장주식 평가":
         
         with col1:
             st.markdown("### 현재 데이터 저장")
-            if st.button("현재 입력값 JSON으로 다운로드"):
-                input_data = {
-                    "company_name": company_name,
-                    "total_equity": total_equity,
-                    "net_income1": net_income1,
-                    "net_income2": net_income2,
-                    "net_income3": net_income3,
-                    "shares": shares,
-                    "owned_shares": owned_shares,
-                    "share_price": share_price,
-                    "interest_rate": interest_rate,
-                    "evaluation_method": evaluation_method
-                }
-                
-                # 데이터프레임으로 변환하여 다운로드 링크 생성
-                df = pd.DataFrame([input_data])
-                st.markdown(get_table_download_link(df, f"{company_name}_평가데이터", "📥 다운로드하기"), unsafe_allow_html=True)
+            input_data = {
+                "company_name": company_name,
+                "total_equity": total_equity,
+                "net_income1": net_income1,
+                "net_income2": net_income2,
+                "net_income3": net_income3,
+                "shares": shares,
+                "owned_shares": owned_shares,
+                "share_price": share_price,
+                "interest_rate": interest_rate,
+                "evaluation_method": evaluation_method
+            }
+            
+            # 데이터프레임으로 변환하여 다운로드 버튼 생성
+            df = pd.DataFrame([input_data])
+            excel_download_button(df, f"{company_name}_평가데이터", "📥 현재 입력값 다운로드")
         
         with col2:
             st.markdown("### 저장된 데이터 불러오기")
-            uploaded_file = st.file_uploader("Excel 파일을 업로드하세요 (.xlsx)", type=["xlsx"])
+            uploaded_file = st.file_uploader("파일을 업로드하세요 (.xlsx, .csv, .parquet)", type=list(IMPORT_FORMATS))
             if uploaded_file is not None:
                 try:
-                    df = pd.read_excel(uploaded_file)
-                    st.success("파일을 성공적으로 불러왔습니다!")
-                    
-                    if st.button("불러온 데이터로 설정"):
-                        # 데이터를 입력 필드에 설정
-                        st.session_state.company_name = df.iloc[0]['company_name']
-                        st.session_state.total_equity = df.iloc[0]['total_equity']
-                        st.session_state.net_income1 = df.iloc[0]['net_income1']
-                        st.session_state.net_income2 = df.iloc[0]['net_income2']
-                        st.session_state.net_income3 = df.iloc[0]['net_income3']
-                        st.session_state.shares = df.iloc[0]['shares']
-                        st.session_state.owned_shares = df.iloc[0]['owned_shares']
-                        st.session_state.share_price = df.iloc[0]['share_price']
-                        st.session_state.interest_rate = df.iloc[0]['interest_rate']
-                        st.session_state.evaluation_method = df.iloc[0]['evaluation_method']
-                        st.experimental_rerun()
+                    # 같은 파일은 한 번만 읽고 검증 (파일 내용 해시로 캐시)
+                    imported = import_portfolio(uploaded_file.getvalue(), uploaded_file.name)
                 except Exception as e:
                     st.error(f"파일 로드 오류: {str(e)}")
+                else:
+                    show_import_errors(imported["errors"], imported["rows"])
+                    if imported["data"].empty:
+                        st.error("불러올 수 있는 올바른 행이 없습니다.")
+                    else:
+                        st.success("파일을 성공적으로 불러왔습니다!")
+                        
+                        if st.button("불러온 데이터로 설정"):
+                            # 검증을 통과한 첫 행을 입력 필드에 설정 (파이썬 기본 타입으로 변환됨)
+                            for key, value in imported["data"].head(1).to_dict("records")[0].items():
+                                st.session_state[key] = value
+                            st.experimental_rerun()
+    
+    # 평가 이력
+    with st.expander("평가 이력", expanded=False):
+        try:
+            company_history = get_evaluation_history().history(company_name, limit=50)
+        except (sqlite3.Error, OSError) as e:
+            st.warning(f"평가 이력을 불러오지 못했습니다: {str(e)}")
+            company_history = []
+        if company_history:
+            st.dataframe(pd.DataFrame({
+                "평가일시": [item["evaluatedAt"] for item in company_history],
+                "구분": ["현재 가치" if item["kind"] == KIND_PRESENT else
+                       f"{item['inputs'].get('future_years')}년 후 가치" for item in company_history],
+                "평가방법": [item["inputs"].get("evaluation_method") for item in company_history],
+                "주당 평가액": format_numbers([item["outputs"]["finalValue"] for item in company_history], suffix="원"),
+                "보유주식 가치": format_numbers([item["outputs"]["ownedValue"] for item in company_history], suffix="원"),
+                "파라미터 버전": [item["parameterVersion"] for item in company_history],
+            }), use_container_width=True, hide_index=True)
+        else:
+            st.info(f"'{company_name}' 의 평가 이력이 없습니다.")
     
     if st.button("비상장주식 평가하기", type="primary", use_container_width=True):
         with st.spinner("계산 중..."):
-            st.session_state.stock_value = calculate_stock_value(
-                total_equity, net_income1, net_income2, net_income3, 
-                shares, interest_rate, evaluation_method, owned_shares
+            valuation_inputs = dict(
+                total_equity=total_equity, net_income1=net_income1, net_income2=net_income2,
+                net_income3=net_income3, shares=shares, interest_rate=interest_rate,
+                evaluation_method=evaluation_method, owned_shares=owned_shares, share_price=share_price
             )
+            valuation_graph = get_valuation_graph()
+            valuation_graph.set_inputs(**valuation_inputs)
+            stock_value = lookup_history(KIND_PRESENT, valuation_inputs)
+            if stock_value is None:
+                with timed("valuation"):
+                    stock_value = valuation_graph.get("stockValue")
+            record_history(company_name, KIND_PRESENT, valuation_inputs, stock_value)
+            st.session_state.stock_value = stock_value
             st.session_state.evaluated = True
             # 세션 상태에 입력 값 저장
             st.session_state.company_name = company_name
@@ -445,14 +557,14 @@ elif page == "2. 주식가치 결과":
                 "회사 총 주식가치", 
                 "대표이사 보유주식 가치"
             ],
-            "금액 (원)": [
-                format_number(stock_value["netAssetPerShare"]),
-                format_number(stock_value["incomeValue"]),
-                format_number(stock_value["assetValueWithGoodwill"]),
-                format_number(stock_value["finalValue"]),
-                format_number(stock_value["totalValue"]),
-                format_number(stock_value["ownedValue"])
-            ]
+            "금액 (원)": format_numbers([
+                stock_value["netAssetPerShare"],
+                stock_value["incomeValue"],
+                stock_value["assetValueWithGoodwill"],
+                stock_value["finalValue"],
+                stock_value["totalValue"],
+                stock_value["ownedValue"]
+            ])
         })
         
         # 하이라이트할 행
@@ -480,8 +592,8 @@ elif page == "2. 주식가치 결과":
             labels = ['순자산가치', '영업권 가치']
             values = [stock_value["netAssetPerShare"], stock_value["assetValueWithGoodwill"] - stock_value["netAssetPerShare"]]
             
-            fig = go.Figure(data=[go.Pie(labels=labels, values=values, hole=.3)])
-            fig.update_layout(
+            fig = pie_chart(
+                labels, values,
                 title_text='주당 가치 구성',
                 title_font_size=16,
                 height=400,
@@ -492,17 +604,14 @@ elif page == "2. 주식가치 결과":
         
         with col2:
             # 막대 차트 생성
-            fig = go.Figure()
-            fig.add_trace(go.Bar(
-                x=['순자산가치', '손익가치', '최종평가액'],
-                y=[stock_value["netAssetPerShare"], stock_value["incomeValue"], stock_value["finalValue"]],
-                marker_color=['lightblue', 'lightgreen', 'coral'],
-                text=[format_number(stock_value["netAssetPerShare"]), 
-                      format_number(stock_value["incomeValue"]), 
-                      format_number(stock_value["finalValue"])],
-                textposition='auto'
-            ))
-            fig.update_layout(
+            fig = bar_chart(
+                ['순자산가치', '손익가치', '최종평가액'],
+                [{
+                    "y": [stock_value["netAssetPerShare"], stock_value["incomeValue"], stock_value["finalValue"]],
+                    "color": ['lightblue', 'lightgreen', 'coral'],
+                    "text": format_numbers([stock_value["netAssetPerShare"], stock_value["incomeValue"],
+                                            stock_value["finalValue"]]).tolist(),
+                }],
                 title_text='주요 가치 비교 (주당)',
                 title_font_size=16,
                 height=400,
@@ -511,6 +620,79 @@ elif page == "2. 주식가치 결과":
             )
             st.plotly_chart(fig, use_container_width=True)
         
+        # 민감도 분석
+        with st.expander("민감도 분석", expanded=False):
+            sensitivity_base = get_valuation_graph().inputs()
+            col1, col2 = st.columns(2)
+            with col1:
+                sensitivity_spread = st.slider("입력값 변동 범위 (±%)", min_value=5, max_value=50, value=20, step=5) / 100
+            with col2:
+                sensitivity_label = st.selectbox("분석 대상", list(SENSITIVITY_OUTPUTS.values()))
+                sensitivity_output = next(key for key, label in SENSITIVITY_OUTPUTS.items() if label == sensitivity_label)
+            
+            # 입력값별 편미분과 탄력성 (정확한 구간별 미분)
+            with timed("sensitivity"):
+                gradient = calculate_stock_value_gradient(*(sensitivity_base[name] for name in (
+                    "total_equity", "net_income1", "net_income2", "net_income3", "shares",
+                    "interest_rate", "evaluation_method", "owned_shares")))
+            gradient_df = pd.DataFrame({
+                "입력값": [INPUT_LABELS[name] for name in GRADIENT_INPUTS],
+                f"∂{SENSITIVITY_OUTPUTS[sensitivity_output]}/∂입력값": [
+                    f"{float(gradient['gradients'][sensitivity_output][name]):,.4f}" for name in GRADIENT_INPUTS
+                ],
+                "탄력성 (최종 주당 평가액, %/%)": [
+                    f"{float(gradient['elasticities'][name]):.3f}" for name in GRADIENT_INPUTS
+                ],
+            })
+            st.dataframe(gradient_df, hide_index=True, use_container_width=True)
+            st.caption(
+                f"영업권: {'0으로 제한됨 (max(0, …) 적용)' if gradient['goodwillClamped'] else '양수 (계산값 적용)'} | "
+                f"순자산가치 {format_rate(get_parameters()['valuation']['netAssetFloor'])} 하한: {'적용됨' if gradient['floorBinding'] else '적용되지 않음'}"
+            )
+            
+            # 토네이도 차트 (입력값별 하한/상한 평가를 한 번에 계산)
+            with timed("sensitivity"):
+                tornado, base_output = tornado_analysis(sensitivity_base, spread=sensitivity_spread, output=sensitivity_output)
+            tornado = tornado[::-1]
+            tornado_fig = tornado_chart(
+                [INPUT_LABELS[item["input"]] for item in tornado],
+                [item["lowValue"] for item in tornado],
+                [item["highValue"] for item in tornado],
+                [str(item["low"]) for item in tornado],
+                [str(item["high"]) for item in tornado],
+                base_output,
+                title=f'{SENSITIVITY_OUTPUTS[sensitivity_output]} 토네이도 차트 (기준 {format_number(base_output)}원)',
+                height=450,
+                margin=dict(l=10, r=10, t=50, b=10)
+            )
+            st.plotly_chart(tornado_fig, use_container_width=True)
+            
+            # 2차원 히트맵 (두 입력값 격자를 한 번에 계산)
+            heatmap_inputs = {INPUT_LABELS[name]: name for name in PRESENT_INPUTS}
+            heatmap_labels = list(heatmap_inputs)
+            col1, col2 = st.columns(2)
+            with col1:
+                heatmap_x = heatmap_inputs[st.selectbox("가로축 입력값", heatmap_labels, index=heatmap_labels.index(INPUT_LABELS["interest_rate"]))]
+            with col2:
+                heatmap_y = heatmap_inputs[st.selectbox("세로축 입력값", heatmap_labels, index=heatmap_labels.index(INPUT_LABELS["net_income1"]))]
+            if heatmap_x == heatmap_y:
+                st.warning("서로 다른 두 입력값을 선택하세요.")
+            else:
+                x_values = np.linspace(sensitivity_base[heatmap_x] * (1 - sensitivity_spread), sensitivity_base[heatmap_x] * (1 + sensitivity_spread), 41)
+                y_values = np.linspace(sensitivity_base[heatmap_y] * (1 - sensitivity_spread), sensitivity_base[heatmap_y] * (1 + sensitivity_spread), 41)
+                with timed("sensitivity"):
+                    heatmap = heatmap_analysis(sensitivity_base, heatmap_x, x_values, heatmap_y, y_values, output=sensitivity_output)
+                heatmap_fig = heatmap_chart(
+                    x_values, y_values, heatmap, '원',
+                    f'{INPUT_LABELS[heatmap_x]} %{{x:,.1f}}<br>{INPUT_LABELS[heatmap_y]} %{{y:,.0f}}<br>%{{z:,.0f}}원<extra></extra>',
+                    title=f'{INPUT_LABELS[heatmap_x]} × {INPUT_LABELS[heatmap_y]} → {SENSITIVITY_OUTPUTS[sensitivity_output]}',
+                    xaxis_title=INPUT_LABELS[heatmap_x],
+                    yaxis_title=INPUT_LABELS[heatmap_y],
+                    height=500,
+                    margin=dict(l=10, r=10, t=50, b=10)
+                )
+                st.plotly_chart(heatmap_fig, use_container_width=True)
+        
         # 결과 다운로드 기능
         st.markdown("### 결과 다운로드")
         col1, col2 = st.columns(2)
@@ -530,18 +712,14 @@ elif page == "2. 주식가치 결과":
                 "계산일자": datetime.now().strftime("%Y-%m-%d")
             }])
             
-            st.markdown(get_table_download_link(full_results_df, f"{company_name}_평가결과", "📊 평가결과 다운로드"), unsafe_allow_html=True)
+            excel_download_button(full_results_df, f"{company_name}_평가결과", "📊 평가결과 다운로드")
         
         # 버튼 행
         st.markdown("### 다음 단계")
         col1, col2 = st.columns(2)
         with col1:
             if st.button("3. 현시점 세금 계산하기", type="primary", use_container_width=True):
-                st.session_state.current_tax_details = calculate_tax_details(
-                    st.session_state.stock_value,
-                    st.session_state.owned_shares,
-                    st.session_state.share_price
-                )
+                st.session_state.current_tax_details = get_valuation_graph().get("taxDetails")
                 st.experimental_set_query_params(page="3")
                 st.experimental_rerun()
         
@@ -563,11 +741,48 @@ elif page == "3. 현시점 세금계산":
         owned_shares = st.session_state.owned_shares
         share_price = st.session_state.share_price
         
-        # 세금 계산
-        current_tax_details = calculate_tax_details(stock_value, owned_shares, share_price)
-        
         st.title("현시점 세금 계산")
         
+        # 세율 기준 선택 (단일세율 또는 연도별 누진세율표)
+        flat_rate_label = "단일세율 (간이 계산)"
+        col1, col2 = st.columns(2)
+        with col1:
+            tax_basis = st.selectbox(
+                "세율 기준",
+                [flat_rate_label] + [f"{year}년 세법 (누진세율)" for year in range(parameter_versions()[0], datetime.now().year + 1)],
+                help="연도를 선택하면 상속증여세·법인세·양도소득세 누진세율과 증여재산공제를 적용합니다."
+            )
+        tax_year = None if tax_basis == flat_rate_label else int(tax_basis[:4])
+        with col2:
+            prior_gifts = st.number_input(
+                "최근 10년 내 동일인 증여재산 (원)", min_value=0, value=0, step=10000000,
+                disabled=tax_year is None, help="증여세는 10년 내 동일인 증여재산을 합산하여 과세합니다."
+            )
+        
+        lap("inputs")
+        
+        # 세금 계산
+        if tax_year is None:
+            with timed("tax"):
+                current_tax_details = get_valuation_graph().get("taxDetails")
+            rates = get_parameters()["flatTax"]
+            rate_captions = (f"적용 세율: {format_rate(rates['inheritanceRate'])}",
+                             f"적용 세율: {format_rate(rates['transferRate'])}",
+                             f"법인세 {format_rate(rates['corporateRate'])} + 배당세 {format_rate(rates['dividendRate'])}")
+        else:
+            with timed("tax"):
+                current_tax_details = calculate_tax_details(stock_value, owned_shares, share_price, tax_year, prior_gifts)
+            owned_value = stock_value['ownedValue']
+            rate_captions = (
+                f"실효세율: {current_tax_details['inheritanceTax'] / owned_value * 100:.1f}%" if owned_value else "-",
+                f"실효세율: {current_tax_details['transferTax'] / current_tax_details['transferProfit'] * 100:.1f}%"
+                if current_tax_details['transferProfit'] > 0 else "-",
+                f"{current_tax_details['taxYear']}년 법인세 누진세율 + "
+                f"배당세 {format_rate(get_parameters(tax_year)['tax']['dividendRate'])}"
+                + (f" ({current_tax_details['tableVersion']}년 세율표 적용)"
+                   if current_tax_details['tableVersion'] != current_tax_details['taxYear'] else ""),
+            )
+        
         # 평가된 주식 가치 정보
         with st.expander("평가된 주식 가치", expanded=True):
             col1, col2 = st.columns(2)
@@ -587,21 +802,21 @@ elif page == "3. 현시점 세금계산":
             st.metric(
                 "증여세", 
                 f"{format_number(current_tax_details['inheritanceTax'])}원", 
-                "적용 세율: 40%"
+                rate_captions[0]
             )
         
         with col2:
             st.metric(
                 "양도소득세", 
                 f"{format_number(current_tax_details['transferTax'])}원", 
-                "적용 세율: 22%"
+                rate_captions[1]
             )
         
         with col3:
             st.metric(
                 "청산소득세", 
                 f"{format_number(current_tax_details['totalTax'])}원", 
-                "법인세 25% + 배당세 15.4%"
+                rate_captions[2]
             )
         
         # 계산 세부내역
@@ -616,15 +831,15 @@ elif page == "3. 현시점 세금계산":
                     "배당소득", 
                     "배당소득세"
                 ],
-                "금액 (원)": [
-                    format_number(stock_value["ownedValue"]),
-                    format_number(current_tax_details["acquisitionValue"]),
-                    format_number(current_tax_details["transferProfit"]),
-                    format_number(stock_value["ownedValue"]),
-                    format_number(current_tax_details["corporateTax"]),
-                    format_number(current_tax_details["afterTaxValue"]),
-                    format_number(current_tax_details["liquidationTax"])
-                ]
+                "금액 (원)": format_numbers([
+                    current_tax_details.get("giftTaxBase", stock_value["ownedValue"]),
+                    current_tax_details["acquisitionValue"],
+                    current_tax_details["transferProfit"],
+                    stock_value["ownedValue"],
+                    current_tax_details["corporateTax"],
+                    current_tax_details["afterTaxValue"],
+                    current_tax_details["liquidationTax"]
+                ])
             })
             
             st.dataframe(
@@ -638,25 +853,22 @@ elif page == "3. 현시점 세금계산":
             )
             
             # 세부 결과 다운로드 기능
-            st.markdown(get_table_download_link(details_df, f"{company_name}_세금계산_결과", "💰 세금계산 결과 다운로드"), unsafe_allow_html=True)
+            excel_download_button(details_df, f"{company_name}_세금계산_결과", "💰 세금계산 결과 다운로드")
         
         # 시각화
         col1, col2 = st.columns(2)
         with col1:
             # 세금 비교 차트
-            tax_fig = go.Figure()
-            tax_fig.add_trace(go.Bar(
-                x=['증여세', '양도소득세', '청산소득세'],
-                y=[current_tax_details['inheritanceTax'], 
-                   current_tax_details['transferTax'], 
-                   current_tax_details['totalTax']],
-                marker_color=['#FF9999', '#66B2FF', '#99CC99'],
-                text=[format_number(current_tax_details['inheritanceTax']), 
-                      format_number(current_tax_details['transferTax']), 
-                      format_number(current_tax_details['totalTax'])],
-                textposition='auto'
-            ))
-            tax_fig.update_layout(
+            tax_fig = bar_chart(
+                ['증여세', '양도소득세', '청산소득세'],
+                [{
+                    "y": [current_tax_details['inheritanceTax'], 
+                          current_tax_details['transferTax'], 
+                          current_tax_details['totalTax']],
+                    "color": ['#FF9999', '#66B2FF', '#99CC99'],
+                    "text": format_numbers([current_tax_details['inheritanceTax'], current_tax_details['transferTax'],
+                                            current_tax_details['totalTax']]).tolist(),
+                }],
                 title='세금 유형별 비교',
                 height=400,
                 margin=dict(l=10, r=10, t=50, b=10)
@@ -668,13 +880,10 @@ elif page == "3. 현시점 세금계산":
             labels = ['법인세', '배당소득세']
             values = [current_tax_details['corporateTax'], current_tax_details['liquidationTax']]
             
-            pie_fig = go.Figure(data=[go.Pie(
-                labels=labels, 
-                values=values, 
-                hole=.3,
-                marker_colors=['#5D9CEC', '#FC6E51']
-            )])
-            pie_fig.update_layout(
+            pie_fig = pie_chart(
+                labels, 
+                values, 
+                colors=['#5D9CEC', '#FC6E51'],
                 title='청산소득세 구성',
                 height=400,
                 margin=dict(l=10, r=10, t=50, b=10)
@@ -748,22 +957,36 @@ elif page == "4. 미래 주식가치":
                 help="몇 년 후의 가치를 예측할지 설정하세요"
             )
         
-        # 미래 가치 계산 버튼
+        lap("inputs")
+        
+        # 미래 가치 계산 버튼 (백그라운드 작업으로 계산하고, 끝나면 다음 실행에서 결과를 가져옴)
+        # 그래프의 성장률/기간은 결과를 가져올 때 바꿈 (취소·실패하면 이전 결과와 입력값을 그대로 유지)
         if st.button("미래 주식가치 계산하기", type="primary", use_container_width=True):
-            with st.spinner("미래 가치 계산 중..."):
-                st.session_state.future_stock_value = calculate_future_stock_value(
-                    stock_value, total_equity, shares, owned_shares,
-                    interest_rate, evaluation_method, growth_rate, future_years
-                )
-                st.session_state.future_evaluated = True
-                st.session_state.growth_rate = growth_rate
-                st.session_state.future_years = future_years
-                
-                st.success(f"{future_years}년 후의 주식가치 계산이 완료되었습니다!")
+            valuation_graph = get_valuation_graph()
+            submit_job("future_valuation", "valuation", future_valuation_job, get_evaluation_history(),
+                       company_name, dict(valuation_graph.inputs(), growth_rate=growth_rate, future_years=future_years),
+                       valuation_graph.get("stockValue"), label="미래 가치 계산")
+        
+        future_job = job_progress("future_valuation")
+        if future_job is not None and future_job.status == DONE:
+            if future_job.result["historyError"]:
+                st.warning(f"평가 이력을 저장하지 못했습니다: {future_job.result['historyError']}")
+            # 성장률/기간만 바뀌면 현재 가치는 다시 계산하지 않음
+            get_valuation_graph().set_inputs(growth_rate=future_job.result["inputs"]["growth_rate"],
+                                             future_years=future_job.result["inputs"]["future_years"])
+            st.session_state.future_stock_value = future_job.result["value"]
+            st.session_state.future_evaluated = True
+            st.session_state.growth_rate = future_job.result["inputs"]["growth_rate"]
+            st.session_state.future_years = future_job.result["inputs"]["future_years"]
+            
+            st.success(f"{st.session_state.future_years}년 후의 주식가치 계산이 완료되었습니다!")
         
         # 미래 가치 결과 표시
         if st.session_state.future_evaluated and st.session_state.future_stock_value:
             future_value = st.session_state.future_stock_value
+            # 아래 제목·표·차트는 슬라이더의 현재 값이 아니라 이 결과를 계산한 성장률과 예측 기간 기준
+            growth_rate = future_value["growthRate"]
+            future_years = future_value["futureYears"]
             
             st.markdown("---")
             st.subheader(f"{future_years}년 후 주식가치 결과")
@@ -779,33 +1002,35 @@ elif page == "4. 미래 주식가치":
                     "회사 총 주식가치", 
                     "대표이사 보유주식 가치"
                 ],
-                "현재 (원)": [
-                    format_number(total_equity),
-                    format_number(stock_value["weightedIncome"]),
-                    format_number(stock_value["netAssetPerShare"]),
-                    format_number(stock_value["incomeValue"]),
-                    format_number(stock_value["finalValue"]),
-                    format_number(stock_value["totalValue"]),
-                    format_number(stock_value["ownedValue"])
-                ],
-                f"{future_years}년 후 (원)": [
-                    format_number(future_value["futureTotalEquity"]),
-                    format_number(future_value["futureWeightedIncome"]),
-                    format_number(future_value["netAssetPerShare"]),
-                    format_number(future_value["incomeValue"]),
-                    format_number(future_value["finalValue"]),
-                    format_number(future_value["totalValue"]),
-                    format_number(future_value["ownedValue"])
-                ],
-                "증가율 (%)": [
-                    f"{((future_value['futureTotalEquity']/total_equity) - 1) * 100:.1f}%",
-                    f"{((future_value['futureWeightedIncome']/stock_value['weightedIncome']) - 1) * 100:.1f}%",
-                    f"{((future_value['netAssetPerShare']/stock_value['netAssetPerShare']) - 1) * 100:.1f}%",
-                    f"{((future_value['incomeValue']/stock_value['incomeValue']) - 1) * 100:.1f}%",
-                    f"{((future_value['finalValue']/stock_value['finalValue']) - 1) * 100:.1f}%",
-                    f"{((future_value['totalValue']/stock_value['totalValue']) - 1) * 100:.1f}%",
-                    f"{((future_value['ownedValue']/stock_value['ownedValue']) - 1) * 100:.1f}%"
-                ]
+                "현재 (원)": format_numbers([
+                    total_equity,
+                    stock_value["weightedIncome"],
+                    stock_value["netAssetPerShare"],
+                    stock_value["incomeValue"],
+                    stock_value["finalValue"],
+                    stock_value["totalValue"],
+                    stock_value["ownedValue"]
+                ]),
+                f"{future_years}년 후 (원)": format_numbers([
+                    future_value["futureTotalEquity"],
+                    future_value["futureWeightedIncome"],
+                    future_value["netAssetPerShare"],
+                    future_value["incomeValue"],
+                    future_value["finalValue"],
+                    future_value["totalValue"],
+                    future_value["ownedValue"]
+                ]),
+                "증가율 (%)": format_percents(
+                    (np.array([
+                        future_value["futureTotalEquity"] / total_equity,
+                        future_value["futureWeightedIncome"] / stock_value["weightedIncome"],
+                        future_value["netAssetPerShare"] / stock_value["netAssetPerShare"],
+                        future_value["incomeValue"] / stock_value["incomeValue"],
+                        future_value["finalValue"] / stock_value["finalValue"],
+                        future_value["totalValue"] / stock_value["totalValue"],
+                        future_value["ownedValue"] / stock_value["ownedValue"]
+                    ]) - 1) * 100
+                )
             })
             
             st.dataframe(
@@ -821,7 +1046,7 @@ elif page == "4. 미래 주식가치":
             )
             
             # 다운로드 기능
-            st.markdown(get_table_download_link(comparison_df, f"{company_name}_{future_years}년후_예측", "📊 미래가치 예측 결과 다운로드"), unsafe_allow_html=True)
+            excel_download_button(comparison_df, f"{company_name}_{future_years}년후_예측", "📊 미래가치 예측 결과 다운로드")
             
             # 가치 변화 시각화
             st.subheader("가치 변화 시각화")
@@ -829,15 +1054,13 @@ elif page == "4. 미래 주식가치":
             col1, col2 = st.columns(2)
             with col1:
                 # 주당 가치 비교 차트
-                fig1 = go.Figure()
-                fig1.add_trace(go.Bar(
-                    x=['현재', f'{future_years}년 후'],
-                    y=[stock_value["finalValue"], future_value["finalValue"]],
-                    text=[format_number(stock_value["finalValue"]), format_number(future_value["finalValue"])],
-                    textposition='auto',
-                    marker_color=['#5D9CEC', '#FC6E51']
-                ))
-                fig1.update_layout(
+                fig1 = bar_chart(
+                    ['현재', f'{future_years}년 후'],
+                    [{
+                        "y": [stock_value["finalValue"], future_value["finalValue"]],
+                        "text": format_numbers([stock_value["finalValue"], future_value["finalValue"]]).tolist(),
+                        "color": ['#5D9CEC', '#FC6E51'],
+                    }],
                     title='주당 가치 변화',
                     height=400,
                     margin=dict(l=20, r=20, t=50, b=20)
@@ -846,15 +1069,13 @@ elif page == "4. 미래 주식가치":
             
             with col2:
                 # 총 회사 가치 비교 차트
-                fig2 = go.Figure()
-                fig2.add_trace(go.Bar(
-                    x=['현재', f'{future_years}년 후'],
-                    y=[stock_value["totalValue"], future_value["totalValue"]],
-                    text=[format_number(stock_value["totalValue"]), format_number(future_value["totalValue"])],
-                    textposition='auto',
-                    marker_color=['#5D9CEC', '#FC6E51']
-                ))
-                fig2.update_layout(
+                fig2 = bar_chart(
+                    ['현재', f'{future_years}년 후'],
+                    [{
+                        "y": [stock_value["totalValue"], future_value["totalValue"]],
+                        "text": format_numbers([stock_value["totalValue"], future_value["totalValue"]]).tolist(),
+                        "color": ['#5D9CEC', '#FC6E51'],
+                    }],
                     title='회사 총 가치 변화',
                     height=400,
                     margin=dict(l=20, r=20, t=50, b=20)
@@ -864,42 +1085,129 @@ elif page == "4. 미래 주식가치":
             # 미래 성장 시뮬레이션
             st.subheader("다양한 성장률에 따른 미래 가치 시뮬레이션")
             
-            # 다양한 성장률에 대한 시뮬레이션 계산
-            growth_rates = [5, 10, 15, 20, 25]
-            simulation_years = list(range(1, future_years + 1))
+            # 시뮬레이션 범위 설정
+            with st.expander("시뮬레이션 설정", expanded=False):
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    sim_rate_start = st.number_input("최소 성장률 (%)", min_value=0.0, max_value=100.0, value=5.0, step=0.1)
+                with col2:
+                    sim_rate_stop = st.number_input("최대 성장률 (%)", min_value=0.0, max_value=100.0, value=25.0, step=0.1)
+                with col3:
+                    sim_rate_step = st.number_input("성장률 간격 (%)", min_value=0.1, max_value=100.0, value=5.0, step=0.1)
+                with col4:
+                    sim_years = st.slider("시뮬레이션 기간 (년)", min_value=1, max_value=30, value=future_years)
             
-            # 시뮬레이션 데이터 생성
-            sim_data = []
-            for gr in growth_rates:
-                values = []
-                for yr in simulation_years:
-                    future_val = calculate_future_stock_value(
-                        stock_value, total_equity, shares, owned_shares,
-                        interest_rate, evaluation_method, gr, yr
-                    )
-                    values.append(future_val["finalValue"])
-                sim_data.append((gr, values))
+            # 다양한 성장률에 대한 시뮬레이션 계산 (성장률 × 기간 격자를 한 번에 계산)
+            growth_rates = growth_rate_range(sim_rate_start, max(sim_rate_start, sim_rate_stop), sim_rate_step)
+            simulation_years = list(range(1, sim_years + 1))
+            sim_grid = cached_future_stock_value_grid(
+                stock_value, total_equity, shares, owned_shares,
+                interest_rate, evaluation_method, growth_rates, simulation_years
+            )
             
-            # 라인 차트로 시각화
-            fig3 = go.Figure()
-            for gr, values in sim_data:
-                fig3.add_trace(go.Scatter(
-                    x=simulation_years,
-                    y=values,
+            if len(growth_rates) <= 10:
+                # 라인 차트로 시각화
+                fig3 = line_chart(
+                    simulation_years,
+                    [(f'성장률 {gr:g}%', values) for gr, values in zip(growth_rates, sim_grid["finalValue"])],
                     mode='lines+markers',
-                    name=f'성장률 {gr}%',
-                    hovertemplate='%{y:,.0f}원'
-                ))
-            
-            fig3.update_layout(
-                title='성장률별 주당 가치 예측',
-                xaxis_title='예측 기간 (년)',
-                yaxis_title='주당 가치 (원)',
-                height=500,
-                hovermode='x unified'
-            )
+                    hovertemplate='%{y:,.0f}원',
+                    title='성장률별 주당 가치 예측',
+                    xaxis_title='예측 기간 (년)',
+                    yaxis_title='주당 가치 (원)',
+                    height=500,
+                    hovermode='x unified'
+                )
+            else:
+                # 성장률이 많으면 히트맵으로 시각화
+                fig3 = heatmap_chart(
+                    simulation_years, growth_rates, sim_grid["finalValue"], '주당 가치 (원)',
+                    '%{x}년 / 성장률 %{y}%<br>%{z:,.0f}원<extra></extra>',
+                    title='성장률별 주당 가치 예측',
+                    xaxis_title='예측 기간 (년)',
+                    yaxis_title='연간 성장률 (%)',
+                    height=500,
+                    hovermode='closest'
+                )
             st.plotly_chart(fig3, use_container_width=True)
             
+            # 시뮬레이션 결과 표 (성장률 × 기간 전체, 보이는 행만 형식화)
+            with st.expander("시뮬레이션 결과 표", expanded=False):
+                rate_grid, year_grid = np.meshgrid(growth_rates, simulation_years, indexing="ij")
+                sim_table = pd.DataFrame({
+                    "연간 성장률 (%)": rate_grid.ravel(),
+                    "예측 기간 (년)": year_grid.ravel(),
+                    "주당 평가액": sim_grid["finalValue"].ravel(),
+                    "회사 총가치": sim_grid["totalValue"].ravel(),
+                    "보유주식 가치": sim_grid["ownedValue"].ravel(),
+                })
+                paged_table(sim_table, "simulation", formats={
+                    "연간 성장률 (%)": lambda column: [f"{value:g}%" for value in column],
+                    "예측 기간 (년)": lambda column: format_numbers(column, suffix="년"),
+                }, default_sort="연간 성장률 (%)", default_ascending=True)
+            
+            # 몬테카를로 시뮬레이션
+            with st.expander("몬테카를로 시뮬레이션 (성장률·환원율·순이익 변동)", expanded=False):
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    mc_paths = st.number_input("시뮬레이션 경로 수", min_value=1000, max_value=1000000, value=100000, step=10000)
+                    mc_seed = st.number_input("난수 시드", min_value=0, value=42, step=1)
+                with col2:
+                    mc_growth_mean = st.number_input("성장률 평균 (%)", value=float(growth_rate), step=0.5)
+                    mc_growth_std = st.number_input("성장률 표준편차 (%)", min_value=0.0, value=5.0, step=0.5)
+                with col3:
+                    mc_rate_low = st.number_input("환원율 하한 (%)", min_value=0.1, value=float(max(1, interest_rate - 2)), step=0.5)
+                    mc_rate_high = st.number_input("환원율 상한 (%)", min_value=0.1, value=float(interest_rate + 2), step=0.5)
+                mc_shock_std = st.number_input("연간 순이익 변동 표준편차 (%)", min_value=0.0, value=10.0, step=1.0)
+                
+                if st.button("몬테카를로 시뮬레이션 실행", use_container_width=True):
+                    submit_job(
+                        "monte_carlo", "simulation", monte_carlo_job,
+                        stock_value, total_equity, shares, owned_shares, st.session_state.share_price,
+                        evaluation_method, future_years,
+                        growth_rate={"type": "normal", "mean": mc_growth_mean, "std": mc_growth_std},
+                        interest_rate={"type": "uniform", "low": min(mc_rate_low, mc_rate_high), "high": max(mc_rate_low, mc_rate_high)},
+                        income_shock={"type": "normal", "mean": 0.0, "std": mc_shock_std},
+                        n_paths=int(mc_paths), chunk_size=max(1000, int(mc_paths) // 20), seed=int(mc_seed),
+                        label="몬테카를로 시뮬레이션"
+                    )
+                
+                mc_job = job_progress("monte_carlo")
+                if mc_job is not None and mc_job.status == DONE:
+                    st.session_state.monte_carlo = mc_job.result
+                elif mc_job is not None and not mc_job.finished and mc_job.partial:
+                    # 경로가 추가될 때마다 수렴 과정을 표시
+                    st.line_chart(pd.DataFrame(mc_job.partial).set_index("경로 수"))
+                
+                if st.session_state.get("monte_carlo"):
+                    mc_result = st.session_state.monte_carlo
+                    mc_labels = {
+                        "finalValue": "1주당 최종 평가액",
+                        "ownedValue": "대표이사 보유주식 가치",
+                        "inheritanceTax": "증여세",
+                        "transferTax": "양도소득세",
+                        "totalTax": "청산소득세",
+                    }
+                    mc_df = pd.DataFrame({
+                        "항목": list(mc_labels.values()),
+                        "평균 (원)": format_numbers([mc_result["mean"][key] for key in mc_labels]),
+                        **{
+                            f"P{p} (원)": format_numbers([mc_result["percentiles"][key][p] for key in mc_labels])
+                            for p in (5, 25, 50, 75, 95)
+                        }
+                    })
+                    st.dataframe(mc_df, hide_index=True, use_container_width=True)
+                    
+                    mc_fig = binned_histogram_chart(
+                        mc_result["histogram"]["counts"], mc_result["histogram"]["edges"],
+                        title=f'{future_years}년 후 주당 가치 분포 ({format_number(mc_result["paths"])}개 경로)',
+                        xaxis_title='주당 가치 (원)',
+                        yaxis_title='경로 수',
+                        height=400,
+                        margin=dict(l=20, r=20, t=50, b=20)
+                    )
+                    st.plotly_chart(mc_fig, use_container_width=True)
+            
             # 버튼 행
             col1, col2 = st.columns(2)
             with col1:
@@ -927,18 +1235,11 @@ elif page == "5. 미래 세금계산":
         future_years = st.session_state.future_years
         growth_rate = st.session_state.growth_rate
         
-        # 현재 및 미래 세금 계산
-        current_tax_details = calculate_tax_details(
-            st.session_state.stock_value,
-            owned_shares,
-            share_price
-        )
-        
-        future_tax_details = calculate_tax_details(
-            future_value,
-            owned_shares,
-            share_price
-        )
+        # 현재 및 미래 세금 계산 (미래 세금은 화면에 표시하는 미래 가치 결과로 계산, 그래프와 같은 공유 캐시)
+        valuation_graph = get_valuation_graph()
+        with timed("tax"):
+            current_tax_details = valuation_graph.get("taxDetails")
+            future_tax_details = calculate_tax_details(future_value, owned_shares, share_price)
         
         st.title(f"{future_years}년 후 세금 계산")
         
@@ -986,25 +1287,25 @@ elif page == "5. 미래 세금계산":
         # 세금 비교 테이블
         tax_comparison_df = pd.DataFrame({
             "세금 유형": [
-                "증여세 (40%)", 
-                "양도소득세 (22%)", 
+                f"증여세 ({format_rate(get_parameters()['flatTax']['inheritanceRate'])})", 
+                f"양도소득세 ({format_rate(get_parameters()['flatTax']['transferRate'])})", 
                 "청산소득세 (법인세+배당세)"
             ],
-            "현재 (원)": [
-                format_number(current_tax_details["inheritanceTax"]),
-                format_number(current_tax_details["transferTax"]),
-                format_number(current_tax_details["totalTax"])
-            ],
-            f"{future_years}년 후 (원)": [
-                format_number(future_tax_details["inheritanceTax"]),
-                format_number(future_tax_details["transferTax"]),
-                format_number(future_tax_details["totalTax"])
-            ],
-            "증가액 (원)": [
-                format_number(future_tax_details["inheritanceTax"] - current_tax_details["inheritanceTax"]),
-                format_number(future_tax_details["transferTax"] - current_tax_details["transferTax"]),
-                format_number(future_tax_details["totalTax"] - current_tax_details["totalTax"])
-            ]
+            "현재 (원)": format_numbers([
+                current_tax_details["inheritanceTax"],
+                current_tax_details["transferTax"],
+                current_tax_details["totalTax"]
+            ]),
+            f"{future_years}년 후 (원)": format_numbers([
+                future_tax_details["inheritanceTax"],
+                future_tax_details["transferTax"],
+                future_tax_details["totalTax"]
+            ]),
+            "증가액 (원)": format_numbers([
+                future_tax_details["inheritanceTax"] - current_tax_details["inheritanceTax"],
+                future_tax_details["transferTax"] - current_tax_details["transferTax"],
+                future_tax_details["totalTax"] - current_tax_details["totalTax"]
+            ])
         })
         
         st.dataframe(
@@ -1020,14 +1321,12 @@ elif page == "5. 미래 세금계산":
         )
         
         # 다운로드 기능
-        st.markdown(get_table_download_link(tax_comparison_df, f"{company_name}_{future_years}년후_세금비교", "💰 세금 비교 데이터 다운로드"), unsafe_allow_html=True)
+        excel_download_button(tax_comparison_df, f"{company_name}_{future_years}년후_세금비교", "💰 세금 비교 데이터 다운로드")
         
         # 세금 비교 시각화
         st.subheader("세금 비교 시각화")
         
         # 세금 비교 차트
-        fig = go.Figure()
-        
         tax_types = ["증여세", "양도소득세", "청산소득세"]
         current_taxes = [current_tax_details["inheritanceTax"], 
                         current_tax_details["transferTax"], 
@@ -1036,25 +1335,14 @@ elif page == "5. 미래 세금계산":
                        future_tax_details["transferTax"], 
                        future_tax_details["totalTax"]]
         
-        fig.add_trace(go.Bar(
-            name='현재',
-            x=tax_types,
-            y=current_taxes,
-            text=[format_number(tax) for tax in current_taxes],
-            textposition='auto',
-            marker_color='#5D9CEC'
-        ))
-        
-        fig.add_trace(go.Bar(
-            name=f'{future_years}년 후',
-            x=tax_types,
-            y=future_taxes,
-            text=[format_number(tax) for tax in future_taxes],
-            textposition='auto',
-            marker_color='#FC6E51'
-        ))
-        
-        fig.update_layout(
+        fig = bar_chart(
+            tax_types,
+            [
+                {"name": '현재', "y": current_taxes, "text": format_numbers(current_taxes).tolist(),
+                 "color": '#5D9CEC'},
+                {"name": f'{future_years}년 후', "y": future_taxes, "text": format_numbers(future_taxes).tolist(),
+                 "color": '#FC6E51'},
+            ],
             title='세금 유형별 현재-미래 비교',
             barmode='group',
             height=500,
@@ -1063,6 +1351,52 @@ elif page == "5. 미래 세금계산":
         
         st.plotly_chart(fig, use_container_width=True)
         
+        # 증여 시기 최적화
+        with st.expander("증여 시기 최적화", expanded=False):
+            st.markdown("성장률 가정에 따라 연도별로 몇 주를 증여할 때 상속증여세와 양도소득세 합계가 가장 작은지 계산합니다. "
+                        "최신 세법의 누진세율과 증여재산공제를 적용하며, 10년 안의 증여는 합산하여 과세합니다.")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                gift_horizon = st.slider("증여 기간 (년)", min_value=1, max_value=30, value=future_years)
+            with col2:
+                gift_discount_rate = st.number_input("할인율 (%)", min_value=0.0, max_value=50.0, value=0.0, step=0.5,
+                                                     help="미래에 내는 세금을 현재가치로 환산할 때 사용하는 연 할인율")
+            with col3:
+                gift_max_per_year = st.number_input("연간 최대 증여 주식수 (0 = 제한 없음)", min_value=0,
+                                                    max_value=int(owned_shares), value=0, step=1)
+
+            graph_inputs = valuation_graph.inputs()
+            gift_plan = cached_optimize_gift_schedule(
+                valuation_graph.get("stockValue"), graph_inputs["total_equity"], graph_inputs["shares"],
+                owned_shares, graph_inputs["interest_rate"], graph_inputs["evaluation_method"], share_price,
+                growth_rate, gift_horizon, discount_rate=gift_discount_rate,
+                max_shares_per_year=gift_max_per_year or None,
+            )
+
+            if gift_plan is None:
+                st.warning("연간 최대 증여 주식수로는 기간 내에 보유주식을 모두 증여할 수 없습니다.")
+            else:
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("최적 계획 세금 (현재가치)", f"{format_number(gift_plan['totalPresentValueTax'])}원")
+                # 연간 한도를 넘어 한 해에 전부 증여할 수 없으면 None
+                with col2:
+                    st.metric("지금 전부 증여", "한도 초과로 불가" if gift_plan['giftNowTax'] is None
+                              else f"{format_number(gift_plan['giftNowTax'])}원")
+                with col3:
+                    st.metric(f"{gift_horizon}년 후 전부 증여", "한도 초과로 불가" if gift_plan['giftAtHorizonTax'] is None
+                              else f"{format_number(gift_plan['giftAtHorizonTax'])}원")
+
+                plan_df = pd.DataFrame({
+                    "증여 시기": [f"{item['year']}년 후" if item['year'] else "현재" for item in gift_plan["plan"]],
+                    "증여 주식수": [f"{item['shares']:,.0f}주" for item in gift_plan["plan"]],
+                    "주당 가치": format_numbers([item["perShareValue"] for item in gift_plan["plan"]], suffix="원"),
+                    "증여 가액": format_numbers([item["value"] for item in gift_plan["plan"]], suffix="원"),
+                    "세금": format_numbers([item["tax"] for item in gift_plan["plan"]], suffix="원"),
+                    "세금 (현재가치)": format_numbers([item["presentValueTax"] for item in gift_plan["plan"]], suffix="원"),
+                })
+                st.dataframe(plan_df, use_container_width=True, hide_index=True)
+
         # 세금 절감 전략
         with st.expander("세금 절감 전략 (참고용)", expanded=True):
             st.markdown("""
@@ -1093,12 +1427,134 @@ elif page == "5. 미래 세금계산":
         with col2:
             if st.button("1. 처음으로 돌아가기", type="primary", use_container_width=True):
                 # 세션 상태 초기화
-                for key in ['evaluated', 'future_evaluated', 'stock_value', 'future_stock_value']:
+                for key in ['evaluated', 'future_evaluated', 'stock_value', 'future_stock_value', 'monte_carlo', 'valuation_graph']:
                     if key in st.session_state:
                         del st.session_state[key]
                 st.experimental_set_query_params(page="1")
                 st.experimental_rerun()
 
+# 6. 포트폴리오 일괄평가 페이지
+elif page == "6. 포트폴리오 일괄평가":
+    st.title("포트폴리오 일괄평가")
+    st.markdown("여러 회사의 입력값이 담긴 파일을 업로드하면 모든 회사를 한 번에 평가합니다. "
+                "컬럼 구성은 '데이터 저장 및 불러오기'에서 다운로드한 파일과 동일합니다.")
+    
+    portfolio_file = st.file_uploader("포트폴리오 파일을 업로드하세요 (.xlsx, .csv, .parquet)", type=list(IMPORT_FORMATS),
+                                      key="portfolio_file")
+    if portfolio_file is not None:
+        try:
+            with st.spinner("일괄 평가 중..."):
+                portfolio_df, import_errors, import_rows = load_portfolio_results(
+                    portfolio_file.getvalue(), portfolio_file.name, parameter_key())
+        except Exception as e:
+            st.error(f"파일 평가 오류: {str(e)}")
+        else:
+            show_import_errors(import_errors, import_rows)
+            if portfolio_df.empty:
+                st.error("평가할 수 있는 올바른 행이 없습니다.")
+            else:
+                # 요약 지표
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("평가 회사 수", f"{format_number(len(portfolio_df))}개")
+                with col2:
+                    st.metric("보유주식 가치 합계", f"{format_number(portfolio_df['보유주식가치'].sum())}원")
+                with col3:
+                    st.metric("증여세 합계", f"{format_number(portfolio_df['증여세'].sum())}원")
+            
+                # 정렬·필터·페이지 나누기는 서버에서 처리하고 보이는 행만 표시
+                sorted_df = paged_table(portfolio_df, "portfolio", default_sort="보유주식가치")
+            
+                # 결과 다운로드 기능
+                st.markdown("### 결과 다운로드")
+                excel_download_button(sorted_df, "포트폴리오_평가결과", "📊 포트폴리오 평가결과 다운로드")
+
+                # 회사 × 성장률 × 예측기간 × 환원율 격자 (디스크 memmap 에서 보는 구간만 읽음)
+                with st.expander("시나리오 격자 (성장률 × 예측기간 × 환원율)", expanded=False):
+                    st.markdown("모든 회사의 미래 가치를 격자로 계산해 디스크에 저장합니다. "
+                                "같은 조건으로 다시 보면 계산하지 않고 저장된 파일에서 필요한 구간만 읽습니다.")
+                    col1, col2, col3, col4, col5 = st.columns(5)
+                    with col1:
+                        cube_rate_start = st.number_input("최소 성장률 (%)", min_value=0.0, max_value=100.0, value=0.0,
+                                                          step=0.5, key="cube_rate_start")
+                    with col2:
+                        cube_rate_stop = st.number_input("최대 성장률 (%)", min_value=0.0, max_value=100.0, value=20.0,
+                                                         step=0.5, key="cube_rate_stop")
+                    with col3:
+                        cube_rate_step = st.number_input("성장률 간격 (%)", min_value=0.1, max_value=100.0, value=1.0,
+                                                         step=0.1, key="cube_rate_step")
+                    with col4:
+                        cube_years = st.slider("최대 예측 기간 (년)", min_value=1, max_value=30, value=10, key="cube_years")
+                    with col5:
+                        cube_interest = st.slider("환원율 범위 (%)", min_value=1, max_value=20, value=(8, 12),
+                                                  key="cube_interest")
+
+                    if st.checkbox("격자 계산 및 보기", key="cube_show"):
+                        imported = import_portfolio(portfolio_file.getvalue(), portfolio_file.name)
+                        try:
+                            cube_args = (
+                                imported["data"],
+                                growth_rate_range(cube_rate_start, max(cube_rate_start, cube_rate_stop), cube_rate_step),
+                                np.arange(1, cube_years + 1),
+                                np.arange(cube_interest[0], cube_interest[1] + 1),
+                            )
+                            cube = get_cube_store().lookup(*cube_args)
+                        except (OSError, ValueError) as e:
+                            cube = None
+                            st.error(f"격자 계산 오류: {str(e)}")
+                        else:
+                            # 저장된 격자가 없으면 백그라운드 작업으로 계산
+                            if cube is None and st.button("격자 계산 시작", key="cube_run"):
+                                submit_job("cube", "simulation", scenario_cube_job, get_cube_store(), *cube_args,
+                                           label="시나리오 격자 계산")
+                            job_progress("cube")
+                        if cube is not None:
+                            st.caption(f"격자 {' × '.join(format_number(size) for size in cube.shape)} "
+                                       f"({cube.nbytes / 2 ** 20:,.1f}MB, {cube.header['createdAt']} 계산)")
+                            col1, col2, col3 = st.columns(3)
+                            with col1:
+                                cube_company_label = st.selectbox("회사", cube.axes["company"].tolist(),
+                                                                  key="cube_company")
+                                cube_company = cube.axis_index("company", cube_company_label)
+                            with col2:
+                                cube_rate_value = st.selectbox("환원율 (%)", cube.axes["interestRate"].tolist(),
+                                                               key="cube_rate")
+                                cube_rate = cube.axis_index("interestRate", cube_rate_value)
+                            with col3:
+                                cube_output_label = st.selectbox("결과 항목", list(SENSITIVITY_OUTPUTS.values()),
+                                                                 key="cube_output")
+                                cube_output = next(key for key, label in SENSITIVITY_OUTPUTS.items()
+                                                   if label == cube_output_label)
+
+                            # 선택한 회사·환원율의 (성장률, 기간) 구간만 읽어 그림
+                            fig = heatmap_chart(
+                                cube.axes["futureYears"], cube.axes["growthRate"],
+                                cube.select(cube_output, company=cube_company, interestRate=cube_rate),
+                                '원', '%{x}년 / 성장률 %{y}%<br>%{z:,.0f}원<extra></extra>',
+                                title=f'{cube.axes["company"][cube_company]} {SENSITIVITY_OUTPUTS[cube_output]}',
+                                xaxis_title='예측 기간 (년)',
+                                yaxis_title='연간 성장률 (%)',
+                                height=500,
+                            )
+                            st.plotly_chart(fig, use_container_width=True)
+
+                            # 선택한 회사의 전체 (성장률, 기간, 환원율) 구간 표와 내보내기
+                            cube_table = cube.frame(company=cube_company).rename(columns={
+                                "growthRate": "연간 성장률 (%)",
+                                "futureYears": "예측 기간 (년)",
+                                "interestRate": "환원율 (%)",
+                                "finalValue": "주당 평가액",
+                                "totalValue": "회사 총가치",
+                                "ownedValue": "보유주식 가치",
+                            })
+                            cube_sorted = paged_table(cube_table, "cube", formats={
+                                "연간 성장률 (%)": lambda column: [f"{value:g}%" for value in column],
+                                "예측 기간 (년)": lambda column: format_numbers(column, suffix="년"),
+                                "환원율 (%)": lambda column: [f"{value:g}%" for value in column],
+                            }, default_sort="연간 성장률 (%)", default_ascending=True)
+                            excel_download_button(cube_sorted, "시나리오_격자", "📊 선택한 회사 격자 다운로드",
+                                                  key="cube_export")
+
 # 맨 아래 푸터 정보
 st.markdown("---")
 st.markdown("""
@@ -1112,3 +1568,48 @@ st.markdown("""
 st.sidebar.markdown("---")
 st.sidebar.markdown("[GitHub 코드 보기](https://github.com/yourusername/business-valuation-calculator)")
 st.sidebar.markdown("[버그 신고 및 제안](https://github.com/yourusername/business-valuation-calculator/issues)")
+
+# 성능 진단 패널 (이번 재실행의 단계별 소요 시간과 누적 통계)
+metrics_run = finish_run()
+if st.sidebar.checkbox("성능 진단 표시", key="show_metrics"):
+    with st.sidebar.expander("성능 진단", expanded=True):
+        st.markdown("**이번 실행**")
+        run_summary = metrics_run.summary()
+        st.dataframe(pd.DataFrame({
+            "단계": [stage for stage, _, _, _ in run_summary],
+            "호출 수": [calls for _, calls, _, _ in run_summary],
+            "소요 (ms)": [round(seconds * 1000, 1) for _, _, seconds, _ in run_summary],
+            "결과 크기": format_numbers([np.nan if size is None else size for _, _, _, size in run_summary], suffix="B"),
+        }), hide_index=True, use_container_width=True)
+        
+        st.markdown("**누적 (프로세스 시작 이후)**")
+        stage_stats = get_registry().snapshot()
+        st.dataframe(pd.DataFrame({
+            "단계": list(stage_stats),
+            "호출 수": [stats["count"] for stats in stage_stats.values()],
+            "평균 (ms)": [round(stats["meanSeconds"] * 1000, 1) for stats in stage_stats.values()],
+            "최대 (ms)": [round(stats["maxSeconds"] * 1000, 1) for stats in stage_stats.values()],
+            "결과 크기 합계": format_numbers([stats["payloadBytes"] if stats["payloadCount"] else np.nan
+                                      for stats in stage_stats.values()], suffix="B"),
+        }), hide_index=True, use_container_width=True)
+        
+        st.download_button("JSON 내보내기", data=get_registry().to_json(), file_name="metrics.json",
+                           mime="application/json", key="metrics_json")
+        st.download_button("Prometheus 텍스트 내보내기", data=get_registry().to_prometheus(), file_name="metrics.prom",
+                           mime="text/plain", key="metrics_prometheus")
+        
+        background_jobs = [job.snapshot() for job in get_job_runner().jobs()]
+        if background_jobs:
+            st.markdown("**백그라운드 작업**")
+            st.dataframe(pd.DataFrame({
+                "작업": [job["label"] for job in background_jobs],
+                "상태": [job["status"] for job in background_jobs],
+                "진행률": format_percents([job["progress"] * 100 for job in background_jobs], decimals=0),
+                "소요 (초)": [round(job["elapsedSeconds"], 1) for job in background_jobs],
+            }), hide_index=True, use_container_width=True)
+
+# 이 페이지에 표시한 작업이 실행 중이면 잠시 후 다시 실행해 진행률과 끝난 결과를 표시
+# (다른 페이지의 작업은 계속 실행되며, 그 페이지로 돌아가면 결과를 가져옴)
+if displayed_jobs:
+    time.sleep(JOB_POLL_SECONDS)
+    st.experimental_rerun()
@@ -0,0 +1 @@
+# 계산 함수 성능 측정 (python -m benchmarks.run)
@@ -0,0 +1,228 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from valuation import core
+from valuation.batch import EVALUATION_METHODS, calculate_stock_value_batch, calculate_tax_details_batch
+from valuation.export import write_excel
+from valuation.formatting import format_numbers
+from valuation.parallel import default_workers, shutdown
+from valuation.portfolio import value_portfolio
+from valuation.simulation import calculate_future_stock_value_grid, growth_rate_range
+
+DEFAULT_SCALES = (1, 1000, 100000)
+# 스칼라 함수는 회사 수만큼 호출하므로 큰 규모에서는 이 수만큼만 측정
+MAX_SCALAR_CALLS = 100000
+# 포트폴리오 병렬 평가를 측정하는 프로세스 수 (가장 큰 규모에서만 측정)
+DEFAULT_WORKERS = tuple(sorted({1, 2, 4, default_workers()}))
+GRIDS = {"5x10": (growth_rate_range(5, 25, 5), np.arange(1, 11)),
+         "300x30": (growth_rate_range(0.1, 30, 0.1), np.arange(1, 31))}
+
+
+def generate_companies(n, seed=0):
+    """벤치마크용 가상 회사 n 개의 입력 컬럼을 생성합니다."""
+    rng = np.random.default_rng(seed)
+    shares = rng.integers(1000, 1000000, n)
+    return {
+        "total_equity": rng.integers(10 ** 8, 10 ** 11, n),
+        "net_income1": rng.integers(-10 ** 9, 5 * 10 ** 9, n),
+        "net_income2": rng.integers(-10 ** 9, 5 * 10 ** 9, n),
+        "net_income3": rng.integers(-10 ** 9, 5 * 10 ** 9, n),
+        "shares": shares,
+        "interest_rate": rng.integers(1, 21, n),
+        "evaluation_method": rng.choice(np.array(EVALUATION_METHODS), n),
+        "owned_shares": (shares * rng.random(n)).astype(np.int64),
+        "share_price": np.full(n, 5000),
+    }
+
+
+def _summary(samples, items):
+    samples = np.asarray(samples)
+    p50 = float(np.percentile(samples, 50))
+    return {
+        "latency": {
+            "min": float(samples.min()),
+            "mean": float(samples.mean()),
+            "p50": p50,
+            "p90": float(np.percentile(samples, 90)),
+            "p99": float(np.percentile(samples, 99)),
+        },
+        "throughput": items / p50 if p50 > 0 else None,
+    }
+
+
+def _peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(name, scale, func, items, repeat):
+    """func 를 repeat 번 실행한 지연시간 백분위수, 처리량(건/초), 최대 메모리를 측정합니다."""
+    func()  # 워밍업
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return {"name": name, "scale": scale, "repeat": repeat, **_summary(samples, items),
+            "peakMemoryBytes": _peak_memory(func)}
+
+
+def measure_calls(name, scale, func, args_list):
+    """스칼라 함수를 호출 단위로 측정합니다. 지연시간은 호출 1회 기준입니다."""
+    func(*args_list[0])
+    samples = []
+    for args in args_list:
+        started = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - started)
+
+    def run_all():
+        for args in args_list:
+            func(*args)
+
+    return {"name": name, "scale": scale, "repeat": len(args_list), **_summary(samples, 1),
+            "peakMemoryBytes": _peak_memory(run_all)}
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, repeat=5, seed=0, excel_rows=1000, workers=DEFAULT_WORKERS):
+    results = []
+    for scale in scales:
+        data = generate_companies(scale, seed)
+        calls = min(scale, MAX_SCALAR_CALLS)
+        rows = [tuple(data[key][i].item() for key in (
+            "total_equity", "net_income1", "net_income2", "net_income3", "shares",
+            "interest_rate", "evaluation_method", "owned_shares")) for i in range(calls)]
+        values = [core.calculate_stock_value(*row) for row in rows]
+
+        # 스칼라 경로
+        results.append(measure_calls("calculate_stock_value", scale, core.calculate_stock_value, rows))
+        results.append(measure_calls(
+            "calculate_tax_details", scale, core.calculate_tax_details,
+            [(value, row[7], 5000) for value, row in zip(values, rows)]))
+        results.append(measure_calls(
+            "calculate_future_stock_value", scale, core.calculate_future_stock_value,
+            [(value, row[0], row[4], row[7], row[5], row[6], 10, 5) for value, row in zip(values, rows)]))
+        results.append(measure_calls(
+            "format_number", scale, core.format_number, [(value["ownedValue"],) for value in values]))
+
+        # 배열 경로
+        batch_args = tuple(data[key] for key in (
+            "total_equity", "net_income1", "net_income2", "net_income3", "shares",
+            "interest_rate", "evaluation_method", "owned_shares"))
+        batch_value = calculate_stock_value_batch(*batch_args)
+        results.append(measure("calculate_stock_value_batch", scale,
+                               lambda: calculate_stock_value_batch(*batch_args), scale, repeat))
+        results.append(measure("calculate_tax_details_batch", scale,
+                               lambda: calculate_tax_details_batch(batch_value["ownedValue"], data["owned_shares"],
+                                                                   data["share_price"]),
+                               scale, repeat))
+        results.append(measure("format_numbers", scale, lambda: format_numbers(batch_value["ownedValue"]),
+                               scale, repeat))
+
+    # 포트폴리오 평가의 프로세스 수별 처리량 (숫자 컬럼을 공유 메모리로 나누어 계산)
+    scale = max(scales)
+    frame = pd.DataFrame(generate_companies(scale, seed))
+    try:
+        for count in workers:
+            results.append(measure(f"value_portfolio[workers={count}]", scale,
+                                   lambda count=count: value_portfolio(frame, 10, 5, workers=count), scale, repeat))
+    finally:
+        shutdown()
+
+    # 성장률 × 기간 시뮬레이션
+    stock_value = core.calculate_stock_value(1002804000, 386650000, 163401000, 75794000, 4000, 10, "일반법인", 2000)
+    for grid_name, (growth_rates, years) in GRIDS.items():
+        cells = len(growth_rates) * len(years)
+
+        def scalar_grid(growth_rates=growth_rates, years=years):
+            for growth_rate in growth_rates:
+                for year in years:
+                    core.calculate_future_stock_value(stock_value, 1002804000, 4000, 2000, 10, "일반법인",
+                                                      float(growth_rate), int(year))
+
+        results.append(measure("future_value_scalar_loop", grid_name, scalar_grid, cells, repeat))
+        results.append(measure("calculate_future_stock_value_grid", grid_name,
+                               lambda growth_rates=growth_rates, years=years: calculate_future_stock_value_grid(
+                                   stock_value, 1002804000, 4000, 2000, 10, "일반법인", growth_rates, years),
+                               cells, repeat))
+
+    # 엑셀 내보내기
+    frame = pd.DataFrame(generate_companies(excel_rows, seed))
+    results.append(measure("to_excel", excel_rows, lambda: write_excel(frame, BytesIO()), excel_rows,
+                           max(1, repeat // 2)))
+    return results
+
+
+def environment():
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpuCount": default_workers(),
+    }
+
+
+def compare(current, baseline):
+    """이전 결과 대비 p50 지연시간 비율을 출력합니다 (1보다 크면 느려짐)."""
+    previous = {(item["name"], str(item["scale"])): item for item in baseline["results"]}
+    print(f"{'항목':<36}{'규모':>10}{'이전 p50':>14}{'현재 p50':>14}{'비율':>8}")
+    for item in current["results"]:
+        old = previous.get((item["name"], str(item["scale"])))
+        if old is None:
+            continue
+        ratio = item["latency"]["p50"] / old["latency"]["p50"] if old["latency"]["p50"] else float("nan")
+        print(f"{item['name']:<36}{str(item['scale']):>10}{old['latency']['p50']:>14.6f}"
+              f"{item['latency']['p50']:>14.6f}{ratio:>8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="계산 함수 성능 측정")
+    parser.add_argument("--scales", default=",".join(str(scale) for scale in DEFAULT_SCALES),
+                        help="가상 회사 수 (쉼표로 구분, 예: 1,1000,100000,1000000)")
+    parser.add_argument("--repeat", type=int, default=5, help="배열 함수 반복 측정 횟수")
+    parser.add_argument("--seed", type=int, default=0, help="가상 데이터 시드")
+    parser.add_argument("--excel-rows", type=int, default=1000, help="엑셀 내보내기 측정 행 수")
+    parser.add_argument("--workers", default=",".join(str(count) for count in DEFAULT_WORKERS),
+                        help="포트폴리오 병렬 평가를 측정할 프로세스 수 (쉼표로 구분, 가장 큰 규모에서 측정)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    scales = [int(scale) for scale in args.scales.split(",") if scale]
+    report = {"environment": environment(),
+              "results": run_benchmarks(scales, repeat=args.repeat, seed=args.seed, excel_rows=args.excel_rows,
+                                        workers=[int(count) for count in args.workers.split(",") if count])}
+
+    for item in report["results"]:
+        throughput = f"{item['throughput']:,.0f}/s" if item["throughput"] else "-"
+        print(f"{item['name']:<36}{str(item['scale']):>10}  p50={item['latency']['p50'] * 1000:10.3f}ms  "
+              f"p99={item['latency']['p99'] * 1000:10.3f}ms  {throughput:>16}  "
+              f"peak={item['peakMemoryBytes'] / 1024 / 1024:8.2f}MiB")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
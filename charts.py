@@ -0,0 +1,144 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from valuation.cache import memoize
+from valuation.metrics import instrument
+
+# 한 그림의 점 수가 이 값을 넘으면 WebGL(Scattergl)로 그림
+WEBGL_THRESHOLD = 1000
+# 선 하나에 보내는 최대 점 수 (넘으면 LTTB 로 줄임)
+MAX_POINTS = 2000
+# 히스토그램은 표본 대신 서버에서 계산한 구간별 개수만 전송
+HISTOGRAM_BINS = 100
+
+# 그림 캐시: 같은 데이터로 다시 실행하면 만들어 둔 Figure 를 그대로 사용 (반환된 Figure 는 수정하지 말 것)
+# 캐시 적중을 포함한 호출 시간과 trace 데이터 크기는 'figure' 단계로 기록
+FIGURE_CACHE_SIZE = 128
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets 로 모양을 유지하면서 점 수를 n_out 개로 줄입니다."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    # 처음과 마지막 점은 유지하고 나머지를 n_out - 2 개 구간으로 나눔
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        # 다음 구간의 평균점 (마지막 구간은 마지막 점)
+        if i + 2 < len(edges):
+            next_x = x[stop:edges[i + 2]].mean()
+            next_y = y[stop:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs((x[previous] - next_x) * (y[start:stop] - y[previous])
+                      - (x[previous] - x[start:stop]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return x[selected], y[selected]
+
+
+def line_trace(x, y, webgl=False, max_points=MAX_POINTS, **kwargs):
+    """선 trace 를 만듭니다. 점이 max_points 보다 많으면 줄이고, webgl 이면 Scattergl 을 사용합니다."""
+    if len(x) > max_points:
+        x, y = lttb(x, y, max_points)
+    trace_type = go.Scattergl if webgl else go.Scatter
+    return trace_type(x=x, y=y, **kwargs)
+
+
+@instrument("figure", payload=True)
+@memoize("figure.pie", maxsize=FIGURE_CACHE_SIZE)
+def pie_chart(labels, values, colors=None, **layout):
+    fig = go.Figure(data=[go.Pie(labels=labels, values=values, hole=.3, marker_colors=colors)])
+    fig.update_layout(**layout)
+    return fig
+
+
+@instrument("figure", payload=True)
+@memoize("figure.bar", maxsize=FIGURE_CACHE_SIZE)
+def bar_chart(x, series, **layout):
+    """series 는 {"y", "name", "color", "text"} dict 목록입니다 (막대 묶음 하나당 하나)."""
+    fig = go.Figure()
+    for item in series:
+        fig.add_trace(go.Bar(
+            x=x,
+            y=item["y"],
+            name=item.get("name"),
+            text=item.get("text"),
+            textposition='auto',
+            marker_color=item.get("color"),
+        ))
+    fig.update_layout(**layout)
+    return fig
+
+
+@instrument("figure", payload=True)
+@memoize("figure.tornado", maxsize=FIGURE_CACHE_SIZE)
+def tornado_chart(labels, low_values, high_values, low_inputs, high_inputs, base_value, **layout):
+    fig = go.Figure()
+    for name, values, inputs, color in (("하한", low_values, low_inputs, '#FC6E51'),
+                                        ("상한", high_values, high_inputs, '#5D9CEC')):
+        fig.add_trace(go.Bar(
+            y=labels,
+            x=[value - base_value for value in values],
+            base=base_value,
+            orientation='h',
+            name=name,
+            marker_color=color,
+            customdata=inputs,
+            hovertemplate='%{customdata}: %{x:,.0f}원<extra></extra>'
+        ))
+    fig.update_layout(barmode='overlay', **layout)
+    return fig
+
+
+@instrument("figure", payload=True)
+@memoize("figure.heatmap", maxsize=FIGURE_CACHE_SIZE)
+def heatmap_chart(x, y, z, colorbar_title, hovertemplate, **layout):
+    fig = go.Figure(data=[go.Heatmap(x=x, y=y, z=z, colorbar=dict(title=colorbar_title),
+                                     hovertemplate=hovertemplate)])
+    fig.update_layout(**layout)
+    return fig
+
+
+@instrument("figure", payload=True)
+@memoize("figure.line", maxsize=FIGURE_CACHE_SIZE)
+def line_chart(x, series, mode='lines', hovertemplate=None, **layout):
+    """series 는 (이름, y 배열) 목록입니다. 전체 점 수가 WEBGL_THRESHOLD 를 넘으면 WebGL 로 그립니다."""
+    webgl = len(x) * len(series) > WEBGL_THRESHOLD
+    fig = go.Figure()
+    for name, y in series:
+        fig.add_trace(line_trace(x, y, webgl=webgl, mode=mode, name=name, hovertemplate=hovertemplate))
+    fig.update_layout(**layout)
+    return fig
+
+
+@instrument("figure", payload=True)
+@memoize("figure.binned_histogram", maxsize=FIGURE_CACHE_SIZE)
+def binned_histogram_chart(counts, edges, color='#5D9CEC', **layout):
+    """미리 계산한 구간별 개수(counts)와 구간 경계(edges)로 히스토그램 막대를 그립니다."""
+    edges = np.asarray(edges)
+    fig = go.Figure(data=[go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        marker_color=color,
+        hovertemplate='%{x:,.0f}원: %{y:,}개<extra></extra>'
+    )])
+    fig.update_layout(bargap=0, **layout)
+    return fig
+
+
+def histogram_chart(samples, bins=HISTOGRAM_BINS, color='#5D9CEC', **layout):
+    """표본 전체 대신 np.histogram 으로 계산한 구간별 개수를 막대로 그립니다.
+
+    캐시 키에 표본 배열을 넣지 않도록 구간별 개수와 경계로 binned_histogram_chart 를 호출합니다.
+    """
+    counts, edges = np.histogram(np.asarray(samples), bins=bins)
+    return binned_histogram_chart(counts, edges, color, **layout)
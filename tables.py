@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from valuation.core import format_number
+from valuation.formatting import format_frame
+from valuation.metrics import timed
+
+PAGE_SIZES = (50, 100, 500, 1000)
+NO_FILTER = "(없음)"
+
+
+def query_table(df, sort_by=None, ascending=True, search=None, range_column=None, range_min=None, range_max=None):
+    """필터와 정렬을 서버에서 적용하고, 결과 행 위치 배열을 반환합니다 (DataFrame 은 복사하지 않음).
+
+    search 는 문자열 컬럼에 포함된 글자로, range_column/range_min/range_max 는 숫자 컬럼 구간으로 거릅니다.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    if search:
+        text_columns = [col for col in df.columns if not pd.api.types.is_numeric_dtype(df[col])]
+        found = np.zeros(len(df), dtype=bool)
+        for col in text_columns:
+            found |= df[col].astype(str).str.contains(search, regex=False, na=False).to_numpy()
+        mask &= found
+    if range_column is not None:
+        values = df[range_column].to_numpy()
+        if range_min is not None:
+            mask &= values >= range_min
+        if range_max is not None:
+            mask &= values <= range_max
+
+    positions = np.flatnonzero(mask)
+    if sort_by is not None:
+        # 정렬 컬럼 하나만 정렬하여 행 위치를 얻음 (같은 값은 원래 순서 유지)
+        keys = df[sort_by].iloc[positions].reset_index(drop=True)
+        order = keys.sort_values(ascending=ascending, kind="stable").index.to_numpy()
+        positions = positions[order]
+    return positions
+
+
+def paged_table(df, key, formats=None, default_sort=None, default_ascending=False):
+    """정렬·필터·페이지 나누기를 서버에서 처리하고 보이는 구간만 브라우저로 보내는 표입니다.
+
+    formats 는 format_frame 과 같은 {컬럼: 함수} 이며, 필터와 정렬을 적용한 전체 결과(다운로드용)를 반환합니다.
+    """
+    columns = list(df.columns)
+    numeric_columns = [col for col in columns if pd.api.types.is_numeric_dtype(df[col])]
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        search = st.text_input("검색", key=f"{key}_search", placeholder="회사명 등 문자열 검색")
+    with col2:
+        range_column = st.selectbox("숫자 조건", [NO_FILTER] + numeric_columns, key=f"{key}_range_column")
+    range_min = range_max = None
+    if range_column != NO_FILTER:
+        with col3:
+            low, high = st.columns(2)
+            with low:
+                range_min = st.number_input("최솟값", value=float(df[range_column].min()), key=f"{key}_range_min")
+            with high:
+                range_max = st.number_input("최댓값", value=float(df[range_column].max()), key=f"{key}_range_max")
+    else:
+        range_column = None
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        sort_column = st.selectbox("정렬 기준", columns, key=f"{key}_sort",
+                                   index=columns.index(default_sort) if default_sort in columns else 0)
+    with col2:
+        direction = st.radio("정렬 방향", ["내림차순", "오름차순"], horizontal=True, key=f"{key}_direction",
+                             index=1 if default_ascending else 0)
+    with col3:
+        page_size = st.selectbox("페이지당 행 수", PAGE_SIZES, index=1, key=f"{key}_page_size")
+
+    with timed("table"):
+        positions = query_table(df, sort_column, direction == "오름차순", search, range_column, range_min, range_max)
+    total_pages = max(1, -(-len(positions) // page_size))
+    with col4:
+        page_number = st.number_input(f"페이지 (총 {total_pages})", min_value=1, max_value=total_pages, value=1,
+                                      key=f"{key}_page")
+
+    start = (min(page_number, total_pages) - 1) * page_size
+    with timed("table") as measurement:
+        window = df.iloc[positions[start:start + page_size]]
+        measurement.payload = format_frame(window, formats)
+        st.dataframe(measurement.payload, hide_index=True, use_container_width=True)
+    st.caption(f"전체 {format_number(len(df))}행 중 {format_number(len(positions))}행 "
+               f"({format_number(start + 1 if len(positions) else 0)}–{format_number(start + len(window))}행 표시)")
+    return df.iloc[positions]
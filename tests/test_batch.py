@@ -0,0 +1,138 @@
+import json
+
+import numpy as np
+import pytest
+
+from valuation.batch import (METHOD_GENERAL, calculate_future_stock_value_batch, calculate_stock_value_batch,
+                             calculate_tax_details_batch)
+from valuation.core import (EVALUATION_METHODS, calculate_future_stock_value, calculate_stock_value,
+                            calculate_tax_details)
+from valuation.results import FutureStockValue, StockValue
+
+
+def random_companies(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "total_equity": rng.uniform(1e7, 5e9, n).round(),
+        "net_income1": rng.uniform(-2e8, 8e8, n).round(),
+        "net_income2": rng.uniform(-2e8, 8e8, n).round(),
+        "net_income3": rng.uniform(-2e8, 8e8, n).round(),
+        "shares": rng.integers(1000, 200000, n).astype(float),
+        "interest_rate": rng.uniform(1, 20, n),
+        "evaluation_method": np.array(EVALUATION_METHODS)[np.arange(n) % len(EVALUATION_METHODS)],
+        "owned_shares": rng.integers(0, 1000, n).astype(float),
+    }
+
+
+def batch_of(companies):
+    return calculate_stock_value_batch(*(companies[name] for name in (
+        "total_equity", "net_income1", "net_income2", "net_income3", "shares", "interest_rate",
+        "evaluation_method", "owned_shares")))
+
+
+def scalar_of(companies, i):
+    return calculate_stock_value(*(companies[name][i].item() for name in (
+        "total_equity", "net_income1", "net_income2", "net_income3", "shares", "interest_rate",
+        "evaluation_method", "owned_shares")))
+
+
+def assert_same_record(row, expected):
+    assert list(row) == list(expected)
+    for field in expected:
+        if isinstance(expected[field], str):
+            assert row[field] == expected[field], field
+        else:
+            assert row[field] == pytest.approx(expected[field], rel=1e-12, abs=1e-9), field
+
+
+def test_batch_matches_scalar_field_by_field_for_every_method():
+    companies = random_companies(300)
+    batch = batch_of(companies)
+    for i in range(300):
+        assert_same_record(batch.row(i), scalar_of(companies, i))
+    assert set(batch["methodCode"]) == {0, 1, 2}
+
+
+def test_goodwill_is_clamped_at_zero_in_both_paths():
+    # 이익이 자기자본 수익에 못 미쳐 영업권이 음수가 되는 회사
+    companies = {
+        "total_equity": np.array([5e9, 5e9]), "net_income1": np.array([1e6, -1e8]),
+        "net_income2": np.array([1e6, -1e8]), "net_income3": np.array([1e6, -1e8]),
+        "shares": np.array([10000.0, 10000.0]), "interest_rate": np.array([10.0, 10.0]),
+        "evaluation_method": np.array([EVALUATION_METHODS[0], EVALUATION_METHODS[1]]),
+        "owned_shares": np.array([100.0, 100.0]),
+    }
+    batch = batch_of(companies)
+    np.testing.assert_array_equal(batch["assetValueWithGoodwill"], batch["netAssetPerShare"])
+    for i in range(2):
+        expected = scalar_of(companies, i)
+        assert expected["assetValueWithGoodwill"] == expected["netAssetPerShare"]
+        assert_same_record(batch.row(i), expected)
+
+
+def test_zero_equity_gives_zero_increase_percentage():
+    companies = {
+        "total_equity": np.array([0.0, 0.0]), "net_income1": np.array([3e8, 0.0]),
+        "net_income2": np.array([2e8, 0.0]), "net_income3": np.array([1e8, 0.0]),
+        "shares": np.array([4000.0, 4000.0]), "interest_rate": np.array([10.0, 10.0]),
+        "evaluation_method": np.array([EVALUATION_METHODS[0], EVALUATION_METHODS[2]]),
+        "owned_shares": np.array([100.0, 100.0]),
+    }
+    batch = batch_of(companies)
+    np.testing.assert_array_equal(batch["increasePercentage"], [0, 0])
+    for i in range(2):
+        expected = scalar_of(companies, i)
+        assert expected["increasePercentage"] == 0
+        assert_same_record(batch.row(i), expected)
+
+
+def test_future_and_tax_batches_match_scalar():
+    companies = random_companies(60, seed=1)
+    batch = batch_of(companies)
+    future = calculate_future_stock_value_batch(batch, companies["total_equity"], companies["shares"],
+                                                companies["owned_shares"], companies["interest_rate"],
+                                                companies["evaluation_method"], 7.5, 4)
+    tax = calculate_tax_details_batch(future["ownedValue"], companies["owned_shares"], 5000)
+    for i in range(60):
+        stock_value = scalar_of(companies, i)
+        expected = calculate_future_stock_value(stock_value, companies["total_equity"][i], companies["shares"][i],
+                                                companies["owned_shares"][i], companies["interest_rate"][i],
+                                                str(companies["evaluation_method"][i]), 7.5, 4)
+        assert_same_record(future.row(i), expected)
+        expected_tax = calculate_tax_details(expected, companies["owned_shares"][i], 5000)
+        if expected_tax is None:
+            continue
+        for field, value in expected_tax.items():
+            assert tax[field][i] == pytest.approx(value, rel=1e-12, abs=1e-9), field
+
+
+def test_integer_method_codes_match_strings():
+    companies = random_companies(30, seed=2)
+    codes = dict(companies, evaluation_method=np.full(30, METHOD_GENERAL))
+    strings = dict(companies, evaluation_method=np.full(30, EVALUATION_METHODS[METHOD_GENERAL]))
+    for field in StockValue.FIELDS:
+        if field != "methodText":
+            np.testing.assert_array_equal(batch_of(codes)[field], batch_of(strings)[field])
+
+
+def test_scalar_results_are_plain_dicts_that_round_trip_through_json():
+    stock_value = calculate_stock_value(1_000_000_000, 300_000_000, 200_000_000, 100_000_000, 10000, 10,
+                                        EVALUATION_METHODS[0], 100)
+    future = calculate_future_stock_value(stock_value, 1_000_000_000, 10000, 100, 10, EVALUATION_METHODS[0], 5, 3)
+    for result, record_type in ((stock_value, StockValue), (future, FutureStockValue)):
+        assert type(result) is dict
+        assert list(result) == list(record_type.FIELDS)
+        assert json.loads(json.dumps(result)) == result
+        # 호출하는 쪽에서 결과에 값을 추가할 수 있어야 함
+        result["note"] = "ok"
+
+
+def test_batch_rows_match_scalar_dicts_after_to_dict():
+    companies = random_companies(20, seed=3)
+    batch = batch_of(companies)
+    for i in range(20):
+        row = batch.row(i).to_dict()
+        expected = scalar_of(companies, i)
+        assert type(row) is dict
+        assert_same_record(row, expected)
+        assert json.loads(json.dumps(row, default=lambda value: value.item())).keys() == expected.keys()
@@ -0,0 +1,38 @@
+import numpy as np
+
+from valuation.cache import DIGEST_BYTES, canonical_key, memoize
+
+
+def test_large_arrays_are_keyed_by_digest():
+    samples = np.random.default_rng(0).normal(size=1_000_000)
+    key = canonical_key(samples)
+    assert len(key[3]) == 32
+    assert canonical_key(samples.copy()) == key
+    changed = samples.copy()
+    changed[-1] += 1
+    assert canonical_key(changed) != key
+    assert canonical_key(samples.astype(np.float32)) != key
+    assert canonical_key(samples.reshape(1000, 1000)) != key
+
+
+def test_small_arrays_keep_their_bytes():
+    values = np.arange(DIGEST_BYTES // 8, dtype=np.float64)
+    assert canonical_key(values)[3] == values.tobytes()
+
+
+def test_non_contiguous_arrays_hash_by_value():
+    grid = np.random.default_rng(1).normal(size=(2000, 30))
+    assert canonical_key(grid[:, 3]) == canonical_key(np.ascontiguousarray(grid[:, 3]))
+
+
+def test_memoize_hits_for_equal_large_arrays():
+    calls = []
+
+    @memoize("test_cache.total", maxsize=4)
+    def total(values):
+        calls.append(1)
+        return float(values.sum())
+
+    samples = np.ones(100_000)
+    assert total(samples) == total(samples.copy()) == 100_000
+    assert len(calls) == 1
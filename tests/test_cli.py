@@ -0,0 +1,59 @@
+import json
+
+import pandas as pd
+
+from valuation.cli import main
+
+ROWS = [
+    {"company_name": "A", "total_equity": 1002804000, "net_income1": 386650000, "net_income2": 163401000,
+     "net_income3": 75169000, "shares": 4000, "owned_shares": 2000, "share_price": 5000, "interest_rate": 10,
+     "evaluation_method": "일반법인"},
+    {"company_name": "B", "total_equity": 500000000, "net_income1": 50000000, "net_income2": 40000000,
+     "net_income3": 30000000, "shares": 10000, "owned_shares": 100, "share_price": 5000, "interest_rate": 10,
+     "evaluation_method": "순자산가치만 평가"},
+]
+
+
+def write_input(tmp_path, rows):
+    path = tmp_path / "in.csv"
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+
+def test_valid_input_exits_0_and_writes_every_row(tmp_path, capsys):
+    output = tmp_path / "out.csv"
+    assert main([write_input(tmp_path, ROWS * 3), str(output), "--chunk-size", "2", "--quiet"]) == 0
+    stats = json.loads(capsys.readouterr().out)
+    assert stats["rows"] == 6 and stats["invalidRows"] == 0 and stats["chunks"] == 3
+    assert pd.read_csv(output)["회사명"].tolist() == ["A", "B"] * 3
+
+
+def test_invalid_rows_exit_1_and_go_to_errors_csv_with_file_row_numbers(tmp_path, capsys):
+    rows = ROWS * 2
+    rows[1] = dict(rows[1], shares=0)
+    rows[3] = dict(rows[3], interest_rate=50)
+    output, errors = tmp_path / "out.csv", tmp_path / "errors.csv"
+    code = main([write_input(tmp_path, rows), str(output), "--chunk-size", "3", "--errors", str(errors),
+                 "--quiet"])
+    assert code == 1
+    stats = json.loads(capsys.readouterr().out)
+    assert stats["rows"] == 2 and stats["invalidRows"] == 2
+    assert pd.read_csv(output)["회사명"].tolist() == ["A", "A"]
+    error_frame = pd.read_csv(errors)
+    assert sorted(set(error_frame["행 번호"])) == [2, 4]
+    assert set(error_frame["컬럼"]) >= {"shares", "interest_rate"}
+
+
+def test_invalid_rows_without_errors_file_are_printed(tmp_path, capsys):
+    rows = [dict(ROWS[0], total_equity=-1), ROWS[1]]
+    assert main([write_input(tmp_path, rows), str(tmp_path / "out.csv"), "--quiet"]) == 1
+    assert "1행 total_equity" in capsys.readouterr().err
+
+
+def test_growth_rate_without_future_years_exits_2(tmp_path):
+    assert main([write_input(tmp_path, ROWS), str(tmp_path / "out.csv"), "--growth-rate", "10"]) == 2
+    assert not (tmp_path / "out.csv").exists()
+
+
+def test_missing_input_file_exits_1(tmp_path):
+    assert main([str(tmp_path / "missing.csv"), str(tmp_path / "out.csv"), "--quiet"]) == 1
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from valuation.core import format_number
+from valuation.formatting import CHUNK_SIZE, format_frame, format_numbers, format_percents
+
+
+def random_values(n, seed=0):
+    rng = np.random.default_rng(seed)
+    magnitude = 10.0 ** rng.uniform(-3, 20, n)
+    return np.where(rng.random(n) < 0.3, -magnitude, magnitude)
+
+
+def test_numbers_match_format_number():
+    values = np.concatenate([random_values(5000), [0.0, -0.0, -0.4, 0.999, 999.9, 1000, -1000.5, 2.0 ** 62,
+                                                  2.0 ** 63, 1e25, -1e25]])
+    assert format_numbers(values).tolist() == [format_number(value) for value in values]
+
+
+def test_integers_and_none_match_format_number():
+    values = [0, 7, -12345, 10 ** 15, np.iinfo(np.int64).max, np.iinfo(np.int64).min]
+    assert format_numbers(np.array(values, dtype=np.int64)).tolist() == [format_number(value) for value in values]
+    assert format_numbers([None, 1234.5]).tolist() == ["0", "1,234"]
+
+
+def test_non_finite_values_use_na_rep():
+    assert format_numbers([np.nan, np.inf, -np.inf, 1.0], na_rep="-").tolist() == ["-", "-", "-", "1"]
+
+
+def test_percents_match_python_formatting():
+    rng = np.random.default_rng(1)
+    values = np.concatenate([rng.uniform(-1000, 1000, 5000), [0.05, 0.15, 0.25, 2.675, -0.05, 1e12, 0.0, -0.0]])
+    for decimals in (0, 1, 2):
+        assert format_percents(values, decimals).tolist() == [f"{value:.{decimals}f}%" for value in values]
+
+
+def test_units_and_suffix():
+    assert format_numbers([123456789012, -50000], unit="억", suffix="원").tolist() == ["1,234억원", "0억원"]
+    assert format_numbers([12345678], unit="만").tolist() == ["1,234만"]
+    with pytest.raises(ValueError):
+        format_numbers([1], unit="조")
+
+
+def test_chunks_and_shape_are_preserved():
+    values = random_values(CHUNK_SIZE * 2 + 7, seed=2).reshape(-1, 1)
+    result = format_numbers(values)
+    assert result.shape == values.shape
+    assert result.ravel().tolist() == [format_number(value) for value in values.ravel()]
+
+
+def test_format_frame_formats_numeric_columns_only():
+    df = pd.DataFrame({"이름": ["가", "나"], "금액": [1234567.8, -5.0], "비율": [12.345, 0.0]})
+    formatted = format_frame(df, formats={"비율": lambda column: format_percents(column, 2)})
+    assert formatted["이름"].tolist() == ["가", "나"]
+    assert formatted["금액"].tolist() == ["1,234,567", "-5"]
+    assert formatted["비율"].tolist() == ["12.35%", "0.00%"]
+    assert df["금액"].dtype == np.float64
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from valuation.batch import calculate_stock_value_batch
+from valuation.core import EVALUATION_METHODS
+from valuation.gradient import GRADIENT_INPUTS, calculate_stock_value_gradient
+
+OUTPUTS = ("finalValue", "totalValue", "ownedValue")
+
+
+def random_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "total_equity": rng.uniform(1e8, 1e10, n),
+        "net_income1": rng.uniform(-1e8, 2e9, n),
+        "net_income2": rng.uniform(-1e8, 2e9, n),
+        "net_income3": rng.uniform(-1e8, 2e9, n),
+        "shares": rng.uniform(1000, 100000, n),
+        "interest_rate": rng.uniform(1, 20, n),
+        "evaluation_method": np.array(EVALUATION_METHODS)[np.arange(n) % 3],
+        "owned_shares": rng.uniform(0, 1000, n),
+    }
+
+
+def batch(inputs):
+    return calculate_stock_value_batch(*(inputs[name] for name in (
+        "total_equity", "net_income1", "net_income2", "net_income3", "shares", "interest_rate",
+        "evaluation_method", "owned_shares")))
+
+
+def test_gradients_match_central_finite_differences():
+    inputs = random_inputs(300)
+    result = calculate_stock_value_gradient(**inputs)
+    checked = 0
+    for name in GRADIENT_INPUTS:
+        step = np.maximum(np.abs(inputs[name]), 1.0) * 1e-6
+        up = batch(dict(inputs, **{name: inputs[name] + step}))
+        down = batch(dict(inputs, **{name: inputs[name] - step}))
+        # 영업권 0 또는 80% 하한 경계를 넘나드는 행은 한쪽 미분만 정의되므로 제외
+        up_flags = calculate_stock_value_gradient(**dict(inputs, **{name: inputs[name] + step}))
+        down_flags = calculate_stock_value_gradient(**dict(inputs, **{name: inputs[name] - step}))
+        smooth = ((up_flags["goodwillClamped"] == down_flags["goodwillClamped"])
+                  & (up_flags["floorBinding"] == down_flags["floorBinding"]))
+        for output in OUTPUTS:
+            numeric = (up[output] - down[output]) / (2 * step)
+            np.testing.assert_allclose(result["gradients"][output][name][smooth], numeric[smooth],
+                                       rtol=1e-5, atol=1e-9 * np.abs(result["value"][output]).max())
+        checked += smooth.sum()
+    assert checked > 0.9 * 300 * len(GRADIENT_INPUTS)
+
+
+def test_both_kinks_are_reported():
+    result = calculate_stock_value_gradient(**random_inputs(300))
+    assert result["goodwillClamped"].any() and (~result["goodwillClamped"]).any()
+    assert result["floorBinding"].any() and (~result["floorBinding"]).any()
+
+
+def test_elasticity_is_scaled_gradient():
+    inputs = random_inputs(50, seed=1)
+    result = calculate_stock_value_gradient(**inputs)
+    final_value = result["value"]["finalValue"]
+    for name in GRADIENT_INPUTS:
+        np.testing.assert_allclose(result["elasticities"][name],
+                                   result["gradients"]["finalValue"][name] * inputs[name] / final_value)
+
+
+def test_net_asset_method_depends_only_on_equity_and_shares():
+    inputs = dict(random_inputs(20, seed=2), evaluation_method=np.full(20, EVALUATION_METHODS[2]))
+    gradients = calculate_stock_value_gradient(**inputs)["gradients"]["finalValue"]
+    for name in ("net_income1", "net_income2", "net_income3", "interest_rate", "owned_shares"):
+        assert np.all(gradients[name] == 0)
+    assert gradients["total_equity"] == pytest.approx(1 / inputs["shares"])
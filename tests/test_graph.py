@@ -0,0 +1,70 @@
+import pytest
+
+from valuation.cache import get_cache
+from valuation.core import calculate_future_stock_value, calculate_stock_value, calculate_tax_details
+from valuation.graph import SHARED_CACHE_SIZE, SHARED_CACHE_TTL, SHARED_NODES, ValuationGraph
+
+INPUTS = dict(total_equity=1002804000, net_income1=386650000, net_income2=163401000, net_income3=75794000,
+              shares=4000, interest_rate=10, evaluation_method="일반법인", owned_shares=2000, share_price=5000,
+              growth_rate=10, future_years=5)
+
+
+@pytest.fixture(autouse=True)
+def empty_shared_caches():
+    # 다른 테스트에서 같은 입력으로 계산한 결과가 공유 캐시에 남아 있으면 재계산 여부를 확인할 수 없음
+    for cache_name, _ in SHARED_NODES.values():
+        get_cache(cache_name, maxsize=SHARED_CACHE_SIZE, ttl=SHARED_CACHE_TTL).clear()
+
+
+def evaluate(graph):
+    for name in ("stockValue", "taxDetails", "futureStockValue", "futureTaxDetails"):
+        graph.get(name)
+
+
+def test_results_match_core_functions():
+    graph = ValuationGraph(**INPUTS)
+    args = [INPUTS[name] for name in ("total_equity", "net_income1", "net_income2", "net_income3", "shares",
+                                      "interest_rate", "evaluation_method", "owned_shares")]
+    stock_value = calculate_stock_value(*args)
+    future = calculate_future_stock_value(stock_value, INPUTS["total_equity"], INPUTS["shares"],
+                                          INPUTS["owned_shares"], INPUTS["interest_rate"],
+                                          INPUTS["evaluation_method"], INPUTS["growth_rate"], INPUTS["future_years"])
+    assert type(graph.get("stockValue")) is dict and type(graph.get("futureStockValue")) is dict
+    assert graph.get("stockValue") == pytest.approx(stock_value)
+    assert graph.get("futureStockValue") == pytest.approx(future)
+    assert graph.get("taxDetails") == pytest.approx(calculate_tax_details(stock_value, 2000, 5000))
+
+
+def test_share_price_change_only_recomputes_taxes():
+    graph = ValuationGraph(**INPUTS)
+    evaluate(graph)
+    invalidated = graph.set_inputs(share_price=6000)
+    assert invalidated == ["futureTaxDetails", "taxDetails"]
+    evaluate(graph)
+    assert sorted(graph.recomputed) == ["futureTaxDetails", "taxDetails"]
+
+
+def test_growth_change_keeps_present_value():
+    graph = ValuationGraph(**INPUTS)
+    evaluate(graph)
+    invalidated = graph.set_inputs(growth_rate=12, future_years=5)
+    assert "stockValue" not in invalidated and "taxDetails" not in invalidated
+    assert {"growthFactor", "futureStockValue", "futureTaxDetails"} <= set(invalidated)
+    evaluate(graph)
+    assert not any(name in graph.recomputed for name in ("stockValue", "netAssetPerShare", "taxDetails"))
+    assert graph.get("futureStockValue")["growthRate"] == 12
+
+
+def test_unchanged_inputs_invalidate_nothing():
+    graph = ValuationGraph(**INPUTS)
+    evaluate(graph)
+    assert graph.set_inputs(**INPUTS) == []
+    evaluate(graph)
+    assert graph.recomputed == []
+
+
+def test_equal_inputs_reuse_the_shared_cache():
+    evaluate(ValuationGraph(**INPUTS))
+    graph = ValuationGraph(**INPUTS)
+    evaluate(graph)
+    assert graph.recomputed == []
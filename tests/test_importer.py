@@ -0,0 +1,78 @@
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from valuation.core import EVALUATION_METHODS
+from valuation.importer import ERROR_COLUMNS, file_format, import_portfolio, validate_portfolio
+from valuation.portfolio import PORTFOLIO_COLUMNS
+
+VALID = {"company_name": "A", "total_equity": 1002804000, "net_income1": 386650000, "net_income2": 163401000,
+         "net_income3": 75169000, "shares": 4000, "owned_shares": 2000, "share_price": 5000, "interest_rate": 10,
+         "evaluation_method": EVALUATION_METHODS[1]}
+
+
+def errors_of(rows):
+    result = validate_portfolio(pd.DataFrame(rows))
+    return result, [tuple(row) for row in result["errors"][["행 번호", "컬럼", "오류"]].itertuples(index=False)]
+
+
+def test_valid_rows_pass_with_typed_columns():
+    result, errors = errors_of([VALID, dict(VALID, company_name="B")])
+    assert errors == [] and list(result["errors"].columns) == ERROR_COLUMNS
+    assert list(result["data"].columns) == PORTFOLIO_COLUMNS
+    assert result["data"]["shares"].dtype == np.int64
+    assert result["rows"] == 2
+
+
+@pytest.mark.parametrize("column, value, message", [
+    ("total_equity", -1, "0 이상이어야 합니다"),
+    ("total_equity", "abc", "숫자가 아닙니다"),
+    ("net_income1", None, "값이 없습니다"),
+    ("shares", 0, "1 이상이어야 합니다"),
+    ("shares", 10.5, "정수여야 합니다"),
+    ("interest_rate", 0.5, "1 이상이어야 합니다"),
+    ("interest_rate", 25, "20 이하여야 합니다"),
+    ("evaluation_method", "기타", f"다음 중 하나여야 합니다: {', '.join(EVALUATION_METHODS)}"),
+    ("owned_shares", 5000, "총 발행주식수보다 클 수 없습니다"),
+])
+def test_invalid_value_is_reported_and_row_dropped(column, value, message):
+    result, errors = errors_of([VALID, dict(VALID, **{column: value}), VALID])
+    assert (2, column, message) in errors
+    assert {row for row, _, _ in errors} == {2}
+    assert len(result["data"]) == 2
+
+
+def test_optional_columns_use_defaults():
+    row = {key: value for key, value in VALID.items() if key not in ("company_name", "share_price")}
+    result, errors = errors_of([dict(row, evaluation_method=None)])
+    assert errors == []
+    data = result["data"].iloc[0]
+    assert data["company_name"] == "" and data["share_price"] == 0.0
+    assert data["evaluation_method"] == EVALUATION_METHODS[0]
+
+
+def test_errors_are_sorted_by_row_then_schema_order():
+    _, errors = errors_of([dict(VALID, interest_rate=50, shares="x"), dict(VALID, total_equity=-5)])
+    assert [(row, column) for row, column, _ in errors][:3] == [(1, "shares"), (1, "interest_rate"),
+                                                                (2, "total_equity")]
+
+
+def test_missing_required_column_raises():
+    with pytest.raises(ValueError, match="shares"):
+        validate_portfolio(pd.DataFrame([{key: value for key, value in VALID.items() if key != "shares"}]))
+
+
+def test_unknown_extension_raises():
+    with pytest.raises(ValueError):
+        file_format("holdings.txt")
+
+
+def test_import_reads_csv_and_caches_by_content():
+    buffer = BytesIO()
+    pd.DataFrame([VALID, dict(VALID, shares=0)]).to_csv(buffer, index=False)
+    first = import_portfolio(buffer.getvalue(), "a.csv")
+    second = import_portfolio(buffer.getvalue(), "b.csv")
+    assert len(first["data"]) == 1 and len(first["errors"]) >= 1
+    assert second["data"] is first["data"]
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from valuation.core import calculate_stock_value
+from valuation.montecarlo import PERCENTILES, iter_monte_carlo, simulate_paths
+
+ARGS = (1002804000, 4000, 1000, 5000, "일반법인", 5)
+DISTRIBUTIONS = dict(
+    growth_rate={"type": "normal", "mean": 10.0, "std": 5.0},
+    interest_rate={"type": "uniform", "low": 8.0, "high": 12.0},
+    income_shock={"type": "normal", "mean": 0.0, "std": 10.0},
+)
+
+
+def run(n_paths=20000, chunk_size=2000, seed=7):
+    stock_value = calculate_stock_value(1002804000, 386650000, 163401000, 75169000, 4000, 10, "일반법인", 1000)
+    return list(iter_monte_carlo(stock_value, *ARGS, **DISTRIBUTIONS, n_paths=n_paths, chunk_size=chunk_size,
+                                 seed=seed)), stock_value
+
+
+def test_final_summary_is_exact_and_has_no_samples():
+    summaries, stock_value = run()
+    final = summaries[-1]
+    assert "samples" not in final
+    assert [summary["paths"] for summary in summaries] == list(range(2000, 20001, 2000))
+
+    # 같은 난수 순서로 표본을 다시 만들어 정확한 백분위수와 비교
+    samples = np.concatenate([
+        simulate_paths(np.random.default_rng(child), stock_value, *ARGS[:5], ARGS[5], 2000,
+                       DISTRIBUTIONS["growth_rate"], DISTRIBUTIONS["interest_rate"],
+                       DISTRIBUTIONS["income_shock"])["finalValue"]
+        for child in np.random.SeedSequence(7).spawn(10)
+    ])
+    assert final["mean"]["finalValue"] == pytest.approx(samples.mean(), rel=1e-12)
+    expected = np.percentile(samples, PERCENTILES)
+    assert [final["percentiles"]["finalValue"][p] for p in PERCENTILES] == pytest.approx(expected, rel=1e-12)
+    counts, edges = final["histogram"]["counts"], final["histogram"]["edges"]
+    assert counts.sum() == 20000
+    assert edges[0] == samples.min() and edges[-1] == samples.max()
+
+
+def test_interim_percentiles_approximate_the_exact_ones():
+    summaries, _ = run()
+    interim, final = summaries[-2], summaries[-1]
+    for p in PERCENTILES:
+        assert interim["percentiles"]["finalValue"][p] == pytest.approx(final["percentiles"]["finalValue"][p],
+                                                                        rel=0.02)
+
+
+def test_same_seed_gives_same_result():
+    first, _ = run(seed=3)
+    second, _ = run(seed=3)
+    assert first[-1]["percentiles"] == second[-1]["percentiles"]
@@ -0,0 +1,50 @@
+from valuation.core import calculate_stock_value
+from valuation.optimizer import GIFT_AGGREGATION_YEARS, flat_transfer_taxes, optimize_gift_schedule
+
+COMPANY = dict(total_equity=1002804000, shares=4000, interest_rate=10, evaluation_method="일반법인")
+
+
+def optimize(owned_shares, horizon, **kwargs):
+    stock_value = calculate_stock_value(COMPANY["total_equity"], 386650000, 163401000, 75169000, COMPANY["shares"],
+                                        COMPANY["interest_rate"], COMPANY["evaluation_method"], owned_shares)
+    return optimize_gift_schedule(stock_value, COMPANY["total_equity"], COMPANY["shares"], owned_shares,
+                                  COMPANY["interest_rate"], COMPANY["evaluation_method"], 5000, 10, horizon, **kwargs)
+
+
+def test_yearly_cap_makes_single_year_baselines_infeasible():
+    result = optimize(2000, 5, max_shares_per_year=500)
+    assert result["giftNowTax"] is None
+    assert result["giftAtHorizonTax"] is None
+    assert all(item["shares"] <= 500 for item in result["plan"])
+    assert len(result["plan"]) >= 4
+
+
+def test_without_cap_baselines_are_finite():
+    result = optimize(2000, 5)
+    assert result["giftNowTax"] > 0
+    assert result["giftAtHorizonTax"] > 0
+
+
+def test_cap_too_small_for_horizon_returns_none():
+    assert optimize(2000, 2, max_shares_per_year=500) is None
+
+
+def test_plan_gifts_every_share_when_lots_do_not_divide_evenly():
+    result = optimize(2001, 5, max_shares_per_year=500)
+    assert sum(item["shares"] for item in result["plan"]) == 2001
+    assert all(item["shares"] <= 500 for item in result["plan"])
+
+
+def test_progressive_tax_spreads_gifts_over_aggregation_periods():
+    result = optimize(2001, 20)
+    years = [item["year"] for item in result["plan"]]
+    assert sum(item["shares"] for item in result["plan"]) == 2001
+    assert len(years) > 1
+    assert all(b - a >= GIFT_AGGREGATION_YEARS for a, b in zip(years, years[1:]))
+    assert result["totalPresentValueTax"] < result["giftNowTax"]
+
+
+def test_flat_tax_gifts_everything_in_one_year():
+    result = optimize(2001, 20, tax_function=flat_transfer_taxes)
+    assert [(item["year"], item["shares"]) for item in result["plan"]] == [(0, 2001)]
+    assert result["totalPresentValueTax"] == result["giftNowTax"]
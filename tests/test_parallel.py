@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from valuation.batch import encode_evaluation_methods
+from valuation.core import EVALUATION_METHODS, calculate_stock_value
+from valuation.parallel import parallel_future_stock_value_grid, shared_column_map, shutdown
+from valuation.portfolio import NUMERIC_COLUMNS, value_column_names, value_columns, value_portfolio
+from valuation.simulation import calculate_future_stock_value_grid
+
+
+@pytest.fixture(scope="module", autouse=True)
+def process_pool():
+    yield
+    shutdown()
+
+
+def portfolio(n, seed=0):
+    rng = np.random.default_rng(seed)
+    shares = rng.integers(1000, 100000, n)
+    return pd.DataFrame({
+        "company_name": [f"회사{i}" for i in range(n)],
+        "total_equity": rng.uniform(1e8, 1e10, n),
+        "net_income1": rng.uniform(-1e8, 1e9, n),
+        "net_income2": rng.uniform(-1e8, 1e9, n),
+        "net_income3": rng.uniform(-1e8, 1e9, n),
+        "shares": shares,
+        "owned_shares": (shares * rng.random(n)).astype(np.int64),
+        "share_price": np.full(n, 5000.0),
+        "interest_rate": rng.uniform(1, 20, n),
+        "evaluation_method": np.array(EVALUATION_METHODS)[np.arange(n) % 3],
+    })
+
+
+def test_shared_memory_shards_match_single_process():
+    df = portfolio(1000)
+    columns = {col: df[col].to_numpy(dtype=np.float64) for col in NUMERIC_COLUMNS}
+    columns["methodCode"] = encode_evaluation_methods(df["evaluation_method"].to_numpy())
+    fields = value_column_names(10, 5)
+    serial = shared_column_map(value_columns, columns, fields, workers=1, growth_rate=10, future_years=5)
+    sharded = shared_column_map(value_columns, columns, fields, workers=3, min_shard_size=100,
+                                growth_rate=10, future_years=5)
+    assert list(sharded) == fields
+    for field in fields:
+        np.testing.assert_array_equal(sharded[field], serial[field])
+
+
+def test_value_portfolio_with_workers_matches_serial():
+    df = portfolio(200)
+    pd.testing.assert_frame_equal(value_portfolio(df, workers=2), value_portfolio(df))
+
+
+def test_parallel_grid_matches_grid():
+    stock_value = calculate_stock_value(1002804000, 386650000, 163401000, 75169000, 4000, 10, "일반법인", 2000)
+    args = (stock_value, 1002804000, 4000, 2000, 10, "일반법인", np.arange(0, 30, 0.5), np.arange(1, 11))
+    expected = calculate_future_stock_value_grid(*args)
+    result = parallel_future_stock_value_grid(*args, workers=2, min_shard_cells=100)
+    for field in ("finalValue", "ownedValue", "futureTotalEquity"):
+        np.testing.assert_array_equal(result[field], expected[field])
@@ -0,0 +1,22 @@
+import os
+import shutil
+
+import pytest
+
+from valuation.params import DEFAULT_PATH, ParameterStore
+
+
+def test_missing_file_keeps_last_parameters(tmp_path):
+    path = tmp_path / "parameters.json"
+    shutil.copy(DEFAULT_PATH, path)
+    store = ParameterStore(str(path), check_interval=0)
+    key = store.key()
+    os.remove(path)
+    with pytest.warns(UserWarning):
+        assert store.key() == key
+        assert store.get()["valuation"]["annuityFactor"] > 0
+
+
+def test_missing_file_on_first_load_raises(tmp_path):
+    with pytest.raises(OSError):
+        ParameterStore(str(tmp_path / "missing.json")).versions()
@@ -0,0 +1,15 @@
+import numpy as np
+
+from valuation.simulation import growth_rate_range
+
+
+def test_growth_rate_range_includes_stop():
+    assert growth_rate_range(5, 25, 5).tolist() == [5, 10, 15, 20, 25]
+    assert len(growth_rate_range(0.1, 30, 0.1)) == 300
+
+
+def test_growth_rate_range_uneven_step_stays_within_stop():
+    assert growth_rate_range(5, 25, 3).tolist() == [5, 8, 11, 14, 17, 20, 23]
+    rates = growth_rate_range(0, 1, 0.35)
+    assert np.allclose(rates, [0, 0.35, 0.7])
+    assert rates.max() <= 1
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from valuation.tax import calculate_progressive_tax_details_batch, get_tax_table, progressive_tax
+
+# 상속세 및 증여세법 세율표의 (과세표준 상한, 세율, 누진공제액)
+GIFT_TAX_TABLE = [(1e8, 0.1, 0), (5e8, 0.2, 1e7), (1e9, 0.3, 6e7), (3e9, 0.4, 1.6e8), (np.inf, 0.5, 4.6e8)]
+# 2023년 귀속 법인세율표
+CORPORATE_TAX_TABLE = [(2e8, 0.09, 0), (2e10, 0.19, 2e7), (3e11, 0.21, 4.2e8), (np.inf, 0.24, 9.42e9)]
+
+
+def table_tax(base, table):
+    for upper, rate, deduction in table:
+        if base <= upper:
+            return base * rate - deduction
+
+
+@pytest.mark.parametrize("base", [0, 1, 5e7, 1e8, 1e8 + 1, 3e8, 5e8, 7.5e8, 1e9, 2e9, 3e9, 3e9 + 1, 1e10])
+def test_gift_tax_matches_statutory_deductions(base):
+    assert progressive_tax(base, get_tax_table(2023)["inheritance"]) == pytest.approx(
+        table_tax(base, GIFT_TAX_TABLE), abs=1e-6)
+
+
+@pytest.mark.parametrize("base", [1e8, 2e8, 5e9, 2e10, 1e11, 3e11, 5e11])
+def test_corporate_tax_matches_statutory_deductions(base):
+    assert progressive_tax(base, get_tax_table(2023)["corporate"]) == pytest.approx(
+        table_tax(base, CORPORATE_TAX_TABLE), abs=1e-3)
+
+
+def test_negative_base_is_taxed_as_zero():
+    np.testing.assert_array_equal(progressive_tax([-1e9, -1, 0], get_tax_table(2023)["inheritance"]), [0, 0, 0])
+
+
+def test_gift_deduction_and_prior_gifts_are_aggregated():
+    # 한 번에 8억 증여 = 3억 증여 후 같은 사람에게 5억 추가 증여 (10년 합산)
+    at_once = calculate_progressive_tax_details_batch(8e8, 0, 0, 2023)
+    first = calculate_progressive_tax_details_batch(3e8, 0, 0, 2023)
+    second = calculate_progressive_tax_details_batch(5e8, 0, 0, 2023, prior_gifts=3e8)
+    assert at_once["giftTaxBase"] == 8e8 - 5e7
+    assert at_once["inheritanceTax"] == pytest.approx(table_tax(7.5e8, GIFT_TAX_TABLE))
+    assert first["inheritanceTax"] + second["inheritanceTax"] == pytest.approx(at_once["inheritanceTax"])
+
+
+def test_gift_below_deduction_is_not_taxed():
+    assert calculate_progressive_tax_details_batch(4e7, 0, 0, 2023)["inheritanceTax"] == 0
+
+
+def test_transfer_tax_includes_local_income_tax():
+    details = calculate_progressive_tax_details_batch(np.array([2e8, 5e8]), np.array([100, 100]), 1e6, 2023)
+    np.testing.assert_allclose(details["transferProfit"], [1e8, 4e8])
+    np.testing.assert_allclose(details["transferTax"], [1e8 * 0.2 * 1.1, (3e8 * 0.2 + 1e8 * 0.25) * 1.1])
+
+
+def test_year_selects_table_version():
+    assert progressive_tax(1e8, get_tax_table(2022)["corporate"]) == pytest.approx(1e7)
+    assert progressive_tax(1e8, get_tax_table(2023)["corporate"]) == pytest.approx(9e6)
+    details = calculate_progressive_tax_details_batch(1e9, 0, 0, 2030)
+    assert details["taxYear"] == 2030
+    assert details["tableVersion"] == 2023
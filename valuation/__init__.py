@@ -0,0 +1,23 @@
+# 비상장주식 가치평가 계산 패키지
+#
+# 핵심 계산 함수는 순수 파이썬(valuation.core)으로 구현되어 있어 Streamlit, Plotly, pandas 를 불러오지 않습니다.
+# 배열 연산이 필요한 기능(batch, simulation, montecarlo, portfolio)은 하위 모듈을 직접 import 하세요.
+from valuation.core import (
+    EVALUATION_METHODS,
+    calculate_future_stock_value,
+    calculate_stock_value,
+    calculate_tax_details,
+    format_number,
+    method_text,
+    method_texts,
+)
+
+__all__ = [
+    "EVALUATION_METHODS",
+    "calculate_future_stock_value",
+    "calculate_stock_value",
+    "calculate_tax_details",
+    "format_number",
+    "method_text",
+    "method_texts",
+]
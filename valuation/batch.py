@@ -0,0 +1,229 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+from valuation.core import EVALUATION_METHODS, method_texts
+from valuation.params import get_parameters
+from valuation.results import FutureStockValue, StockValue
+from valuation.tax import calculate_progressive_tax_details_batch
+
+# 평가 방식 코드 (배열 연산용, EVALUATION_METHODS 순서와 동일)
+METHOD_GENERAL = 0
+METHOD_REAL_ESTATE = 1
+METHOD_NET_ASSET = 2
+
+
+def encode_evaluation_methods(evaluation_method):
+    """평가 방식(문자열 또는 코드)을 정수 코드 배열로 변환합니다.
+
+    알 수 없는 문자열은 calculate_stock_value 와 동일하게 일반법인으로 처리합니다.
+    """
+    methods = np.asarray(evaluation_method)
+    if methods.dtype.kind in "iu":
+        return methods.astype(np.int8)
+    codes = np.full(methods.shape, METHOD_GENERAL, dtype=np.int8)
+    codes[methods == EVALUATION_METHODS[METHOD_REAL_ESTATE]] = METHOD_REAL_ESTATE
+    codes[methods == EVALUATION_METHODS[METHOD_NET_ASSET]] = METHOD_NET_ASSET
+    return codes
+
+
+class ResultBatch(Mapping):
+    """배치 계산 결과를 필드별 배열(struct-of-arrays)로 담는 읽기 전용 Mapping 입니다.
+
+    batch["finalValue"] 처럼 기존 dict 결과와 같이 필드 배열을 꺼낼 수 있고, row(i) 는 i 번째 행을
+    calculate_stock_value / calculate_future_stock_value 결과 dict 와 같은 필드의 레코드로 반환합니다.
+    평가방식은 문자열 대신 methodCode(int8) 로 저장하며 methodText 는 행을 꺼낼 때 만듭니다.
+    """
+
+    __slots__ = ("_columns", "record_type", "shape")
+
+    def __init__(self, columns, record_type=StockValue):
+        self._columns = columns
+        self.record_type = record_type
+        self.shape = np.shape(columns["finalValue"])
+
+    def __getitem__(self, key):
+        return self._columns[key]
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self):
+        return len(self._columns)
+
+    @property
+    def rows(self):
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    @property
+    def nbytes(self):
+        return sum(np.asarray(column).nbytes for column in self._columns.values())
+
+    def row(self, i):
+        """i 번째(다차원이면 평탄화한 순서) 결과를 레코드로 반환합니다."""
+        values = []
+        for field in self.record_type.FIELDS:
+            if field == "methodText":
+                values.append(method_texts()[int(self._flat("methodCode", i))])
+            elif field == "increasePercentage":
+                # calculate_stock_value 의 round() 결과와 같은 int
+                values.append(int(self._flat(field, i)))
+            else:
+                values.append(self._flat(field, i).item())
+        return self.record_type(*values)
+
+    def _flat(self, field, i):
+        return np.broadcast_to(self._columns[field], self.shape).flat[i]
+
+    def to_frame(self, columns=None):
+        """필드 배열을 복사하지 않고 DataFrame 으로 감쌉니다 (1 차원 결과만, 수정하면 원본 배열도 바뀜)."""
+        import pandas as pd
+
+        columns = list(self._columns) if columns is None else columns
+        return pd.DataFrame({field: np.broadcast_to(self._columns[field], self.shape) for field in columns},
+                            copy=False)
+
+
+def _value_kernel(total_equity, weighted_income, shares, owned_shares, interest_rate, method_code):
+    params = get_parameters()["valuation"]
+
+    # 1. 순자산가치 계산
+    net_asset_per_share = total_equity / shares
+
+    # 2. 영업권 계산
+    weighted_income_per_share = weighted_income / shares
+    weighted_income_per_share_50 = weighted_income_per_share * params["goodwillIncomeShare"]
+    equity_return = (total_equity * (interest_rate / 100)) / shares
+    annuity_factor = params["annuityFactor"]
+    goodwill = np.maximum(0, (weighted_income_per_share_50 - equity_return) * annuity_factor)
+
+    # 3. 순자산가치 + 영업권
+    asset_value_with_goodwill = net_asset_per_share + goodwill
+
+    # 4. 손익가치 계산
+    income_value = weighted_income_per_share * (100 / interest_rate)
+
+    # 5. 최종가치 계산 (세 가지 평가 방식을 한 번에 계산 후 선택)
+    net_asset_80_percent = net_asset_per_share * params["netAssetFloor"]
+    general, real_estate = params["general"], params["realEstate"]
+    general_value = (income_value * general["income"]) + (asset_value_with_goodwill * general["asset"])
+    real_estate_value = (asset_value_with_goodwill * real_estate["asset"]) + (income_value * real_estate["income"])
+    stock_value = np.where(method_code == METHOD_REAL_ESTATE, real_estate_value, general_value)
+    # max(stock_value, net_asset_80_percent) 와 동일하게 같은 값이면 stock_value 를 사용
+    floored_value = np.where(net_asset_80_percent > stock_value, net_asset_80_percent, stock_value)
+    final_value = np.where(method_code == METHOD_NET_ASSET, net_asset_per_share, floored_value)
+
+    # 총 가치
+    total_value = final_value * shares
+    owned_value = final_value * owned_shares
+
+    return {
+        "netAssetPerShare": net_asset_per_share,
+        "assetValueWithGoodwill": asset_value_with_goodwill,
+        "incomeValue": income_value,
+        "finalValue": final_value,
+        "totalValue": total_value,
+        "ownedValue": owned_value,
+    }
+
+
+def calculate_stock_value_batch(total_equity, net_income1, net_income2, net_income3, shares,
+                                interest_rate, evaluation_method, owned_shares):
+    """calculate_stock_value 의 배열 버전입니다.
+
+    각 인자는 회사별 값을 담은 배열(또는 스칼라)이며, 결과 필드별 배열을 담은 ResultBatch 를 반환합니다.
+    evaluation_method 는 평가 방식 문자열 배열 또는 METHOD_* 정수 코드 배열입니다.
+    """
+    total_equity = np.asarray(total_equity, dtype=np.float64)
+    net_income1 = np.asarray(net_income1, dtype=np.float64)
+    net_income2 = np.asarray(net_income2, dtype=np.float64)
+    net_income3 = np.asarray(net_income3, dtype=np.float64)
+    shares = np.asarray(shares, dtype=np.float64)
+    owned_shares = np.asarray(owned_shares, dtype=np.float64)
+    interest_rate = np.asarray(interest_rate, dtype=np.float64)
+    method_code = encode_evaluation_methods(evaluation_method)
+
+    w1, w2, w3 = get_parameters()["valuation"]["incomeWeights"]
+    weighted_income = (net_income1 * w1 + net_income2 * w2 + net_income3 * w3) / (w1 + w2 + w3)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = _value_kernel(total_equity, weighted_income, shares, owned_shares,
+                               interest_rate, method_code)
+        # 증가율 계산 (round 와 동일한 짝수 반올림, 자본총계가 0 인 행은 calculate_stock_value 와 같이 0)
+        increase_percentage = np.where(result["netAssetPerShare"] != 0,
+                                       np.round((result["finalValue"] / result["netAssetPerShare"]) * 100), 0.0)
+
+    result["methodCode"] = np.broadcast_to(method_code, result["finalValue"].shape)
+    result["increasePercentage"] = increase_percentage
+    result["weightedIncome"] = weighted_income
+    return ResultBatch(result)
+
+
+def calculate_tax_details_batch(owned_value, owned_shares, share_price, tax_year=None, prior_gifts=0):
+    """calculate_tax_details 의 배열 버전입니다. 보유주식 가치 배열을 받아 세금 필드별 배열을 반환합니다.
+
+    tax_year 를 지정하면 해당 연도 누진세율표로 계산합니다 (valuation.tax).
+    """
+    if tax_year is not None:
+        return calculate_progressive_tax_details_batch(owned_value, owned_shares, share_price, tax_year, prior_gifts)
+
+    owned_value = np.asarray(owned_value, dtype=np.float64)
+    owned_shares = np.asarray(owned_shares, dtype=np.float64)
+    share_price = np.asarray(share_price, dtype=np.float64)
+    rates = get_parameters()["flatTax"]
+
+    # 상속증여세 (단일세율)
+    inheritance_tax = owned_value * rates["inheritanceRate"]
+
+    # 양도소득세 (단일세율)
+    acquisition_value = owned_shares * share_price
+    transfer_profit = owned_value - acquisition_value
+    transfer_tax = np.where(transfer_profit > 0, transfer_profit * rates["transferRate"], 0.0)
+
+    # 청산소득세 계산
+    corporate_tax = owned_value * rates["corporateRate"]
+    after_tax_value = owned_value - corporate_tax
+    liquidation_tax = after_tax_value * rates["dividendRate"]
+
+    return {
+        "inheritanceTax": inheritance_tax,
+        "transferTax": transfer_tax,
+        "corporateTax": corporate_tax,
+        "liquidationTax": liquidation_tax,
+        "acquisitionValue": acquisition_value,
+        "transferProfit": transfer_profit,
+        "afterTaxValue": after_tax_value,
+        "totalTax": corporate_tax + liquidation_tax
+    }
+
+
+def calculate_future_stock_value_batch(stock_value, total_equity, shares, owned_shares,
+                                       interest_rate, evaluation_method, growth_rate, future_years):
+    """calculate_future_stock_value 의 배열 버전입니다.
+
+    stock_value 는 calculate_stock_value_batch 의 결과이며, 나머지 인자는 회사별 배열(또는 스칼라)입니다.
+    """
+    total_equity = np.asarray(total_equity, dtype=np.float64)
+    shares = np.asarray(shares, dtype=np.float64)
+    owned_shares = np.asarray(owned_shares, dtype=np.float64)
+    interest_rate = np.asarray(interest_rate, dtype=np.float64)
+    growth_rate = np.asarray(growth_rate, dtype=np.float64)
+    future_years = np.asarray(future_years, dtype=np.float64)
+
+    # 복리 성장률 적용
+    growth_factor = (1 + (growth_rate / 100)) ** future_years
+
+    # 미래 자산 및 수익 계산
+    future_total_equity = total_equity * growth_factor
+    future_weighted_income = stock_value["weightedIncome"] * growth_factor
+
+    method_code = encode_evaluation_methods(evaluation_method)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = _value_kernel(future_total_equity, future_weighted_income, shares, owned_shares,
+                               interest_rate, method_code)
+    result["methodCode"] = np.broadcast_to(method_code, result["finalValue"].shape)
+    result["futureTotalEquity"] = future_total_equity
+    result["futureWeightedIncome"] = future_weighted_income
+    result["growthRate"] = growth_rate
+    result["futureYears"] = future_years
+    return ResultBatch(result, FutureStockValue)
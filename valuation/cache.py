@@ -0,0 +1,132 @@
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+
+from valuation.params import parameter_key
+
+_MISSING = object()
+# 이 크기(바이트)를 넘는 배열은 캐시 키에 내용 대신 blake2b 해시를 사용
+DIGEST_BYTES = 4096
+
+
+class LRUCache:
+    """스레드 안전한 LRU 캐시 (선택적으로 TTL 만료 지원)."""
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, stored_at = entry
+                if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                # 만료된 항목 제거
+                del self._data[key]
+                self.evictions += 1
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+
+# 프로세스 전체에서 공유하는 캐시 (Streamlit 세션 간 공유)
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name, maxsize=1024, ttl=None):
+    """이름으로 공유 캐시를 가져옵니다. 없으면 새로 만듭니다."""
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = LRUCache(maxsize=maxsize, ttl=ttl)
+        return _caches[name]
+
+
+def cache_stats():
+    """모든 공유 캐시의 적중/실패 통계를 반환합니다."""
+    with _caches_lock:
+        caches = dict(_caches)
+    return {name: cache.stats() for name, cache in caches.items()}
+
+
+def canonical_key(value):
+    """입력값을 해시 가능한 정규화된 키로 변환합니다.
+
+    숫자는 파이썬/NumPy 타입과 정수/실수 표기에 관계없이 같은 값이면 같은 키가 됩니다 (10 == 10.0).
+    """
+    if isinstance(value, dict):
+        return ("dict",) + tuple(sorted((key, canonical_key(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return ("seq",) + tuple(canonical_key(item) for item in value)
+    if isinstance(value, np.ndarray):
+        if value.nbytes <= DIGEST_BYTES:
+            return ("ndarray", value.dtype.str, value.shape, value.tobytes())
+        # 큰 배열은 내용 대신 해시를 키로 사용 (캐시 항목마다 배열 사본을 보관하지 않음)
+        digest = hashlib.blake2b(np.ascontiguousarray(value).data, digest_size=32).digest()
+        return ("ndarray", value.dtype.str, value.shape, digest)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, Mapping):
+        # 결과 레코드(StockValue 등)와 ResultBatch 는 같은 값의 dict 와 같은 키
+        return canonical_key(dict(value))
+    return value
+
+
+def memoize(name, maxsize=1024, ttl=None):
+    """함수 결과를 이름이 같은 공유 캐시에 저장하는 데코레이터입니다.
+
+    Streamlit 은 매 실행마다 스크립트의 함수를 새로 정의하므로, 캐시는 함수 객체가 아니라 이름으로 찾습니다.
+    dict 결과는 호출자가 수정해도 캐시가 바뀌지 않도록 복사본을 반환합니다.
+    키에는 파라미터 버전과 파일 내용 해시가 포함되므로 파라미터가 바뀌면 이전 결과를 쓰지 않습니다.
+    """
+    def decorator(func):
+        cache = get_cache(name, maxsize=maxsize, ttl=ttl)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = canonical_key((args, kwargs, parameter_key()))
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                cache.set(key, value)
+            return dict(value) if isinstance(value, dict) else value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -0,0 +1,234 @@
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+from valuation.formatting import format_frame
+from valuation.importer import validate_portfolio
+from valuation.params import parameter_key
+from valuation.portfolio import value_portfolio
+
+INPUT_FORMATS = ("csv", "jsonl")
+OUTPUT_FORMATS = ("csv", "jsonl", "parquet")
+# --errors 파일을 지정하지 않았을 때 표준 오류로 출력하는 오류 수
+MAX_PRINTED_ERRORS = 20
+
+
+def _detect_format(path, formats):
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext == "ndjson":
+        ext = "jsonl"
+    if ext not in formats:
+        raise ValueError(f"파일 형식을 알 수 없습니다: {path} (지원 형식: {', '.join(formats)})")
+    return ext
+
+
+def iter_input_chunks(path, fmt, chunk_size):
+    """입력 파일을 chunk_size 행씩 DataFrame 으로 읽습니다."""
+    if fmt == "csv":
+        reader = pd.read_csv(path, chunksize=chunk_size)
+    else:
+        reader = pd.read_json(path, lines=True, chunksize=chunk_size)
+    with reader:
+        yield from reader
+
+
+def check_output_engine(fmt):
+    """출력 형식에 필요한 라이브러리가 없으면 처리를 시작하기 전에 ValueError 를 냅니다."""
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ValueError("Parquet 파일로 저장하려면 pyarrow 가 필요합니다.") from e
+
+
+def iter_valid_chunks(chunks, on_errors):
+    """각 청크를 validate_portfolio 로 검증하여 올바른 행만 넘기고, 오류는 on_errors 로 전달합니다.
+
+    오류 DataFrame 의 행 번호는 청크가 아닌 입력 파일 전체 기준입니다 (헤더 제외 1부터).
+    """
+    offset = 0
+    for chunk in chunks:
+        checked = validate_portfolio(chunk)
+        if len(checked["errors"]):
+            errors = checked["errors"]
+            errors["행 번호"] += offset
+            on_errors(errors, checked["rows"] - len(checked["data"]))
+        offset += checked["rows"]
+        yield checked["data"]
+
+
+class ChunkWriter:
+    """평가 결과를 청크 단위로 이어서 기록합니다."""
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self._file = None
+        self._parquet_writer = None
+
+    def write(self, df):
+        if self.fmt == "parquet":
+            # pyarrow 는 Parquet 출력에만 필요하므로 이때 불러옴
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+            return
+
+        if self._file is None:
+            self._file = open(self.path, "w", encoding="utf-8", newline="")
+            header = True
+        else:
+            header = False
+        if self.fmt == "csv":
+            df.to_csv(self._file, index=False, header=header)
+        else:
+            df.to_json(self._file, orient="records", lines=True, force_ascii=False)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run(input_path, output_path, input_format=None, output_format=None, chunk_size=100000, workers=1,
+        growth_rate=None, future_years=None, parameter_version=None, formatted=False, progress=None,
+        errors_path=None, on_errors=None):
+    """입력 파일 전체를 평가하여 출력 파일에 기록하고 처리 통계를 반환합니다.
+
+    parameter_version 을 지정하지 않으면 시작 시점의 최신 파라미터 버전으로 고정하여 모든 청크를 계산합니다.
+    formatted 이면 숫자 컬럼을 화면과 같은 천 단위 쉼표 문자열로 바꿔 기록합니다.
+    입력 행은 웹 화면의 업로드와 같은 규칙(validate_portfolio)으로 검증하며, 잘못된 행은 결과에서 제외하고
+    errors_path(CSV)에 기록하거나 on_errors(오류 DataFrame) 로 전달합니다. 제외한 행 수는 통계의 invalidRows 입니다.
+    """
+    input_format = input_format or _detect_format(input_path, INPUT_FORMATS)
+    output_format = output_format or _detect_format(output_path, OUTPUT_FORMATS)
+    check_output_engine(output_format)
+    parameter_version, parameter_digest = parameter_key(parameter_version)
+    # 각 청크의 숫자 컬럼을 공유 메모리로 워커에 나누어 계산 (청크 DataFrame 은 프로세스 간에 전달하지 않음)
+    func = functools.partial(value_portfolio, growth_rate=growth_rate, future_years=future_years,
+                             parameter_version=parameter_version, workers=workers)
+
+    rows = 0
+    chunks = 0
+    invalid_rows = 0
+    started = time.perf_counter()
+    with ChunkWriter(output_path, output_format) as writer, \
+            ChunkWriter(errors_path, "csv") as error_writer:
+
+        def record_errors(errors, bad_rows):
+            nonlocal invalid_rows
+            invalid_rows += bad_rows
+            if errors_path:
+                error_writer.write(errors)
+            if on_errors:
+                on_errors(errors)
+
+        chunks_in = iter_valid_chunks(iter_input_chunks(input_path, input_format, chunk_size), record_errors)
+        for result in map(func, chunks_in):
+            writer.write(format_frame(result) if formatted else result)
+            rows += len(result)
+            chunks += 1
+            if progress:
+                elapsed = time.perf_counter() - started
+                progress(rows, chunks, elapsed)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "invalidRows": invalid_rows,
+        "chunks": chunks,
+        "seconds": round(elapsed, 3),
+        "rowsPerSecond": round(rows / elapsed, 1) if elapsed > 0 else None,
+        "workers": workers,
+        "parameterVersion": parameter_version,
+        "parameterDigest": parameter_digest,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m valuation",
+        description="비상장주식 일괄 평가: CSV/JSONL 입력 파일의 모든 회사를 평가하여 결과 파일로 저장합니다.",
+    )
+    parser.add_argument("input", help="입력 파일 (.csv, .jsonl)")
+    parser.add_argument("output", help="출력 파일 (.csv, .jsonl, .parquet)")
+    parser.add_argument("--input-format", choices=INPUT_FORMATS, help="입력 형식 (기본값: 확장자로 판단)")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS, help="출력 형식 (기본값: 확장자로 판단)")
+    parser.add_argument("--chunk-size", type=int, default=100000, help="한 번에 읽어 평가할 행 수 (기본값: 100000)")
+    parser.add_argument("--workers", type=int, default=1, help="병렬 처리 프로세스 수 (기본값: 1)")
+    parser.add_argument("--growth-rate", type=float, help="미래 가치 계산용 연간 성장률 (%%)")
+    parser.add_argument("--future-years", type=int, help="미래 가치 계산용 예측 기간 (년)")
+    parser.add_argument("--parameter-version", type=int,
+                        help="계산에 사용할 파라미터 버전(연도). 지정하지 않으면 최신 버전")
+    parser.add_argument("--formatted", action="store_true",
+                        help="숫자를 천 단위 쉼표 문자열(화면 표시 형식)로 기록")
+    parser.add_argument("--errors", help="잘못된 입력 행을 기록할 CSV 파일 (기본값: 표준 오류로 일부 출력)")
+    parser.add_argument("--quiet", action="store_true", help="진행 상황을 출력하지 않음")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if (args.growth_rate is None) != (args.future_years is None):
+        print("--growth-rate 와 --future-years 는 함께 지정해야 합니다.", file=sys.stderr)
+        return 2
+    try:
+        check_output_engine(args.output_format or _detect_format(args.output, OUTPUT_FORMATS))
+    except ValueError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+
+    printed_errors = []
+
+    def collect_errors(errors):
+        # --errors 파일이 없으면 처음 몇 건만 모아 두었다가 끝난 뒤 출력
+        printed_errors.extend(errors.head(MAX_PRINTED_ERRORS - len(printed_errors)).itertuples(index=False))
+
+    def progress(rows, chunks, elapsed):
+        rate = rows / elapsed if elapsed > 0 else 0
+        print(f"\r{rows:,}행 처리 ({chunks}개 청크, {rate:,.0f}행/초)", end="", file=sys.stderr, flush=True)
+
+    try:
+        stats = run(
+            args.input, args.output,
+            input_format=args.input_format,
+            output_format=args.output_format,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            growth_rate=args.growth_rate,
+            future_years=args.future_years,
+            parameter_version=args.parameter_version,
+            formatted=args.formatted,
+            progress=None if args.quiet else progress,
+            errors_path=args.errors,
+            on_errors=None if args.errors else collect_errors,
+        )
+    except (OSError, ValueError) as e:
+        print(f"\n오류: {e}", file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        print(file=sys.stderr)
+    for row, column, value, message in printed_errors:
+        print(f"{row}행 {column}: {message} (값: {value})", file=sys.stderr)
+    if stats["invalidRows"]:
+        where = f"{args.errors} 참고" if args.errors else "--errors 로 전체 목록 저장"
+        print(f"잘못된 입력 {stats['invalidRows']:,}행을 제외했습니다 ({where}).", file=sys.stderr)
+    print(json.dumps(stats, ensure_ascii=False))
+    return 1 if stats["invalidRows"] else 0
@@ -0,0 +1,190 @@
+# 비상장주식 가치평가 및 세금 계산 (Streamlit 등 UI 라이브러리에 의존하지 않는 순수 파이썬 모듈)
+from valuation.params import get_parameters
+
+# 평가 방식
+EVALUATION_METHODS = ("일반법인", "부동산 과다법인", "순자산가치만 평가")
+
+# 평가 방식별 계산식 설명 (EVALUATION_METHODS 순서, 가중치는 파라미터 파일 값)
+def method_texts(version=None):
+    params = get_parameters(version)["valuation"]
+    general, real_estate = params["general"], params["realEstate"]
+    return (
+        f'일반법인: (수익가치×{general["income"]:g} + 자산가치×{general["asset"]:g})',
+        f'부동산 과다법인: (자산가치×{real_estate["asset"]:g} + 수익가치×{real_estate["income"]:g})',
+        '순자산가치만 평가',
+    )
+
+# 알 수 없는 평가 방식은 계산과 같이 일반법인으로 처리
+def method_text(evaluation_method, version=None):
+    texts = method_texts(version)
+    if evaluation_method in EVALUATION_METHODS:
+        return texts[EVALUATION_METHODS.index(evaluation_method)]
+    return texts[0]
+
+# 숫자 형식화 함수
+def format_number(num):
+    if num is None:
+        return "0"
+    return f"{int(num):,}"
+
+# 세금 계산 함수
+def calculate_tax_details(value, owned_shares, share_price, tax_year=None, prior_gifts=0):
+    if not value:
+        return None
+
+    # 연도를 지정하면 해당 연도 누진세율표로 계산 (지정하지 않으면 단일세율)
+    if tax_year is not None:
+        from valuation.tax import calculate_progressive_tax_details
+        return calculate_progressive_tax_details(value, owned_shares, share_price, tax_year, prior_gifts)
+    
+    owned_value = value["ownedValue"]
+    rates = get_parameters()["flatTax"]
+    
+    # 상속증여세 (단일세율)
+    inheritance_tax = owned_value * rates["inheritanceRate"]
+    
+    # 양도소득세 (단일세율)
+    acquisition_value = owned_shares * share_price
+    transfer_profit = owned_value - acquisition_value
+    transfer_tax = transfer_profit * rates["transferRate"] if transfer_profit > 0 else 0
+    
+    # 청산소득세 계산
+    corporate_tax = owned_value * rates["corporateRate"]
+    after_tax_value = owned_value - corporate_tax
+    liquidation_tax = after_tax_value * rates["dividendRate"]
+    
+    return {
+        "inheritanceTax": inheritance_tax,
+        "transferTax": transfer_tax,
+        "corporateTax": corporate_tax,
+        "liquidationTax": liquidation_tax,
+        "acquisitionValue": acquisition_value,
+        "transferProfit": transfer_profit,
+        "afterTaxValue": after_tax_value,
+        "totalTax": corporate_tax + liquidation_tax
+    }
+
+# 비상장주식 가치 계산 함수
+def calculate_stock_value(total_equity, net_income1, net_income2, net_income3, shares, 
+                         interest_rate, evaluation_method, owned_shares):
+    params = get_parameters()["valuation"]
+    
+    # 1. 순자산가치 계산
+    net_asset_per_share = total_equity / shares
+    
+    # 2. 영업권 계산
+    w1, w2, w3 = params["incomeWeights"]
+    weighted_income = (net_income1 * w1 + net_income2 * w2 + net_income3 * w3) / (w1 + w2 + w3)
+    weighted_income_per_share = weighted_income / shares
+    weighted_income_per_share_50 = weighted_income_per_share * params["goodwillIncomeShare"]
+    equity_return = (total_equity * (interest_rate / 100)) / shares
+    annuity_factor = params["annuityFactor"]
+    goodwill = max(0, (weighted_income_per_share_50 - equity_return) * annuity_factor)
+    
+    # 3. 순자산가치 + 영업권
+    asset_value_with_goodwill = net_asset_per_share + goodwill
+    
+    # 4. 손익가치 계산
+    income_value = weighted_income_per_share * (100 / interest_rate)
+    
+    # 5. 최종가치 계산
+    if evaluation_method == '부동산 과다법인':
+        # 부동산 과다법인
+        weights = params["realEstate"]
+        stock_value = (asset_value_with_goodwill * weights["asset"]) + (income_value * weights["income"])
+        net_asset_80_percent = net_asset_per_share * params["netAssetFloor"]
+        final_value = max(stock_value, net_asset_80_percent)
+    elif evaluation_method == '순자산가치만 평가':
+        # 순자산가치만 적용
+        final_value = net_asset_per_share
+    else:
+        # 일반법인
+        weights = params["general"]
+        stock_value = (income_value * weights["income"]) + (asset_value_with_goodwill * weights["asset"])
+        net_asset_80_percent = net_asset_per_share * params["netAssetFloor"]
+        final_value = max(stock_value, net_asset_80_percent)
+    
+    # 총 가치
+    total_value = final_value * shares
+    owned_value = final_value * owned_shares
+    
+    # 증가율 계산 (자본총계가 0 이면 비율을 정의할 수 없으므로 0)
+    increase_percentage = round((final_value / net_asset_per_share) * 100) if net_asset_per_share else 0
+    
+    return {
+        "netAssetPerShare": net_asset_per_share,
+        "assetValueWithGoodwill": asset_value_with_goodwill,
+        "incomeValue": income_value,
+        "finalValue": final_value,
+        "totalValue": total_value,
+        "ownedValue": owned_value,
+        "methodText": method_text(evaluation_method),
+        "increasePercentage": increase_percentage,
+        "weightedIncome": weighted_income
+    }
+
+# 미래 주식가치 계산 함수
+def calculate_future_stock_value(stock_value, total_equity, shares, owned_shares, 
+                               interest_rate, evaluation_method, growth_rate, future_years):
+    if not stock_value:
+        return None
+    
+    params = get_parameters()["valuation"]
+    
+    # 복리 성장률 적용
+    growth_factor = (1 + (growth_rate / 100)) ** future_years
+    
+    # 미래 자산 및 수익 계산
+    future_total_equity = total_equity * growth_factor
+    future_weighted_income = stock_value["weightedIncome"] * growth_factor
+    
+    # 1. 순자산가치 계산
+    net_asset_per_share = future_total_equity / shares
+    
+    # 2. 영업권 계산
+    weighted_income_per_share = future_weighted_income / shares
+    weighted_income_per_share_50 = weighted_income_per_share * params["goodwillIncomeShare"]
+    equity_return = (future_total_equity * (interest_rate / 100)) / shares
+    annuity_factor = params["annuityFactor"]
+    goodwill = max(0, (weighted_income_per_share_50 - equity_return) * annuity_factor)
+    
+    # 3. 순자산가치 + 영업권
+    asset_value_with_goodwill = net_asset_per_share + goodwill
+    
+    # 4. 손익가치 계산
+    income_value = weighted_income_per_share * (100 / interest_rate)
+    
+    # 5. 최종가치 계산
+    if evaluation_method == '부동산 과다법인':
+        # 부동산 과다법인
+        weights = params["realEstate"]
+        stock_value_calc = (asset_value_with_goodwill * weights["asset"]) + (income_value * weights["income"])
+        net_asset_80_percent = net_asset_per_share * params["netAssetFloor"]
+        final_value = max(stock_value_calc, net_asset_80_percent)
+    elif evaluation_method == '순자산가치만 평가':
+        # 순자산가치만 적용
+        final_value = net_asset_per_share
+    else:
+        # 일반법인
+        weights = params["general"]
+        stock_value_calc = (income_value * weights["income"]) + (asset_value_with_goodwill * weights["asset"])
+        net_asset_80_percent = net_asset_per_share * params["netAssetFloor"]
+        final_value = max(stock_value_calc, net_asset_80_percent)
+    
+    # 총 가치
+    total_value = final_value * shares
+    owned_value = final_value * owned_shares
+    
+    return {
+        "netAssetPerShare": net_asset_per_share,
+        "assetValueWithGoodwill": asset_value_with_goodwill,
+        "incomeValue": income_value,
+        "finalValue": final_value,
+        "totalValue": total_value,
+        "ownedValue": owned_value,
+        "methodText": method_text(evaluation_method),
+        "futureTotalEquity": future_total_equity,
+        "futureWeightedIncome": future_weighted_income,
+        "growthRate": growth_rate,
+        "futureYears": future_years
+    }
@@ -0,0 +1,272 @@
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from valuation.batch import _value_kernel, encode_evaluation_methods
+from valuation.params import get_parameters, parameter_key, pinned_parameters
+
+# 기본 저장 위치 (환경변수 VALUATION_CUBES 로 변경 가능)
+DEFAULT_ROOT = os.path.join(os.path.expanduser("~"), ".valuation", "cubes")
+# 저장소 전체 크기 상한 (넘으면 오래 사용하지 않은 격자부터 삭제)
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+# 한 번에 계산하는 필드당 셀 수 (회사 단위로 나누어 계산하므로 격자 전체를 메모리에 올리지 않음)
+CHUNK_CELLS = 2 ** 19
+
+FORMAT_VERSION = 1
+HEADER_FILE = "header.json"
+
+# 격자 축 순서
+DIMS = ("company", "growthRate", "futureYears", "interestRate")
+CUBE_FIELDS = ("netAssetPerShare", "assetValueWithGoodwill", "incomeValue", "finalValue", "totalValue", "ownedValue")
+DEFAULT_FIELDS = ("finalValue", "totalValue", "ownedValue")
+# 격자 계산에 필요한 회사별 입력 컬럼 (interest_rate 는 격자 축으로 대체)
+COMPANY_COLUMNS = ("total_equity", "net_income1", "net_income2", "net_income3", "shares", "owned_shares",
+                   "evaluation_method")
+
+
+def _company_labels(companies):
+    names = (companies["company_name"].fillna("").astype(str).to_numpy() if "company_name" in companies.columns
+             else np.full(len(companies), "", dtype=object))
+    return [f"{i + 1}. {name}" if name else f"{i + 1}" for i, name in enumerate(names)]
+
+
+def _per_company(values):
+    # 회사 축 배열을 (회사, 1, 1, 1) 로 바꿔 나머지 축과 브로드캐스팅
+    return np.asarray(values, dtype=np.float64)[:, None, None, None]
+
+
+def scenario_key(companies, growth_rates, future_years, interest_rates, fields=DEFAULT_FIELDS, parameters=None):
+    """격자 입력값과 파라미터 버전으로 저장 파일 이름(해시)을 만듭니다. 같은 시나리오는 같은 키가 됩니다."""
+    digest = hashlib.sha256()
+    version, parameter_digest = parameters or parameter_key()
+    digest.update(json.dumps([FORMAT_VERSION, version, parameter_digest, list(fields)]).encode("utf-8"))
+    for axis in (growth_rates, future_years, interest_rates):
+        digest.update(np.ascontiguousarray(axis, dtype=np.float64).tobytes())
+    for col in COMPANY_COLUMNS:
+        values = companies[col].to_numpy()
+        if col == "evaluation_method":
+            values = encode_evaluation_methods(values.astype(str))
+        digest.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    digest.update("\0".join(_company_labels(companies)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def write_cube(path, companies, growth_rates, future_years, interest_rates, fields=DEFAULT_FIELDS,
+               chunk_cells=CHUNK_CELLS, parameters=None, progress=None):
+    """회사 × 성장률 × 예측기간 × 환원율 격자의 미래 주식가치를 path 디렉터리에 필드별 .npy 파일로 기록합니다.
+
+    calculate_future_stock_value 를 (회사, 성장률, 기간, 환원율)마다 호출한 결과와 같은 값(부동소수점 반올림 오차
+    이내)이며, 회사 몇 개씩 계산해 memmap 에 바로 쓰므로 격자가 메모리보다 커도 됩니다.
+    header.json 은 모든 배열을 기록한 뒤 마지막에 쓰므로, 헤더가 있으면 완성된 격자입니다.
+    progress(계산한 회사 수, 전체 회사 수) 는 chunk 마다 호출됩니다.
+    """
+    unknown = [field for field in fields if field not in CUBE_FIELDS]
+    if unknown:
+        raise ValueError(f"알 수 없는 결과 필드입니다: {', '.join(unknown)}")
+    growth_rates = np.asarray(growth_rates, dtype=np.float64)
+    future_years = np.asarray(future_years, dtype=np.float64)
+    interest_rates = np.asarray(interest_rates, dtype=np.float64)
+    version, parameter_digest = parameters or parameter_key()
+    shape = (len(companies), len(growth_rates), len(future_years), len(interest_rates))
+
+    os.makedirs(path, exist_ok=True)
+    arrays = {field: np.lib.format.open_memmap(os.path.join(path, f"{field}.npy"), mode="w+",
+                                               dtype=np.float64, shape=shape)
+              for field in fields}
+
+    # 성장률 × 기간 축의 복리 성장률과 환원율 축 (회사 축은 chunk 마다 앞에 붙임)
+    growth_factor = ((1 + (growth_rates[:, None] / 100)) ** future_years[None, :])[None, :, :, None]
+    rates = interest_rates[None, None, None, :]
+    step = max(1, chunk_cells // max(1, int(np.prod(shape[1:]))))
+
+    with pinned_parameters(version):
+        w1, w2, w3 = get_parameters()["valuation"]["incomeWeights"]
+        for start in range(0, shape[0], step):
+            chunk = companies.iloc[start:start + step]
+            column = {col: chunk[col].to_numpy() for col in COMPANY_COLUMNS}
+            method_code = encode_evaluation_methods(column["evaluation_method"].astype(str))
+            weighted_income = (_per_company(column["net_income1"]) * w1 + _per_company(column["net_income2"]) * w2
+                               + _per_company(column["net_income3"]) * w3) / (w1 + w2 + w3)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result = _value_kernel(_per_company(column["total_equity"]) * growth_factor,
+                                       weighted_income * growth_factor,
+                                       _per_company(column["shares"]), _per_company(column["owned_shares"]),
+                                       rates, method_code[:, None, None, None])
+            for field in fields:
+                arrays[field][start:start + step] = np.broadcast_to(result[field], (len(chunk),) + shape[1:])
+            del result
+            if progress is not None:
+                progress(start + len(chunk), shape[0])
+
+    for array in arrays.values():
+        array.flush()
+    del arrays
+
+    header = {
+        "formatVersion": FORMAT_VERSION,
+        "createdAt": datetime.now().isoformat(timespec="seconds"),
+        "parameterVersion": version,
+        "parameterDigest": parameter_digest,
+        "dims": list(DIMS),
+        "shape": list(shape),
+        "fields": list(fields),
+        "dtype": np.dtype(np.float64).str,
+        "axes": {
+            "company": _company_labels(companies),
+            "growthRate": growth_rates.tolist(),
+            "futureYears": future_years.tolist(),
+            "interestRate": interest_rates.tolist(),
+        },
+    }
+    with open(os.path.join(path, HEADER_FILE), "w", encoding="utf-8") as f:
+        json.dump(header, f, ensure_ascii=False)
+    return ScenarioCube(path)
+
+
+class ScenarioCube:
+    """디스크에 저장된 격자를 읽기 전용 memmap 으로 여는 객체입니다.
+
+    파일 전체를 읽지 않으며, select/frame 으로 꺼낸 구간만 디스크에서 읽어 메모리로 복사합니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, HEADER_FILE), encoding="utf-8") as f:
+            self.header = json.load(f)
+        if self.header.get("formatVersion") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 격자 파일 형식입니다: {path}")
+        self.shape = tuple(self.header["shape"])
+        self.fields = tuple(self.header["fields"])
+        self.axes = {dim: np.asarray(values) for dim, values in self.header["axes"].items()}
+        self._arrays = {}
+
+    @property
+    def nbytes(self):
+        return int(np.prod(self.shape, dtype=np.int64)) * 8 * len(self.fields)
+
+    def array(self, field):
+        """필드 전체를 memmap 배열로 반환합니다 (인덱싱한 구간만 실제로 읽힘)."""
+        if field not in self.fields:
+            raise KeyError(field)
+        if field not in self._arrays:
+            self._arrays[field] = np.load(os.path.join(self.path, f"{field}.npy"), mmap_mode="r")
+        return self._arrays[field]
+
+    def axis_index(self, dim, value):
+        """축 값(성장률 7.5 등)의 위치를 반환합니다."""
+        axis = self.axes[dim]
+        positions = np.flatnonzero(axis == value if dim == "company" else np.isclose(axis, value))
+        if not len(positions):
+            raise KeyError(f"{dim} 축에 {value} 값이 없습니다")
+        return int(positions[0])
+
+    def _indexer(self, selection):
+        unknown = [dim for dim in selection if dim not in DIMS]
+        if unknown:
+            raise KeyError(f"알 수 없는 축입니다: {', '.join(unknown)}")
+        return tuple(slice(None) if selection.get(dim) is None else selection[dim] for dim in DIMS)
+
+    def select(self, field, **selection):
+        """축별 위치(int 또는 slice, 지정하지 않으면 전체)로 고른 구간을 일반 배열로 복사해 반환합니다.
+
+        예: cube.select("finalValue", company=0, interestRate=2) → (성장률, 기간) 2 차원 배열
+        """
+        return np.array(self.array(field)[self._indexer(selection)])
+
+    def frame(self, fields=None, **selection):
+        """고른 구간을 축 값 컬럼 + 필드 컬럼의 긴 형식 DataFrame 으로 반환합니다 (표와 내보내기용)."""
+        fields = list(fields or self.fields)
+        indexer = self._indexer(selection)
+        columns = {}
+        kept = [(dim, self.axes[dim][index]) for dim, index in zip(DIMS, indexer) if not isinstance(index, int)]
+        grids = np.meshgrid(*(values for _, values in kept), indexing="ij")
+        for (dim, _), grid in zip(kept, grids):
+            columns[dim] = grid.ravel()
+        for field in fields:
+            columns[field] = self.select(field, **selection).ravel()
+        return pd.DataFrame(columns)
+
+
+class CubeStore:
+    """시나리오 격자를 입력값 해시별 디렉터리에 저장하고, 같은 시나리오는 다시 계산하지 않고 엽니다.
+
+    여러 스레드(Streamlit 세션)와 프로세스가 같은 디렉터리를 공유할 수 있으며, 계산 중인 격자는 임시 디렉터리에
+    쓴 뒤 이름을 바꾸므로 쓰다 만 파일을 읽지 않습니다.
+    """
+
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root or os.environ.get("VALUATION_CUBES", DEFAULT_ROOT)
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    def open(self, key):
+        """저장된 격자를 열거나, 없으면 None 을 반환합니다."""
+        path = os.path.join(self.root, key)
+        if not os.path.exists(os.path.join(path, HEADER_FILE)):
+            return None
+        # 마지막 사용 시각 (prune 순서)
+        os.utime(path)
+        return ScenarioCube(path)
+
+    def lookup(self, companies, growth_rates, future_years, interest_rates, fields=DEFAULT_FIELDS,
+               parameter_version=None):
+        """같은 입력값·파라미터로 만든 격자가 있으면 열고, 없으면 계산하지 않고 None 을 반환합니다."""
+        return self.open(scenario_key(companies, growth_rates, future_years, interest_rates, fields,
+                                      parameter_key(parameter_version)))
+
+    def get_or_create(self, companies, growth_rates, future_years, interest_rates, fields=DEFAULT_FIELDS,
+                      parameter_version=None, progress=None):
+        """시나리오 격자를 반환합니다. 같은 입력값·파라미터로 만든 파일이 있으면 계산하지 않고 엽니다.
+
+        progress 는 write_cube 에 전달되며, progress 에서 예외가 나면 쓰던 임시 파일을 지우고 중단합니다.
+        """
+        parameters = parameter_key(parameter_version)
+        key = scenario_key(companies, growth_rates, future_years, interest_rates, fields, parameters)
+        cube = self.open(key)
+        if cube is not None:
+            return cube
+
+        tmp = os.path.join(self.root, f".{key}.{uuid.uuid4().hex}.tmp")
+        try:
+            write_cube(tmp, companies, growth_rates, future_years, interest_rates, fields, parameters=parameters,
+                       progress=progress)
+            os.rename(tmp, os.path.join(self.root, key))
+        except OSError:
+            # 다른 세션이 먼저 같은 격자를 만든 경우 그 파일을 사용
+            shutil.rmtree(tmp, ignore_errors=True)
+            if self.open(key) is None:
+                raise
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self.prune(keep=key)
+        return self.open(key)
+
+    def entries(self):
+        """저장된 격자 목록 [(키, 바이트, 마지막 사용 시각)] 을 오래된 순서로 반환합니다."""
+        entries = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            entries.append((name, size, os.path.getmtime(path)))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def prune(self, keep=None):
+        """저장소 크기가 max_bytes 를 넘으면 오래 사용하지 않은 격자부터 삭제합니다."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for key, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if key != keep:
+                shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+                total -= size
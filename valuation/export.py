@@ -0,0 +1,47 @@
+import xlsxwriter
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class ExcelStreamWriter:
+    """xlsxwriter 의 constant_memory 모드로 DataFrame 을 청크 단위로 이어서 기록합니다.
+
+    constant_memory 모드에서는 행을 순서대로만 쓸 수 있지만, 이미 기록한 행을 메모리에 들고 있지 않으므로
+    행 수와 관계없이 메모리 사용량이 일정합니다.
+    """
+
+    def __init__(self, file, sheet_name="Sheet1"):
+        self._workbook = xlsxwriter.Workbook(file, {"constant_memory": True, "nan_inf_to_errors": True})
+        self._worksheet = self._workbook.add_worksheet(sheet_name)
+        self._header_format = self._workbook.add_format({"bold": True})
+        self._row = 0
+
+    def write(self, df):
+        if self._row == 0:
+            self._worksheet.write_row(0, 0, [str(column) for column in df.columns], self._header_format)
+            self._row = 1
+        # 열 단위로 파이썬 기본 타입으로 변환한 뒤 행 순서대로 기록
+        columns = [df[column].tolist() for column in df.columns]
+        for values in zip(*columns):
+            self._worksheet.write_row(self._row, 0, values)
+            self._row += 1
+
+    def close(self):
+        self._workbook.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_excel(df, file, sheet_name="Sheet1", chunk_size=50000, progress=None):
+    """DataFrame 을 엑셀 파일(경로 또는 파일 객체)로 저장합니다. progress(기록한 행 수, 전체 행 수) 는 청크마다 호출됩니다."""
+    with ExcelStreamWriter(file, sheet_name) as writer:
+        for start in range(0, len(df), chunk_size):
+            writer.write(df.iloc[start:start + chunk_size])
+            if progress is not None:
+                progress(min(start + chunk_size, len(df)), len(df))
+        if len(df) == 0:
+            writer.write(df)
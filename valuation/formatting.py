@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+
+# 금액 단위 (표시값 = 원 단위 값 / 단위)
+UNITS = {"만": 10 ** 4, "억": 10 ** 8}
+
+# 한 번에 문자 행렬로 만드는 행 수 (메모리 사용량 제한)
+CHUNK_SIZE = 65536
+
+# int64 로 정확히 다룰 수 있는 정수부 범위 (넘는 값은 파이썬 포맷으로 처리)
+_INT_LIMIT = 2.0 ** 62
+# 소수 자릿수 반올림을 배열로 처리하는 범위 (넘으면 부동소수점 오차가 반올림 판정보다 커짐)
+_ROUND_LIMIT = 1e9
+_POWERS = 10 ** np.arange(19, dtype=np.int64)
+_DIGITS = np.frombuffer("0123456789".encode("utf-32-le"), dtype=np.uint32)
+# 0~999 의 세 자리 숫자 코드표 (앞자리 0 포함)
+_TRIPLETS = _DIGITS[np.arange(1000)[:, None] // np.array([100, 10, 1]) % 10]
+_COMMA, _POINT, _MINUS = (ord(char) for char in ",.-")
+
+
+def _fixed_point_strings(magnitude, negative, decimals, suffix, grouping):
+    """magnitude(=|값| × 10^decimals 정수)를 "-1,234.5" + suffix 형태의 문자열 배열로 만듭니다.
+
+    문자열을 UTF-32 코드 행렬로 한 번에 조립한 뒤 U 문자열 배열로 보기 때문에 셀마다 파이썬 포맷을 호출하지 않습니다.
+    """
+    integer, fraction = np.divmod(magnitude, _POWERS[decimals])
+    digit_count = np.searchsorted(_POWERS, integer, side="right")
+    np.maximum(digit_count, 1, out=digit_count)
+    max_digits = int(digit_count.max())
+    suffix_codes = np.frombuffer(suffix.encode("utf-32-le"), dtype=np.uint32)
+    tail = (decimals + 1 if decimals else 0) + len(suffix_codes)
+    group_width = 4 if grouping else 3
+
+    # 1. 오른쪽 정렬 행렬: 세 자리씩 열 위치가 고정되므로 열 묶음 단위로 채움 (앞쪽 남는 자리는 2 단계에서 잘림)
+    groups = -(-max_digits // 3)
+    right_width = groups * group_width + tail
+    right = np.empty((len(magnitude), right_width), dtype=np.uint32)
+    for g in range(groups):
+        end = right_width - tail - g * group_width
+        integer, group = np.divmod(integer, 1000)
+        right[:, end - 3:end] = _TRIPLETS[group]
+        if grouping:
+            right[:, end - 4] = _COMMA
+    if decimals:
+        fraction_end = right_width - len(suffix_codes)
+        right[:, fraction_end - decimals - 1] = _POINT
+        for k in range(decimals):
+            fraction, digit = np.divmod(fraction, 10)
+            right[:, fraction_end - 1 - k] = _DIGITS[digit]
+    if len(suffix_codes):
+        right[:, right_width - len(suffix_codes):] = suffix_codes
+
+    # 2. 왼쪽 정렬: 문자열 길이(자릿수)가 같은 행끼리 묶어 오른쪽 끝 구간을 앞으로 복사
+    body = (digit_count + (digit_count - 1) // 3 if grouping else digit_count) + tail
+    sign = negative.astype(np.int64)
+    width = int((body + sign).max())
+    codes = np.zeros((len(magnitude), width), dtype=np.uint32)
+    key = body * 2 + sign
+    for value in np.unique(key):
+        rows = np.flatnonzero(key == value)
+        length, offset = divmod(int(value), 2)
+        codes[rows, offset:offset + length] = right[rows, right_width - length:]
+    codes[negative, 0] = _MINUS
+    return codes.view(f"<U{width}").ravel()
+
+
+def _as_array(values):
+    """정수 배열은 그대로(큰 정수도 정확히), 그 밖에는 float 배열로 변환합니다. None 은 format_number 처럼 0 입니다."""
+    array = np.asarray(values)
+    if array.dtype == object:
+        array = np.array([0.0 if value is None else value for value in array.ravel()],
+                         dtype=np.float64).reshape(array.shape)
+    if array.dtype.kind in "iu":
+        return array.astype(np.int64)
+    return np.asarray(array, dtype=np.float64)
+
+
+def _format_array(values, decimals, suffix, na_rep, grouping=True, scale=1, truncate=False):
+    # truncate 이면 format_number 처럼 소수점 이하를 버리고, 아니면 f"{값:.{decimals}f}" 처럼 반올림
+    values = _as_array(values)
+    if values.dtype.kind == "i" and (not truncate or scale != 1):
+        values = values.astype(np.float64)
+    shape = values.shape
+    values = values.ravel()
+    result = np.empty(len(values), dtype=object)
+
+    for start in range(0, len(values), CHUNK_SIZE):
+        chunk = values[start:start + CHUNK_SIZE]
+        if scale != 1:
+            chunk = chunk / scale
+        out = result[start:start + CHUNK_SIZE]
+        if chunk.dtype.kind == "i":
+            finite = np.ones(len(chunk), dtype=bool)
+            magnitude = np.abs(chunk)
+            exact = magnitude >= 0  # int64 최솟값은 부호를 바꿀 수 없으므로 파이썬 포맷으로 처리
+            negative = chunk < 0
+        elif not truncate:
+            finite = np.isfinite(chunk)
+            with np.errstate(invalid="ignore"):
+                scaled = np.abs(chunk) * 10.0 ** decimals
+                # 반올림 경계(x.5 근처)는 이진 부동소수점 표현에 따라 결과가 갈리므로 파이썬 포맷으로 처리
+                exact = finite & (np.abs(scaled - np.floor(scaled) - 0.5) > 1e-6) & (scaled < _ROUND_LIMIT)
+            magnitude = np.rint(np.where(exact, scaled, 0)).astype(np.int64)
+            negative = np.signbit(chunk)
+        else:
+            finite = np.isfinite(chunk)
+            with np.errstate(invalid="ignore"):
+                magnitude = np.trunc(np.abs(chunk))
+                exact = finite & (magnitude < _INT_LIMIT)
+            magnitude = np.where(exact, magnitude, 0).astype(np.int64)
+            negative = (chunk < 0) & (magnitude > 0)
+
+        out[~finite] = na_rep
+        if exact.any():
+            strings = _fixed_point_strings(magnitude[exact], negative[exact], decimals, suffix, grouping)
+            out[exact] = strings.tolist()
+        separator = "," if grouping else ""
+        for i in np.flatnonzero(finite & ~exact):
+            value = chunk[i].item()
+            out[i] = (f"{int(value):{separator}}" if truncate else f"{value:{separator}.{decimals}f}") + suffix
+
+    return result.reshape(shape)
+
+
+def format_numbers(values, unit=None, suffix="", na_rep=""):
+    """숫자 배열(리스트, Series 등)을 천 단위 쉼표 문자열 배열로 한 번에 변환합니다.
+
+    unit 이 없으면 각 원소에 format_number 를 적용한 결과와 같습니다 (소수점 이하 버림, None 은 "0").
+    unit 에 "만" 또는 "억"을 주면 그 단위로 나눈 값에 단위를 붙입니다 (예: "1,234억").
+    suffix 는 각 문자열 뒤에 붙는 글자("원" 등)이며, NaN/무한대는 na_rep 로 표시합니다.
+    반환값은 입력과 같은 shape 의 object 배열입니다 (리스트가 필요하면 .tolist()).
+    """
+    if unit is not None:
+        if unit not in UNITS:
+            raise ValueError(f"지원하지 않는 단위입니다: {unit} (지원 단위: {', '.join(UNITS)})")
+        return _format_array(values, 0, unit + suffix, na_rep, scale=UNITS[unit], truncate=True)
+    return _format_array(values, 0, suffix, na_rep, truncate=True)
+
+
+def format_percents(values, decimals=1, na_rep=""):
+    """퍼센트 값 배열을 f"{값:.{decimals}f}%" 와 같은 문자열 배열로 한 번에 변환합니다 (반올림, 쉼표 없음)."""
+    return _format_array(values, decimals, "%", na_rep, grouping=False)
+
+
+def format_frame(df, formats=None, na_rep=""):
+    """DataFrame 의 숫자 컬럼을 표시용 문자열로 바꾼 사본을 반환합니다 (화면 표와 내보내기 공용).
+
+    formats 는 {컬럼: 함수} 이며 함수는 컬럼(Series)을 받아 문자열 배열을 반환합니다.
+    지정하지 않은 숫자 컬럼은 format_numbers 를 사용합니다.
+    """
+    formats = formats or {}
+    formatted = df.copy()
+    for col in df.columns:
+        if col in formats:
+            formatted[col] = formats[col](df[col])
+        elif pd.api.types.is_numeric_dtype(df[col]):
+            formatted[col] = format_numbers(df[col], na_rep=na_rep)
+    return formatted
@@ -0,0 +1,86 @@
+import numpy as np
+
+from valuation.batch import METHOD_NET_ASSET, METHOD_REAL_ESTATE, calculate_stock_value_batch
+from valuation.params import get_parameters
+
+GRADIENT_INPUTS = ("total_equity", "net_income1", "net_income2", "net_income3", "shares", "interest_rate",
+                   "owned_shares")
+
+
+def calculate_stock_value_gradient(total_equity, net_income1, net_income2, net_income3, shares,
+                                   interest_rate, evaluation_method, owned_shares):
+    """calculate_stock_value_batch 결과와 함께 입력값별 정확한 (구간별) 편미분과 탄력성을 계산합니다.
+
+    영업권 max(0, …)과 순자산가치 80% 하한 max(…) 은 계산에 실제로 적용된 구간의 미분값을 사용하며,
+    어떤 구간이 적용됐는지는 goodwillClamped(영업권 0 적용), floorBinding(80% 하한 적용) 으로 알려줍니다.
+    반환값의 gradients 는 finalValue, totalValue, ownedValue 별 {입력값: 편미분} 이고,
+    elasticities 는 finalValue 의 탄력성 (∂finalValue/∂x × x / finalValue) 입니다.
+    """
+    value = calculate_stock_value_batch(total_equity, net_income1, net_income2, net_income3, shares,
+                                        interest_rate, evaluation_method, owned_shares)
+    total_equity = np.asarray(total_equity, dtype=np.float64)
+    shares = np.asarray(shares, dtype=np.float64)
+    owned_shares = np.asarray(owned_shares, dtype=np.float64)
+    interest_rate = np.asarray(interest_rate, dtype=np.float64)
+    method_code = value["methodCode"]
+    params = get_parameters()["valuation"]
+    annuity_factor = params["annuityFactor"]
+    goodwill_share = params["goodwillIncomeShare"]
+    floor = params["netAssetFloor"]
+
+    weighted_income = value["weightedIncome"]
+    weighted_income_per_share = weighted_income / shares
+    equity_return = (total_equity * (interest_rate / 100)) / shares
+    goodwill_active = (weighted_income_per_share * goodwill_share - equity_return) * annuity_factor > 0
+
+    # 구간 판정 (커널과 동일한 비교 규칙)
+    real_estate = method_code == METHOD_REAL_ESTATE
+    asset_weight = np.where(real_estate, params["realEstate"]["asset"], params["general"]["asset"])
+    income_weight = np.where(real_estate, params["realEstate"]["income"], params["general"]["income"])
+    stock_value = asset_weight * value["assetValueWithGoodwill"] + income_weight * value["incomeValue"]
+    floor_binding = (value["netAssetPerShare"] * floor > stock_value) & (method_code != METHOD_NET_ASSET)
+
+    def final_value_derivative(d_net_asset, d_weighted_income_per_share, d_equity_return, d_income_value):
+        d_goodwill = np.where(goodwill_active,
+                              (d_weighted_income_per_share * goodwill_share - d_equity_return) * annuity_factor, 0.0)
+        d_asset_value = d_net_asset + d_goodwill
+        d_stock_value = asset_weight * d_asset_value + income_weight * d_income_value
+        derivative = np.where(floor_binding, d_net_asset * floor, d_stock_value)
+        return np.where(method_code == METHOD_NET_ASSET, d_net_asset, derivative)
+
+    zero = np.zeros_like(value["finalValue"])
+    final_value = {}
+    final_value["total_equity"] = final_value_derivative(
+        1 / shares, zero, (interest_rate / 100) / shares, zero)
+    weights = params["incomeWeights"]
+    for name, weight in zip(("net_income1", "net_income2", "net_income3"), weights):
+        d_weighted_income_per_share = (weight / sum(weights)) / shares
+        final_value[name] = final_value_derivative(
+            zero, d_weighted_income_per_share, zero, d_weighted_income_per_share * (100 / interest_rate))
+    d_weighted_income_per_share = -weighted_income / shares ** 2
+    final_value["shares"] = final_value_derivative(
+        -total_equity / shares ** 2, d_weighted_income_per_share,
+        -(total_equity * (interest_rate / 100)) / shares ** 2, d_weighted_income_per_share * (100 / interest_rate))
+    final_value["interest_rate"] = final_value_derivative(
+        zero, zero, (total_equity / 100) / shares, -weighted_income_per_share * 100 / interest_rate ** 2)
+    final_value["owned_shares"] = zero
+
+    total_value = {name: derivative * shares for name, derivative in final_value.items()}
+    total_value["shares"] = total_value["shares"] + value["finalValue"]
+    owned_value = {name: derivative * owned_shares for name, derivative in final_value.items()}
+    owned_value["owned_shares"] = value["finalValue"]
+
+    inputs = {"total_equity": total_equity, "net_income1": net_income1, "net_income2": net_income2,
+              "net_income3": net_income3, "shares": shares, "interest_rate": interest_rate,
+              "owned_shares": owned_shares}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        elasticities = {name: final_value[name] * np.asarray(inputs[name], dtype=np.float64) / value["finalValue"]
+                        for name in GRADIENT_INPUTS}
+
+    return {
+        "value": value,
+        "gradients": {"finalValue": final_value, "totalValue": total_value, "ownedValue": owned_value},
+        "elasticities": elasticities,
+        "goodwillClamped": ~goodwill_active,
+        "floorBinding": floor_binding,
+    }
@@ -0,0 +1,179 @@
+from valuation import core
+from valuation.cache import canonical_key, get_cache
+from valuation.params import get_parameters, parameter_key
+from valuation.results import FutureStockValue, StockValue
+
+# 그래프 입력값
+INPUTS = (
+    "total_equity", "net_income1", "net_income2", "net_income3", "shares", "interest_rate",
+    "evaluation_method", "owned_shares", "share_price", "growth_rate", "future_years",
+)
+
+
+def _final_value(net_asset_per_share, asset_value_with_goodwill, income_value, evaluation_method):
+    # calculate_stock_value 의 5. 최종가치 계산과 동일
+    params = get_parameters()["valuation"]
+    if evaluation_method == '부동산 과다법인':
+        weights = params["realEstate"]
+        stock_value = (asset_value_with_goodwill * weights["asset"]) + (income_value * weights["income"])
+        return max(stock_value, net_asset_per_share * params["netAssetFloor"])
+    if evaluation_method == '순자산가치만 평가':
+        return net_asset_per_share
+    weights = params["general"]
+    stock_value = (income_value * weights["income"]) + (asset_value_with_goodwill * weights["asset"])
+    return max(stock_value, net_asset_per_share * params["netAssetFloor"])
+
+
+def _weighted_income(net_income1, net_income2, net_income3):
+    w1, w2, w3 = get_parameters()["valuation"]["incomeWeights"]
+    return (net_income1 * w1 + net_income2 * w2 + net_income3 * w3) / (w1 + w2 + w3)
+
+
+def _goodwill(weighted_income_per_share, equity_return):
+    params = get_parameters()["valuation"]
+    return max(0, (weighted_income_per_share * params["goodwillIncomeShare"] - equity_return)
+               * params["annuityFactor"])
+
+
+def _value_nodes(prefix, equity, income):
+    """자본총계 노드와 가중평균 순이익 노드로부터 주당 가치를 계산하는 노드들을 만듭니다.
+
+    현재 가치(prefix="")와 미래 가치(prefix="future.")가 같은 계산 단계를 공유합니다.
+    """
+    p = prefix
+    return {
+        p + "netAssetPerShare": ((equity, "shares"), lambda e, s: e / s),
+        p + "weightedIncomePerShare": ((income, "shares"), lambda w, s: w / s),
+        p + "equityReturn": ((equity, "interest_rate", "shares"), lambda e, r, s: (e * (r / 100)) / s),
+        p + "goodwill": ((p + "weightedIncomePerShare", p + "equityReturn"), _goodwill),
+        p + "assetValueWithGoodwill": ((p + "netAssetPerShare", p + "goodwill"), lambda n, g: n + g),
+        p + "incomeValue": ((p + "weightedIncomePerShare", "interest_rate"), lambda w, r: w * (100 / r)),
+        p + "finalValue": ((p + "netAssetPerShare", p + "assetValueWithGoodwill", p + "incomeValue",
+                            "evaluation_method"), _final_value),
+        p + "totalValue": ((p + "finalValue", "shares"), lambda f, s: f * s),
+        p + "ownedValue": ((p + "finalValue", "owned_shares"), lambda f, o: f * o),
+    }
+
+
+NODES = {
+    "weightedIncome": (("net_income1", "net_income2", "net_income3"), _weighted_income),
+    "methodText": (("evaluation_method",), core.method_text),
+    **_value_nodes("", "total_equity", "weightedIncome"),
+    "increasePercentage": (("finalValue", "netAssetPerShare"), lambda f, n: round((f / n) * 100) if n else 0),
+    "stockValue": (
+        ("netAssetPerShare", "assetValueWithGoodwill", "incomeValue", "finalValue", "totalValue", "ownedValue",
+         "methodText", "increasePercentage", "weightedIncome"),
+        lambda *values: dict(zip(StockValue.FIELDS, values)),
+    ),
+    "taxDetails": (("stockValue", "owned_shares", "share_price"), core.calculate_tax_details),
+
+    # 미래 가치
+    "growthFactor": (("growth_rate", "future_years"), lambda g, y: (1 + (g / 100)) ** y),
+    "futureTotalEquity": (("total_equity", "growthFactor"), lambda e, g: e * g),
+    "futureWeightedIncome": (("weightedIncome", "growthFactor"), lambda w, g: w * g),
+    **_value_nodes("future.", "futureTotalEquity", "futureWeightedIncome"),
+    "futureStockValue": (
+        ("future.netAssetPerShare", "future.assetValueWithGoodwill", "future.incomeValue", "future.finalValue",
+         "future.totalValue", "future.ownedValue", "methodText", "futureTotalEquity", "futureWeightedIncome",
+         "growth_rate", "future_years"),
+        lambda *values: dict(zip(FutureStockValue.FIELDS, values)),
+    ),
+    "futureTaxDetails": (("futureStockValue", "owned_shares", "share_price"), core.calculate_tax_details),
+}
+
+
+# 결과 노드는 프로세스 전체의 공유 캐시(valuation.cache)에도 저장하여, 다른 세션에서 같은 입력으로 계산한 결과를 재사용
+# 노드 이름 → (캐시 이름, core 함수의 인자 노드). 캐시 키는 memoize 로 감싼 core 함수와 같으므로 캐시를 함께 사용
+SHARED_NODES = {
+    "stockValue": ("calculate_stock_value", ("total_equity", "net_income1", "net_income2", "net_income3", "shares",
+                                             "interest_rate", "evaluation_method", "owned_shares")),
+    "taxDetails": ("calculate_tax_details", ("stockValue", "owned_shares", "share_price")),
+    "futureStockValue": ("calculate_future_stock_value", ("stockValue", "total_equity", "shares", "owned_shares",
+                                                          "interest_rate", "evaluation_method", "growth_rate",
+                                                          "future_years")),
+    "futureTaxDetails": ("calculate_tax_details", ("futureStockValue", "owned_shares", "share_price")),
+}
+SHARED_CACHE_SIZE = 4096
+SHARED_CACHE_TTL = 3600
+
+_MISSING = object()
+
+
+def _dependents():
+    dependents = {name: set() for name in INPUTS + tuple(NODES)}
+    for name, (deps, _) in NODES.items():
+        for dep in deps:
+            dependents[dep].add(name)
+    return dependents
+
+
+DEPENDENTS = _dependents()
+
+
+class ValuationGraph:
+    """평가 계산 단계를 의존성 그래프로 관리하여 바뀐 입력에 영향을 받는 단계만 다시 계산합니다.
+
+    값은 get() 으로 요청할 때 계산되며(지연 평가), 마지막 set_inputs() 이후 다시 계산된 단계는
+    recomputed 에 기록됩니다. 파라미터 파일(valuation.params)이 바뀌면 모든 단계를 다시 계산합니다.
+    SHARED_NODES 의 결과 노드는 세션 간 공유 캐시에서 먼저 찾으며, 찾으면 중간 단계는 계산하지 않습니다.
+    stockValue, taxDetails, futureStockValue, futureTaxDetails 는
+    calculate_stock_value, calculate_tax_details, calculate_future_stock_value 와 같은 결과를 반환합니다.
+    """
+
+    def __init__(self, **inputs):
+        self._inputs = {}
+        self._values = {}
+        self._parameter_key = None
+        self.recomputed = []
+        self.set_inputs(**inputs)
+
+    def set_inputs(self, **inputs):
+        """입력값을 바꾸고, 값이 달라진 입력에 의존하는 단계만 무효화합니다. 무효화된 단계 목록을 반환합니다."""
+        self.recomputed = []
+        invalidated = set()
+        for name, value in inputs.items():
+            if name not in INPUTS:
+                raise KeyError(f"알 수 없는 입력값입니다: {name}")
+            if name in self._inputs and self._inputs[name] == value:
+                continue
+            self._inputs[name] = value
+            stack = [name]
+            while stack:
+                for dependent in DEPENDENTS[stack.pop()]:
+                    if dependent not in invalidated:
+                        invalidated.add(dependent)
+                        stack.append(dependent)
+        for name in invalidated:
+            self._values.pop(name, None)
+        return sorted(invalidated)
+
+    def get(self, name):
+        if name in INPUTS:
+            return self._inputs[name]
+        key = parameter_key()
+        if key != self._parameter_key:
+            self._values.clear()
+            self._parameter_key = key
+        if name not in self._values:
+            shared = SHARED_NODES.get(name)
+            if shared is None:
+                self._values[name] = self._compute(name)
+            else:
+                cache_name, args = shared
+                cache = get_cache(cache_name, maxsize=SHARED_CACHE_SIZE, ttl=SHARED_CACHE_TTL)
+                cache_key = canonical_key((tuple(self.get(arg) for arg in args), {}, key))
+                value = cache.get(cache_key, _MISSING)
+                if value is _MISSING:
+                    value = self._compute(name)
+                    cache.set(cache_key, value)
+                self._values[name] = dict(value) if isinstance(value, dict) else value
+        return self._values[name]
+
+    def _compute(self, name):
+        deps, func = NODES[name]
+        value = func(*(self.get(dep) for dep in deps))
+        self.recomputed.append(name)
+        return value
+
+    def inputs(self):
+        return dict(self._inputs)
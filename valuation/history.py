@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Mapping
+from datetime import datetime
+
+from valuation.params import parameter_key
+
+# 기본 저장 위치 (환경변수 VALUATION_HISTORY 로 변경 가능)
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".valuation", "history.sqlite3")
+
+# 평가 종류
+KIND_PRESENT = "present"
+KIND_FUTURE = "future"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    id INTEGER PRIMARY KEY,
+    company_name TEXT NOT NULL,
+    evaluated_at TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    parameter_version INTEGER NOT NULL,
+    parameter_digest TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    outputs TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_evaluations_company ON evaluations (company_name, evaluated_at);
+CREATE INDEX IF NOT EXISTS idx_evaluations_date ON evaluations (evaluated_at);
+CREATE INDEX IF NOT EXISTS idx_evaluations_input
+    ON evaluations (input_hash, parameter_version, parameter_digest, id);
+"""
+
+
+def _normalize(value):
+    # 10 과 10.0, NumPy 숫자와 파이썬 숫자가 같은 해시가 되도록 정규화
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _json_default(value):
+    # 결과 레코드(StockValue 등)는 dict 로, NumPy 숫자는 파이썬 숫자로 저장
+    if isinstance(value, Mapping):
+        return dict(value)
+    return value.item()
+
+
+def input_hash(kind, inputs):
+    """평가 종류와 입력값으로 조회용 해시를 만듭니다 (입력 순서와 숫자 표기에 무관)."""
+    payload = json.dumps([kind, {key: _normalize(value) for key, value in inputs.items()}],
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EvaluationHistory:
+    """평가 입력값, 파라미터 버전, 결과를 SQLite 파일에 기록하고 조회합니다.
+
+    회사명+일시, 일시, 입력값 해시에 인덱스가 있어 기록이 많아도 회사별 이력 조회와
+    같은 입력값의 이전 결과 조회가 인덱스 탐색으로 끝납니다. 여러 스레드에서 하나의 객체를 공유할 수 있습니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("VALUATION_HISTORY", DEFAULT_PATH)
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _row(self, company_name, kind, inputs, outputs, parameters, evaluated_at):
+        version, digest = parameters or parameter_key()
+        return (
+            company_name,
+            evaluated_at or datetime.now().isoformat(timespec="seconds"),
+            kind,
+            input_hash(kind, inputs),
+            version,
+            digest,
+            json.dumps({key: _normalize(value) for key, value in inputs.items()}, ensure_ascii=False),
+            json.dumps(outputs, ensure_ascii=False, default=_json_default),
+        )
+
+    def record(self, company_name, kind, inputs, outputs, parameters=None, evaluated_at=None):
+        """평가 1건을 기록하고 id 를 반환합니다. parameters 는 (버전, 해시) 이며 없으면 현재 파라미터입니다."""
+        row = self._row(company_name, kind, inputs, outputs, parameters, evaluated_at)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO evaluations (company_name, evaluated_at, kind, input_hash, parameter_version, "
+                "parameter_digest, inputs, outputs) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+            return cursor.lastrowid
+
+    def record_many(self, records, parameters=None):
+        """(company_name, kind, inputs, outputs) 목록을 한 트랜잭션으로 기록합니다."""
+        parameters = parameters or parameter_key()
+        rows = (self._row(company_name, kind, inputs, outputs, parameters, None)
+                for company_name, kind, inputs, outputs in records)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO evaluations (company_name, evaluated_at, kind, input_hash, parameter_version, "
+                "parameter_digest, inputs, outputs) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def lookup(self, kind, inputs, parameters=None):
+        """같은 입력값과 같은 파라미터(버전, 파일 해시)로 평가한 가장 최근 결과를 반환합니다. 없으면 None."""
+        version, digest = parameters or parameter_key()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT outputs FROM evaluations WHERE input_hash = ? AND parameter_version = ? "
+                "AND parameter_digest = ? ORDER BY id DESC LIMIT 1",
+                (input_hash(kind, inputs), version, digest)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def history(self, company_name, limit=100, kind=None):
+        """회사의 평가 이력을 최신순으로 반환합니다."""
+        query = ("SELECT id, evaluated_at, kind, parameter_version, inputs, outputs FROM evaluations "
+                 "WHERE company_name = ?")
+        args = [company_name]
+        if kind is not None:
+            query += " AND kind = ?"
+            args.append(kind)
+        query += " ORDER BY evaluated_at DESC, id DESC LIMIT ?"
+        args.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, args).fetchall()
+        return [
+            {"id": row[0], "evaluatedAt": row[1], "kind": row[2], "parameterVersion": row[3],
+             "inputs": json.loads(row[4]), "outputs": json.loads(row[5])}
+            for row in rows
+        ]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
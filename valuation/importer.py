@@ -0,0 +1,169 @@
+import hashlib
+import os
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from valuation.cache import get_cache
+from valuation.core import EVALUATION_METHODS
+from valuation.portfolio import PORTFOLIO_COLUMNS
+
+IMPORT_FORMATS = ("csv", "parquet", "xlsx")
+
+# 컬럼별 형식과 허용 범위. required 가 아닌 컬럼은 비어 있으면 default 를 사용
+SCHEMA = {
+    "company_name": {"type": "str", "required": False, "default": ""},
+    "total_equity": {"type": "float", "required": True, "min": 0},
+    "net_income1": {"type": "float", "required": True},
+    "net_income2": {"type": "float", "required": True},
+    "net_income3": {"type": "float", "required": True},
+    "shares": {"type": "int", "required": True, "min": 1},
+    "owned_shares": {"type": "int", "required": True, "min": 0},
+    "share_price": {"type": "float", "required": False, "default": 0.0, "min": 0},
+    # 화면의 환원율 슬라이더와 같은 범위
+    "interest_rate": {"type": "float", "required": True, "min": 1, "max": 20},
+    "evaluation_method": {"type": "choice", "required": False, "default": EVALUATION_METHODS[0],
+                          "choices": EVALUATION_METHODS},
+}
+
+ERROR_COLUMNS = ["행 번호", "컬럼", "값", "오류"]
+
+# 같은 파일(내용 해시)은 한 번만 읽고 검증
+_import_cache = get_cache("import_portfolio", maxsize=16)
+
+
+def file_format(filename):
+    ext = os.path.splitext(filename)[1].lower().lstrip(".")
+    if ext not in IMPORT_FORMATS:
+        raise ValueError(f"파일 형식을 알 수 없습니다: {filename} (지원 형식: {', '.join(IMPORT_FORMATS)})")
+    return ext
+
+
+def _read_xlsx(file):
+    # openpyxl 읽기 전용 모드: 셀 객체를 만들지 않고 행 값만 순서대로 읽음
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        records = [row for row in rows if any(value is not None for value in row)]
+    finally:
+        workbook.close()
+    columns = [f"Unnamed: {i}" if name is None else str(name) for i, name in enumerate(header)]
+    return pd.DataFrame.from_records(records, columns=columns)
+
+
+def read_table(file, filename):
+    """csv/parquet/xlsx 파일(경로 또는 파일 객체)을 검증 전 DataFrame 으로 읽습니다."""
+    fmt = file_format(filename)
+    if fmt == "csv":
+        return pd.read_csv(file)
+    if fmt == "parquet":
+        try:
+            return pd.read_parquet(file)
+        except ImportError as e:
+            raise ValueError("Parquet 파일을 읽으려면 pyarrow 가 필요합니다.") from e
+    return _read_xlsx(file)
+
+
+def validate_portfolio(df):
+    """모든 행을 SCHEMA 로 한 번에 검증하고, 올바른 행과 오류 목록을 나눠 반환합니다.
+
+    잘못된 행이 있어도 중단하지 않으며, 필수 컬럼 자체가 없을 때만 ValueError 를 냅니다.
+    반환값은 {"data": 형식이 맞춰진 올바른 행 DataFrame, "errors": 오류 DataFrame(행 번호는 헤더 제외 1부터),
+    "rows": 전체 행 수} 입니다.
+    """
+    missing = [col for col, rule in SCHEMA.items() if rule["required"] and col not in df.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    n = len(df)
+    data = {}
+    errors = []  # (행 위치 배열, 컬럼, 원래 값, 오류 메시지)
+
+    def check(col, bad, raw, message):
+        positions = np.flatnonzero(bad)
+        if len(positions):
+            errors.append((positions, col, raw.iloc[positions], message))
+
+    for col, rule in SCHEMA.items():
+        if col not in df.columns:
+            data[col] = np.full(n, rule["default"], dtype=object if rule["type"] in ("str", "choice") else None)
+            continue
+        raw = df[col]
+        empty = raw.isna().to_numpy()
+        if rule["type"] in ("str", "choice"):
+            values = raw.astype(str).str.strip().to_numpy(dtype=object)
+            empty |= values == ""
+            if rule["required"]:
+                check(col, empty, raw, "값이 없습니다")
+            values[empty] = rule.get("default", "")
+            if rule["type"] == "choice":
+                check(col, ~np.isin(values, rule["choices"]), raw,
+                      f"다음 중 하나여야 합니다: {', '.join(rule['choices'])}")
+            data[col] = values
+            continue
+
+        values = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=np.float64)
+        if rule["required"]:
+            check(col, empty, raw, "값이 없습니다")
+        else:
+            values[empty] = rule["default"]
+        invalid = ~empty & ~np.isfinite(values)
+        check(col, invalid, raw, "숫자가 아닙니다")
+        with np.errstate(invalid="ignore"):
+            if rule["type"] == "int":
+                check(col, np.isfinite(values) & (values != np.floor(values)), raw, "정수여야 합니다")
+            if "min" in rule:
+                check(col, values < rule["min"], raw, f"{rule['min']} 이상이어야 합니다")
+            if "max" in rule:
+                check(col, values > rule["max"], raw, f"{rule['max']} 이하여야 합니다")
+        data[col] = values
+
+    # 컬럼 간 규칙
+    with np.errstate(invalid="ignore"):
+        check("owned_shares", data["owned_shares"] > data["shares"], df["owned_shares"],
+              "총 발행주식수보다 클 수 없습니다")
+
+    bad = np.zeros(n, dtype=bool)
+    for positions, _, _, _ in errors:
+        bad[positions] = True
+    valid = ~bad
+
+    result = pd.DataFrame({col: data[col][valid] for col in PORTFOLIO_COLUMNS})
+    for col, rule in SCHEMA.items():
+        if rule["type"] == "int":
+            result[col] = result[col].astype(np.int64)
+
+    if errors:
+        order = list(SCHEMA)
+        error_df = pd.DataFrame({
+            "행 번호": np.concatenate([positions + 1 for positions, _, _, _ in errors]),
+            "컬럼": np.concatenate([np.full(len(positions), col, dtype=object) for positions, col, _, _ in errors]),
+            "값": np.concatenate([raw.astype(str).to_numpy(dtype=object) for _, _, raw, _ in errors]),
+            "오류": np.concatenate([np.full(len(positions), message, dtype=object)
+                                  for positions, _, _, message in errors]),
+        })
+        error_df["_order"] = error_df["컬럼"].map(order.index)
+        error_df = error_df.sort_values(["행 번호", "_order"], kind="stable").drop(columns="_order")
+        error_df = error_df.reset_index(drop=True)
+    else:
+        error_df = pd.DataFrame(columns=ERROR_COLUMNS)
+    return {"data": result, "errors": error_df, "rows": n}
+
+
+def import_portfolio(file_bytes, filename):
+    """업로드 파일을 읽고 검증합니다. 같은 내용의 파일은 다시 읽지 않고 저장된 결과를 반환합니다.
+
+    반환되는 DataFrame 은 캐시와 공유되므로 수정하지 마세요 (필요하면 .copy()).
+    """
+    key = (hashlib.sha256(file_bytes).hexdigest(), file_format(filename))
+    result = _import_cache.get(key)
+    if result is None:
+        result = validate_portfolio(read_table(BytesIO(file_bytes), filename))
+        _import_cache.set(key, result)
+    return dict(result)
@@ -0,0 +1,171 @@
+import contextvars
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from valuation.metrics import finish_run, start_run
+
+# 작업 상태
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE_STATUSES = (PENDING, RUNNING)
+
+# 동시에 실행하는 작업 수 (NumPy 연산은 GIL 을 놓으므로 스레드로도 병렬 실행됨)
+DEFAULT_WORKERS = 2
+# 끝난 작업을 보관하는 개수와 시간 (초). 넘으면 오래된 작업부터 결과를 버림
+MAX_FINISHED = 64
+RESULT_TTL = 3600
+
+
+class JobCancelled(Exception):
+    """취소 요청을 받은 작업이 report/check 에서 중단될 때 발생합니다."""
+
+
+class Job:
+    """백그라운드 작업 1건의 상태, 진행률, 결과입니다.
+
+    작업 함수는 첫 번째 인자로 Job 을 받아 job.report(진행률, 메시지) 로 진행 상황을 알리며,
+    취소 요청이 있으면 report/check 에서 JobCancelled 가 발생해 작업이 중단됩니다.
+    """
+
+    def __init__(self, kind, label=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.label = label or kind
+        self.status = PENDING
+        self.progress = 0.0
+        self.message = ""
+        # 진행 중 화면에 보여줄 중간 결과 (몬테카를로 수렴 과정 등)
+        self.partial = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._future = None
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    @property
+    def finished(self):
+        return self.status not in ACTIVE_STATUSES
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def report(self, progress, message=None, partial=None):
+        """진행률(0~1)과 메시지, 중간 결과를 기록합니다. 취소 요청이 있으면 JobCancelled 를 냅니다."""
+        self.check()
+        self.progress = min(max(float(progress), 0.0), 1.0)
+        if message is not None:
+            self.message = message
+        if partial is not None:
+            self.partial = partial
+
+    def snapshot(self):
+        """화면 표시나 JSON 직렬화용 상태 dict 를 반환합니다 (결과 제외)."""
+        end = self.finished_at or time.time()
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "label": self.label,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "error": self.error,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+            "elapsedSeconds": end - self.started_at if self.started_at else 0.0,
+        }
+
+
+class JobRunner:
+    """작업을 스레드 풀에서 실행하고 id 로 상태와 결과를 조회하는 저장소입니다.
+
+    submit 은 작업을 대기열에 넣고 id 를 바로 반환합니다. 제출한 쪽의 contextvars(고정한 파라미터 버전 등)를
+    그대로 사용하며, 작업 소요 시간은 성능 지표에 'job.<kind>' 단계로 기록됩니다.
+    여러 Streamlit 세션이 하나의 객체를 공유할 수 있습니다.
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, max_finished=MAX_FINISHED, ttl=RESULT_TTL):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="valuation-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.max_finished = max_finished
+        self.ttl = ttl
+
+    def submit(self, kind, func, *args, label=None, **kwargs):
+        """func(job, *args, **kwargs) 를 백그라운드에서 실행하도록 등록하고 작업 id 를 반환합니다."""
+        job = Job(kind, label)
+        context = contextvars.copy_context()
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        job._future = self._executor.submit(context.run, self._run, job, func, args, kwargs)
+        return job.id
+
+    def _run(self, job, func, args, kwargs):
+        # 상태는 finished_at 을 기록한 뒤 마지막에 바꿈 (끝난 작업은 항상 finished_at 이 있음)
+        if job.cancel_requested:
+            job.finished_at, job.status = time.time(), CANCELLED
+            return
+        job.started_at, job.status = time.time(), RUNNING
+        start_run()
+        status = FAILED
+        try:
+            job.result = func(job, *args, **kwargs)
+            job.progress = 1.0
+            status = DONE
+        except JobCancelled:
+            status = CANCELLED
+        except Exception as e:
+            job.error = str(e)
+        finally:
+            finish_run(f"job.{job.kind}")
+            job.finished_at = time.time()
+            job.status = status
+
+    def get(self, job_id):
+        """작업을 반환합니다. 없거나 보관 기간이 지나 삭제된 작업이면 None 입니다."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """작업 취소를 요청합니다. 대기 중이면 바로 취소되고, 실행 중이면 다음 report/check 에서 멈춥니다."""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job._cancel.set()
+        if job._future is not None and job._future.cancel():
+            job.finished_at, job.status = time.time(), CANCELLED
+        return True
+
+    def jobs(self, kind=None):
+        """작업 목록을 제출 순서로 반환합니다."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job for job in jobs if kind is None or job.kind == kind]
+
+    def _prune(self):
+        # 잠금 안에서 호출: 보관 기간이 지났거나 개수를 넘은 끝난 작업 삭제
+        now = time.time()
+        finished = sorted((job for job in self._jobs.values() if job.finished), key=lambda job: job.finished_at)
+        excess = len(finished) - self.max_finished
+        for i, job in enumerate(finished):
+            if i < excess or now - job.finished_at > self.ttl:
+                del self._jobs[job.id]
+
+    def shutdown(self, wait=True):
+        """실행 중인 작업에 취소를 요청하고 스레드 풀을 종료합니다."""
+        for job in self.jobs():
+            self.cancel(job.id)
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,222 @@
+import bisect
+import contextlib
+import contextvars
+import functools
+import json
+import threading
+import time
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from valuation.cache import cache_stats
+
+# 지연시간 히스토그램 구간 상한 (초, Prometheus 버킷)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Prometheus 지표 이름 앞에 붙는 이름
+PREFIX = "valuation"
+
+# 현재 실행 흐름(Streamlit 재실행 1회, CLI 실행 1회 등)의 단계별 기록
+_current_run = contextvars.ContextVar("metrics_run", default=None)
+
+
+def payload_size(value):
+    """결과 객체의 대략적인 크기(바이트)를 계산합니다. 배열과 DataFrame 은 복사하지 않고 버퍼 크기만 합산합니다."""
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(index=False)))
+    if isinstance(value, Mapping):
+        return sum(payload_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(payload_size(item) for item in value)
+    if hasattr(value, "to_plotly_json"):
+        # Plotly Figure: trace 의 배열 데이터 크기
+        return payload_size(value.to_plotly_json().get("data"))
+    return 8
+
+
+class MetricsRegistry:
+    """단계(stage)별 호출 수, 소요 시간 히스토그램, 결과 크기를 누적하는 스레드 안전한 저장소입니다."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self._stages = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def observe(self, stage, seconds, payload_bytes=None):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = {
+                    "count": 0, "totalSeconds": 0.0, "maxSeconds": 0.0,
+                    "payloadBytes": 0, "payloadCount": 0, "bucketCounts": [0] * (len(self.buckets) + 1),
+                }
+            stats["count"] += 1
+            stats["totalSeconds"] += seconds
+            stats["maxSeconds"] = max(stats["maxSeconds"], seconds)
+            stats["bucketCounts"][index] += 1
+            if payload_bytes is not None:
+                stats["payloadBytes"] += payload_bytes
+                stats["payloadCount"] += 1
+
+    def snapshot(self):
+        """단계별 누적 통계 사본을 반환합니다."""
+        with self._lock:
+            stages = {stage: dict(stats, bucketCounts=list(stats["bucketCounts"]))
+                      for stage, stats in self._stages.items()}
+        for stats in stages.values():
+            stats["meanSeconds"] = stats["totalSeconds"] / stats["count"]
+        return stages
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self.started_at = time.time()
+
+    def to_json(self):
+        """단계별 통계와 공유 캐시 통계를 JSON 문자열로 반환합니다."""
+        return json.dumps({
+            "startedAt": self.started_at,
+            "buckets": list(self.buckets),
+            "stages": self.snapshot(),
+            "caches": cache_stats(),
+        }, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, prefix=PREFIX):
+        """Prometheus 텍스트 형식(exposition format)으로 반환합니다."""
+        lines = [
+            f"# HELP {prefix}_stage_seconds 단계별 소요 시간",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        stages = self.snapshot()
+        for stage, stats in sorted(stages.items()):
+            label = _label(stage)
+            cumulative = 0
+            for upper, count in zip(self.buckets, stats["bucketCounts"]):
+                cumulative += count
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{label}",le="{upper:g}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_seconds_bucket{{stage="{label}",le="+Inf"}} {stats["count"]}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{label}"}} {stats["totalSeconds"]!r}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{label}"}} {stats["count"]}')
+
+        lines += [f"# HELP {prefix}_stage_payload_bytes 단계 결과 크기 합계",
+                  f"# TYPE {prefix}_stage_payload_bytes counter"]
+        for stage, stats in sorted(stages.items()):
+            lines.append(f'{prefix}_stage_payload_bytes_total{{stage="{_label(stage)}"}} {stats["payloadBytes"]}')
+
+        caches = cache_stats()
+        for name, kind in (("hits", "counter"), ("misses", "counter"), ("evictions", "counter"), ("size", "gauge")):
+            metric = f"{prefix}_cache_{name}" + ("_total" if kind == "counter" else "")
+            lines += [f"# HELP {metric} 공유 캐시 {name}", f"# TYPE {metric} {kind}"]
+            for cache, stats in sorted(caches.items()):
+                lines.append(f'{metric}{{cache="{_label(cache)}"}} {stats[name]}')
+        return "\n".join(lines) + "\n"
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry():
+    return _registry
+
+
+class Run:
+    """실행 1회(Streamlit 재실행 등)의 단계별 기록입니다. records 는 (단계, 초, 바이트) 목록입니다."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last_lap = self.started
+        self.records = []
+
+    def summary(self):
+        """단계별 합계 (단계, 호출 수, 초, 바이트) 목록을 처음 기록된 순서로 반환합니다. 크기를 기록하지 않은 단계는 None."""
+        totals = {}
+        for stage, seconds, payload_bytes in self.records:
+            calls, total, size = totals.get(stage, (0, 0.0, None))
+            if payload_bytes is not None:
+                size = (size or 0) + payload_bytes
+            totals[stage] = (calls + 1, total + seconds, size)
+        return [(stage, *values) for stage, values in totals.items()]
+
+
+def _observe(stage, seconds, payload_bytes=None):
+    _registry.observe(stage, seconds, payload_bytes)
+    run = _current_run.get()
+    if run is not None:
+        run.records.append((stage, seconds, payload_bytes))
+
+
+def start_run():
+    """현재 실행 흐름의 단계 기록을 새로 시작합니다."""
+    run = Run()
+    _current_run.set(run)
+    return run
+
+
+def finish_run(stage="rerun"):
+    """현재 실행의 전체 소요 시간을 stage 로 기록하고 Run 을 반환합니다 (시작하지 않았으면 None)."""
+    run = _current_run.get()
+    if run is None:
+        return None
+    _current_run.set(None)
+    elapsed = time.perf_counter() - run.started
+    _registry.observe(stage, elapsed)
+    run.records.append((stage, elapsed, None))
+    return run
+
+
+def lap(stage):
+    """직전 lap(또는 실행 시작) 이후 경과 시간을 stage 로 기록합니다. 들여쓰기 없이 구간을 나눌 때 사용합니다."""
+    run = _current_run.get()
+    if run is None:
+        return
+    now = time.perf_counter()
+    _observe(stage, now - run.last_lap)
+    run.last_lap = now
+
+
+class _Measurement:
+    payload = None
+
+
+@contextlib.contextmanager
+def timed(stage):
+    """with 블록의 소요 시간을 stage 로 기록합니다. 블록 안에서 m.payload 에 결과를 넣으면 크기도 기록합니다."""
+    measurement = _Measurement()
+    started = time.perf_counter()
+    try:
+        yield measurement
+    finally:
+        elapsed = time.perf_counter() - started
+        payload = measurement.payload
+        _observe(stage, elapsed, None if payload is None else payload_size(payload))
+
+
+def instrument(stage, payload=False):
+    """함수 호출 시간을 stage 로 기록하는 데코레이터입니다. payload 이면 반환값 크기도 기록합니다."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result = func(*args, **kwargs)
+            elapsed = time.perf_counter() - started
+            _observe(stage, elapsed, payload_size(result) if payload else None)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,142 @@
+import numpy as np
+
+from valuation.batch import _value_kernel, calculate_tax_details_batch, encode_evaluation_methods
+
+# 보고할 백분위수와 항목
+PERCENTILES = (5, 25, 50, 75, 95)
+VALUE_FIELDS = ("finalValue", "ownedValue")
+TAX_FIELDS = ("inheritanceTax", "transferTax", "totalTax")
+# 중간 집계용 청크별 분위수 요약의 점 수
+SKETCH_QUANTILES = 101
+# 마지막 집계에 포함하는 히스토그램 구간 수
+HISTOGRAM_BINS = 100
+
+
+def sample_distribution(rng, spec, size):
+    """분포 설정(dict)에 따라 난수를 생성합니다.
+
+    지원하는 분포: fixed(value), normal(mean, std), uniform(low, high),
+    triangular(low, mode, high), lognormal(mean, sigma)
+    """
+    kind = spec.get("type", "fixed")
+    if kind == "fixed":
+        return np.full(size, float(spec["value"]))
+    if kind == "normal":
+        return rng.normal(spec["mean"], spec["std"], size)
+    if kind == "uniform":
+        return rng.uniform(spec["low"], spec["high"], size)
+    if kind == "triangular":
+        return rng.triangular(spec["low"], spec["mode"], spec["high"], size)
+    if kind == "lognormal":
+        return rng.lognormal(spec["mean"], spec["sigma"], size)
+    raise ValueError(f"지원하지 않는 분포입니다: {kind}")
+
+
+def simulate_paths(rng, stock_value, total_equity, shares, owned_shares, share_price, evaluation_method,
+                   future_years, n_paths, growth_rate, interest_rate, income_shock):
+    """n_paths 개 경로의 미래 주식가치와 세금을 한 번에 계산합니다.
+
+    경로마다 연간 성장률과 환원율을 한 번 뽑고, 가중평균 순이익에는 매년 별도의 충격(%)을 더해 복리로 반영합니다.
+    """
+    growth = sample_distribution(rng, growth_rate, n_paths)
+    # 환원율이 0 이하가 되면 손익가치를 계산할 수 없으므로 하한을 둠
+    rate = np.maximum(sample_distribution(rng, interest_rate, n_paths), 0.1)
+    shocks = sample_distribution(rng, income_shock, (n_paths, future_years))
+
+    # 복리 성장률 적용 (충격이 0이면 calculate_future_stock_value 와 동일)
+    growth_factor = (1 + (growth / 100)) ** future_years
+    income_factor = np.prod(1 + (growth[:, None] / 100) + (shocks / 100), axis=1)
+
+    future_total_equity = total_equity * growth_factor
+    future_weighted_income = stock_value["weightedIncome"] * income_factor
+
+    result = _value_kernel(future_total_equity, future_weighted_income, float(shares), float(owned_shares),
+                           rate, encode_evaluation_methods(evaluation_method))
+    result.update(calculate_tax_details_batch(result["ownedValue"], owned_shares, share_price))
+    result["growthRate"] = growth
+    result["interestRate"] = rate
+    return result
+
+
+def _sketch(values):
+    """청크 하나를 SKETCH_QUANTILES 위치의 분위수로 요약합니다 (청크 크기와 관계없이 점 SKETCH_QUANTILES 개)."""
+    return np.percentile(values, np.linspace(0, 100, SKETCH_QUANTILES))
+
+
+def _sketch_percentiles(points, weights):
+    """청크별 분위수 요약을 합쳐 전체 백분위수를 근사합니다 (가중 분위수, 원 표본은 사용하지 않음)."""
+    points = np.concatenate(points)
+    weights = np.concatenate(weights)
+    order = np.argsort(points, kind="stable")
+    points, weights = points[order], weights[order]
+    cumulative = (np.cumsum(weights) - weights / 2) / weights.sum()
+    return np.interp(np.asarray(PERCENTILES) / 100, cumulative, points)
+
+
+def _summarize(paths, n_paths, sums, percentiles):
+    return {
+        "paths": paths,
+        "totalPaths": n_paths,
+        "mean": {field: total / paths for field, total in sums.items()},
+        "percentiles": {
+            field: dict(zip(PERCENTILES, np.asarray(values, dtype=np.float64).tolist()))
+            for field, values in percentiles.items()
+        },
+    }
+
+
+def iter_monte_carlo(stock_value, total_equity, shares, owned_shares, share_price, evaluation_method,
+                     future_years, growth_rate, interest_rate, income_shock,
+                     n_paths=100000, chunk_size=10000, seed=None):
+    """몬테카를로 시뮬레이션을 chunk_size 경로씩 나누어 실행하며 중간 집계를 차례로 반환합니다.
+
+    같은 seed 와 chunk_size 이면 항상 같은 결과가 나옵니다. 중간 집계의 백분위수는 청크별 분위수 요약을 합친
+    근사값이고, 마지막 집계에서만 전체 표본으로 정확한 백분위수를 한 번 계산합니다. 마지막 집계에는 표본 대신
+    1주당 최종 평가액의 구간별 개수("histogram": {"counts", "edges"})가 포함됩니다.
+    """
+    if not stock_value:
+        return
+
+    n_chunks = -(-n_paths // chunk_size)
+    # 청크마다 독립된 난수 생성기를 사용하여 재현성을 보장
+    child_seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+
+    fields = VALUE_FIELDS + TAX_FIELDS
+    samples = {field: np.empty(n_paths) for field in fields}
+    sums = dict.fromkeys(fields, 0.0)
+    sketches = {field: [] for field in fields}
+    sketch_weights = []
+    done = 0
+    for child_seed in child_seeds:
+        size = min(chunk_size, n_paths - done)
+        paths = simulate_paths(
+            np.random.default_rng(child_seed), stock_value, total_equity, shares, owned_shares, share_price,
+            evaluation_method, future_years, size, growth_rate, interest_rate, income_shock
+        )
+        for field in fields:
+            samples[field][done:done + size] = paths[field]
+            sums[field] += float(paths[field].sum())
+            sketches[field].append(_sketch(paths[field]))
+        sketch_weights.append(np.full(SKETCH_QUANTILES, size / SKETCH_QUANTILES))
+        done += size
+
+        if done < n_paths:
+            yield _summarize(done, n_paths, sums, {
+                field: _sketch_percentiles(sketches[field], sketch_weights) for field in fields
+            })
+
+    # 전체 표본으로 정확한 백분위수와 히스토그램을 한 번만 계산
+    summary = _summarize(done, n_paths, sums, {
+        field: np.percentile(values, PERCENTILES) for field, values in samples.items()
+    })
+    counts, edges = np.histogram(samples["finalValue"], bins=HISTOGRAM_BINS)
+    summary["histogram"] = {"counts": counts, "edges": edges}
+    yield summary
+
+
+def run_monte_carlo(*args, **kwargs):
+    """iter_monte_carlo 를 끝까지 실행하고 최종 집계를 반환합니다."""
+    summary = None
+    for summary in iter_monte_carlo(*args, **kwargs):
+        pass
+    return summary
@@ -0,0 +1,177 @@
+import numpy as np
+
+from valuation.batch import calculate_tax_details_batch
+from valuation.simulation import calculate_future_stock_value_grid
+from valuation.tax import calculate_progressive_tax_details_batch
+
+# 증여세 합산 기간 (년): 이 기간 안의 동일인 증여재산은 합산하여 누진세율과 증여재산공제를 적용
+GIFT_AGGREGATION_YEARS = 10
+
+
+def progressive_transfer_taxes(owned_value, owned_shares, share_price, years, prior_gifts=0):
+    """증여 시 부담하는 세금 (누진세율표의 상속증여세 + 양도소득세, 현재 세법이 유지된다고 가정).
+
+    prior_gifts 는 최근 10년 내 같은 사람에게 증여한 재산 가액으로, 증여세 과세표준에 합산됩니다.
+    """
+    tax = calculate_progressive_tax_details_batch(owned_value, owned_shares, share_price, None, prior_gifts)
+    return tax["inheritanceTax"] + tax["transferTax"]
+
+
+def flat_transfer_taxes(owned_value, owned_shares, share_price, years, prior_gifts=0):
+    """증여 시 부담하는 세금 (calculate_tax_details 의 단일세율 상속증여세 + 양도소득세).
+
+    세금이 증여 가액에 비례하므로 나누어 증여해도 세금이 줄지 않습니다. 이 세금으로 최적화하면 연간 한도가
+    없는 한 항상 한 해에 전부 증여하는 계획이 나오므로 비교용으로만 사용하세요. prior_gifts 는 사용하지 않습니다.
+    """
+    tax = calculate_tax_details_batch(owned_value, owned_shares, share_price)
+    return tax["inheritanceTax"] + tax["transferTax"]
+
+
+def _finite_or_none(value):
+    # 연간 한도 때문에 불가능한 계획(세금 inf)은 None
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+def _round_gifts(round_shares, max_shares_per_year, max_years):
+    """회차별 주식 수를 연간 한도까지 앞 연도부터 채워 나눈 (회차 × 연차) 증여 주식 수와 회차별 소요 연수입니다.
+
+    max_years 를 넘는 연차는 계산하지 않습니다 (그런 회차는 기간 안에 끝나지 않음).
+    """
+    if max_shares_per_year is None:
+        return round_shares[:, None].astype(np.float64), np.ones(len(round_shares), dtype=np.int64)
+    round_years = np.ceil(round_shares / max_shares_per_year).astype(np.int64)
+    offsets = np.arange(max(1, min(round_years.max(), max_years)))
+    gifts = np.clip(round_shares[:, None] - offsets[None, :] * max_shares_per_year, 0, max_shares_per_year)
+    return gifts.astype(np.float64), round_years
+
+
+def optimize_gift_schedule(stock_value, total_equity, shares, owned_shares, interest_rate, evaluation_method,
+                           share_price, growth_rate, horizon, gift_shares=None, max_lots=200,
+                           max_shares_per_year=None, discount_rate=0.0, tax_function=progressive_transfer_taxes):
+    """horizon 년 동안 어느 해에 몇 주를 증여할지 정하여 상속증여세 + 양도소득세 합계를 최소화합니다.
+
+    연도별 주당 가치는 성장률 가정에 따른 미래 주식가치 격자로 한 번에 계산하고, 증여 주식 수를 최대 max_lots 개의
+    단위로 나눈 뒤 (연도 × 누적 증여 단위) 동적계획법으로 최적 계획을 찾습니다.
+
+    증여는 회차 단위로 계획합니다. 한 회차는 시작 연도부터 해마다 연간 한도(max_shares_per_year)까지 증여하며,
+    회차 안의 증여는 10년 합산 과세됩니다. 다음 회차는 앞 회차의 마지막 증여로부터 10년이 지난 뒤 시작하므로
+    회차마다 증여재산공제와 낮은 세율 구간을 다시 적용받습니다. 기본 세금은 누진세율표(progressive_transfer_taxes)
+    이며, 단일세율(flat_transfer_taxes)로는 나누어 증여하는 이점이 없으므로 비교용입니다.
+    discount_rate(%) 를 지정하면 연도별 세금을 현재가치로 할인하여 비교합니다.
+    tax_function(가치, 주식수, 액면금액, 연도, 합산 증여재산) 은 증여 1건의 세금 배열을 반환하는 함수입니다.
+    비교용 giftNowTax, giftAtHorizonTax 는 한 해에 전부 증여하는 경우의 세금이며, 연간 한도를 넘으면 None 입니다.
+    """
+    if not stock_value:
+        return None
+
+    gift_shares = int(owned_shares if gift_shares is None else gift_shares)
+    lots = max(1, min(max_lots, gift_shares))
+    # k 번째 단위까지의 누적 주식 수 (정수). 단위 크기는 최대 1주 차이이며 모든 단위의 합은 gift_shares 와 같음
+    cumulative = np.floor(np.arange(lots + 1) * gift_shares / lots)
+    years = np.arange(horizon + 1)
+    discount = (1 + discount_rate / 100) ** years
+
+    # 연도별 주당 가치 (0년 = 현재 가치)
+    grid = calculate_future_stock_value_grid(stock_value, total_equity, shares, owned_shares, interest_rate,
+                                             evaluation_method, [growth_rate], years)
+    per_share = grid["finalValue"][0]
+
+    # 회차 하나로 증여할 수 있는 주식 수 (i 번째 ~ j 번째 단위) 와 회차별 연도별 증여 주식 수
+    index = np.arange(lots + 1)
+    pair_shares = np.maximum(cumulative[None, :] - cumulative[:, None], 0)
+    round_shares, pair_round = np.unique(pair_shares, return_inverse=True)
+    pair_round = pair_round.reshape(pair_shares.shape)
+    gifts, round_years = _round_gifts(round_shares, max_shares_per_year, len(years))
+
+    # round_cost[s, r]: s 년에 시작하는 회차 r 의 세금 합계 (현재가치). 기간 안에 끝나지 않으면 inf
+    round_cost = np.zeros((len(years), len(round_shares)))
+    values = np.zeros(round_cost.shape + (gifts.shape[1],))
+    for offset in range(gifts.shape[1]):
+        year = np.minimum(years + offset, horizon)
+        values[:, :, offset] = per_share[year][:, None] * gifts[None, :, offset]
+        # 같은 회차에서 최근 10년 안에 증여한 재산 합계
+        prior = values[:, :, max(0, offset - GIFT_AGGREGATION_YEARS + 1):offset].sum(axis=2)
+        tax = tax_function(values[:, :, offset], np.broadcast_to(gifts[:, offset], prior.shape), share_price,
+                           np.broadcast_to(year[:, None], prior.shape), prior)
+        round_cost += np.where(gifts[None, :, offset] > 0, tax / discount[year][:, None], 0.0)
+    round_cost[years[:, None] + round_years[None, :] - 1 > horizon] = np.inf
+    round_cost[:, round_shares == 0] = np.inf
+
+    # best[t, i]: i 번째 단위까지 증여했고 t 년부터 다음 회차를 시작할 수 있을 때의 최소 세금 (현재가치)
+    # 회차가 끝난 뒤 합산 기간이 지나야 다음 회차를 시작하므로 t 는 horizon 을 넘을 수 있음
+    best = np.full((horizon + GIFT_AGGREGATION_YEARS + 2, lots + 1), np.inf)
+    best[0, 0] = 0.0
+    previous = np.full(best.shape + (2,), -1)  # (이전 t, 이전 i). 기다린 경우 i 가 같음
+    finish_cost, finish = np.inf, None
+    for t in years:
+        for i in np.flatnonzero(np.isfinite(best[t, :lots])):
+            cost = best[t, i] + round_cost[t, pair_round[i]]
+            cost[:i + 1] = np.inf
+            if cost[lots] < finish_cost:
+                finish_cost, finish = cost[lots], (t, i)
+            targets = np.flatnonzero(np.isfinite(cost[:lots]))
+            next_t = t + round_years[pair_round[i, targets]] - 1 + GIFT_AGGREGATION_YEARS
+            better = cost[targets] < best[next_t, targets]
+            best[next_t[better], targets[better]] = cost[targets[better]]
+            previous[next_t[better], targets[better]] = (t, i)
+        # 회차를 시작하지 않고 다음 해로 넘김
+        wait = best[t] < best[t + 1]
+        best[t + 1, wait] = best[t, wait]
+        previous[t + 1, wait, 0] = t
+        previous[t + 1, wait, 1] = index[wait]
+
+    if finish is None:
+        return None
+
+    # 최적 계획 역추적: (회차 시작 연도, 시작 단위, 끝 단위)
+    rounds = []
+    t, i, j = finish[0], finish[1], lots
+    while True:
+        rounds.append((t, i, j))
+        while i > 0 or t > 0:
+            prev_t, prev_i = previous[t, i]
+            if prev_i != i:
+                break
+            t = prev_t
+        if i == 0:
+            break
+        (t, i), j = previous[t, i], i
+    rounds.reverse()
+
+    plan = []
+    for start, i, j in rounds:
+        window_values = []
+        for offset, gifted in enumerate(gifts[pair_round[i, j]]):
+            if gifted <= 0:
+                continue
+            year = start + offset
+            value = per_share[year] * gifted
+            prior = sum(window_values[-(GIFT_AGGREGATION_YEARS - 1):])
+            tax = float(tax_function(np.array([value]), np.array([gifted]), share_price, np.array([year]),
+                                     np.array([prior]))[0])
+            window_values.append(value)
+            plan.append({
+                "year": int(year),
+                "shares": float(gifted),
+                "perShareValue": float(per_share[year]),
+                "value": float(value),
+                "tax": tax,
+                "presentValueTax": tax / float(discount[year]),
+            })
+
+    # 비교: 한 해에 전부 증여 (연간 한도를 넘으면 불가)
+    all_shares = np.full(2, float(gift_shares))
+    baseline = tax_function(per_share[[0, horizon]] * all_shares, all_shares, share_price,
+                            np.array([0, horizon]), np.zeros(2)) / discount[[0, horizon]]
+    if max_shares_per_year is not None and gift_shares > max_shares_per_year:
+        baseline[:] = np.inf
+
+    return {
+        "plan": plan,
+        "totalTax": sum(item["tax"] for item in plan),
+        "totalPresentValueTax": float(finish_cost),
+        "giftNowTax": _finite_or_none(baseline[0]),
+        "giftAtHorizonTax": _finite_or_none(baseline[1]),
+        "perShareValues": per_share,
+    }
@@ -0,0 +1,174 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from valuation.params import parameter_key, pinned_parameters
+from valuation.simulation import calculate_future_stock_value_grid
+
+GRID_FIELDS = ("netAssetPerShare", "assetValueWithGoodwill", "incomeValue", "finalValue", "totalValue",
+               "ownedValue", "futureTotalEquity", "futureWeightedIncome")
+
+# 프로세스 풀은 한 번 만들어 재사용 (작업마다 프로세스를 새로 띄우지 않음)
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def get_executor(workers):
+    with _executors_lock:
+        if workers not in _executors:
+            _executors[workers] = ProcessPoolExecutor(max_workers=workers)
+        return _executors[workers]
+
+
+def shutdown():
+    """재사용 중인 프로세스 풀을 모두 종료합니다."""
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown()
+        _executors.clear()
+
+
+def _create_shared(shape, dtype):
+    dtype = np.dtype(dtype)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+    array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return shm, array, (shm.name, shape, dtype.str)
+
+
+def _attach(spec):
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _shards(n, workers, min_shard_size):
+    """0..n 구간을 워커 수에 맞게 (start, stop) 조각으로 나눕니다."""
+    count = max(1, min(workers, -(-n // min_shard_size)))
+    bounds = np.linspace(0, n, count + 1).astype(int)
+    return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+
+def _column_shard(kernel, input_specs, output_spec, fields, start, stop, parameter_version, kwargs):
+    shms, arrays = [], {}
+    columns = result = outputs = None
+    try:
+        for name, spec in input_specs.items():
+            shm, arrays[name] = _attach(spec)
+            shms.append(shm)
+        out_shm, outputs = _attach(output_spec)
+        shms.append(out_shm)
+        columns = {name: array[start:stop] for name, array in arrays.items()}
+        with pinned_parameters(parameter_version):
+            result = kernel(columns, **kwargs)
+        for i, field in enumerate(fields):
+            outputs[i, start:stop] = result[field]
+    finally:
+        # 공유 메모리를 닫기 전에 배열 참조를 먼저 해제해야 함
+        columns = result = outputs = None
+        arrays.clear()
+        for shm in shms:
+            shm.close()
+
+
+def shared_column_map(kernel, columns, fields, workers=None, min_shard_size=50000, **kwargs):
+    """kernel(columns, **kwargs) 를 행 구간별로 나누어 여러 프로세스에서 실행하고 fields 배열 dict 를 반환합니다.
+
+    columns 는 길이가 같은 1차원 numpy 배열의 dict 이고, kernel 은 모듈 최상위 함수로 fields 의 각 필드 배열을
+    담은 Mapping 을 반환해야 합니다. 입력 컬럼과 결과는 공유 메모리 버퍼로 주고받으므로 행 데이터를 pickle 하지
+    않으며, 각 워커는 자신에게 배정된 구간에만 결과(float64)를 기록하므로 결과 순서는 항상 입력 순서와 같습니다.
+    워커는 호출한 쪽과 같은 파라미터 버전으로 계산합니다. 행 수가 min_shard_size 이하이면 현재 프로세스에서 계산합니다.
+    """
+    workers = workers or default_workers()
+    n = len(next(iter(columns.values())))
+    if workers <= 1 or n <= min_shard_size:
+        result = kernel(columns, **kwargs)
+        return {field: np.asarray(result[field], dtype=np.float64) for field in fields}
+
+    blocks, input_specs = [], {}
+    array = outputs = None
+    try:
+        for name, column in columns.items():
+            column = np.asarray(column)
+            shm, array, input_specs[name] = _create_shared(column.shape, column.dtype)
+            blocks.append(shm)
+            array[:] = column
+        out_shm, outputs, output_spec = _create_shared((len(fields), n), np.float64)
+        blocks.append(out_shm)
+        executor = get_executor(workers)
+        parameter_version = parameter_key()[0]
+        futures = [executor.submit(_column_shard, kernel, input_specs, output_spec, tuple(fields), start, stop,
+                                   parameter_version, kwargs)
+                   for start, stop in _shards(n, workers, min_shard_size)]
+        for future in futures:
+            future.result()
+        result = {field: outputs[i].copy() for i, field in enumerate(fields)}
+    finally:
+        array = outputs = None
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+    return result
+
+
+def _grid_shard(output_spec, start, stop, stock_value, total_equity, shares, owned_shares,
+                interest_rate, evaluation_method, growth_rates, future_years, parameter_version):
+    out_shm, outputs = _attach(output_spec)
+    result = None
+    try:
+        with pinned_parameters(parameter_version):
+            result = calculate_future_stock_value_grid(stock_value, total_equity, shares, owned_shares,
+                                                       interest_rate, evaluation_method, growth_rates, future_years)
+        for i, field in enumerate(GRID_FIELDS):
+            outputs[i, start:stop] = result[field]
+    finally:
+        result = outputs = None
+        out_shm.close()
+
+
+def parallel_future_stock_value_grid(stock_value, total_equity, shares, owned_shares,
+                                     interest_rate, evaluation_method, growth_rates, future_years,
+                                     workers=None, min_shard_cells=200000):
+    """calculate_future_stock_value_grid 를 성장률 축으로 나누어 여러 프로세스에서 실행합니다.
+
+    격자 셀 수가 min_shard_cells 이하이면 프로세스 간 전달 비용이 계산보다 크므로 현재 프로세스에서 계산합니다.
+    """
+    if not stock_value:
+        return None
+    workers = workers or default_workers()
+    growth_rates = np.asarray(growth_rates, dtype=np.float64)
+    future_years = np.asarray(future_years, dtype=np.float64)
+    min_shard_size = max(1, min_shard_cells // max(1, len(future_years)))
+    if workers <= 1 or len(growth_rates) <= min_shard_size:
+        return calculate_future_stock_value_grid(stock_value, total_equity, shares, owned_shares,
+                                                 interest_rate, evaluation_method, growth_rates, future_years)
+
+    # 워커에는 필요한 값만 전달
+    stock_value = {"weightedIncome": stock_value["weightedIncome"]}
+    shape = (len(GRID_FIELDS), len(growth_rates), len(future_years))
+    out_shm, outputs, output_spec = _create_shared(shape, np.float64)
+    try:
+        executor = get_executor(workers)
+        parameter_version = parameter_key()[0]
+        futures = [
+            executor.submit(_grid_shard, output_spec, start, stop, stock_value, total_equity, shares,
+                            owned_shares, interest_rate, evaluation_method, growth_rates[start:stop],
+                            future_years, parameter_version)
+            for start, stop in _shards(len(growth_rates), workers, min_shard_size)
+        ]
+        for future in futures:
+            future.result()
+        result = {field: outputs[i].copy() for i, field in enumerate(GRID_FIELDS)}
+    finally:
+        outputs = None
+        out_shm.close()
+        out_shm.unlink()
+    result["growthRates"] = growth_rates
+    result["futureYears"] = future_years
+    return result
@@ -0,0 +1,140 @@
+import bisect
+import contextlib
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+import warnings
+
+# 기본 파라미터 파일 (환경변수 VALUATION_PARAMETERS 로 다른 파일 지정 가능)
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parameters.json")
+# 파일 변경 여부를 확인하는 최소 간격 (초)
+CHECK_INTERVAL = 1.0
+
+# 현재 실행 흐름(스레드/작업)에 고정된 파라미터 버전
+_pinned_version = contextvars.ContextVar("parameter_version", default=None)
+
+
+class ParameterStore:
+    """연도별 버전으로 관리되는 파라미터 파일을 한 번만 읽어 메모리에 보관합니다.
+
+    파일의 수정 시각/크기가 바뀌면 다음 조회 때 다시 읽으므로 서버를 재시작하지 않아도 반영됩니다.
+    다시 읽은 파일이 올바르지 않거나 파일을 읽을 수 없으면 경고를 내고 이전 파라미터를 계속 사용합니다.
+    """
+
+    def __init__(self, path=None, check_interval=CHECK_INTERVAL):
+        self.path = path or os.environ.get("VALUATION_PARAMETERS", DEFAULT_PATH)
+        self.check_interval = check_interval
+        # 환경변수 VALUATION_PARAMETER_VERSION 으로 프로세스 전체의 기본 버전을 고정할 수 있음
+        self.default_version = os.environ.get("VALUATION_PARAMETER_VERSION")
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._checked_at = None
+        self._versions = {}
+        self._years = []
+        self._digest = None
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                stat = os.stat(self.path)
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                if stamp == self._stamp:
+                    return
+                with open(self.path, "rb") as f:
+                    raw = f.read()
+            except OSError as e:
+                # 편집기가 파일을 바꿔치기하는 중이거나 파일이 삭제된 경우
+                if not self._versions:
+                    raise
+                warnings.warn(f"파라미터 파일을 읽을 수 없어 이전 값을 사용합니다: {self.path} ({e})")
+                return
+            try:
+                versions = {int(year): params for year, params in json.loads(raw)["versions"].items()}
+                if not versions:
+                    raise ValueError("versions 가 비어 있습니다")
+            except (ValueError, KeyError, TypeError) as e:
+                if not self._versions:
+                    raise ValueError(f"파라미터 파일을 읽을 수 없습니다: {self.path} ({e})") from e
+                warnings.warn(f"파라미터 파일을 읽을 수 없어 이전 값을 사용합니다: {self.path} ({e})")
+                return
+            self._versions = versions
+            self._years = sorted(versions)
+            self._digest = hashlib.sha256(raw).hexdigest()[:12]
+            self._stamp = stamp
+
+    def versions(self):
+        """사용 가능한 파라미터 버전(적용 시작 연도) 목록입니다."""
+        self._refresh()
+        return list(self._years)
+
+    def resolve(self, version=None):
+        """version 에 적용되는 버전을 찾습니다.
+
+        version 이 없으면 고정된 버전(pinned_parameters) 또는 최신 버전을, 연도를 지정하면 그 연도 이전의
+        가장 최근 버전을 사용합니다.
+        """
+        self._refresh()
+        if version is None:
+            version = _pinned_version.get() or self.default_version
+        if version is None:
+            return self._years[-1]
+        index = bisect.bisect_right(self._years, int(version)) - 1
+        if index < 0:
+            raise ValueError(f"{version}년 파라미터가 없습니다. {self._years[0]}년 이후만 지원합니다.")
+        return self._years[index]
+
+    def get(self, version=None):
+        """파라미터 dict 를 반환합니다. 공유 객체이므로 수정하지 마세요."""
+        year = self.resolve(version)
+        return self._versions[year]
+
+    def key(self, version=None):
+        """캐시 키에 넣을 (버전, 파일 내용 해시) 입니다. 파일이 바뀌면 같은 버전이라도 키가 달라집니다."""
+        return self.resolve(version), self._digest
+
+
+_store = ParameterStore()
+
+
+def get_store():
+    return _store
+
+
+def set_store(store):
+    """기본 파라미터 저장소를 바꿉니다 (다른 파라미터 파일 사용 시)."""
+    global _store
+    _store = store
+
+
+def get_parameters(version=None):
+    return _store.get(version)
+
+
+def parameter_key(version=None):
+    return _store.key(version)
+
+
+def parameter_versions():
+    return _store.versions()
+
+
+@contextlib.contextmanager
+def pinned_parameters(version):
+    """with 블록 안의 계산이 지정한 파라미터 버전을 사용하도록 고정합니다 (일괄 평가 재현용).
+
+    고정은 현재 스레드(contextvars)에만 적용되므로 다른 Streamlit 세션에는 영향을 주지 않습니다.
+    """
+    if version is not None:
+        _store.resolve(version)  # 없는 버전이면 바로 오류
+    token = _pinned_version.set(version)
+    try:
+        yield
+    finally:
+        _pinned_version.reset(token)
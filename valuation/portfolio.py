@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+
+from valuation.batch import (
+    calculate_future_stock_value_batch,
+    calculate_stock_value_batch,
+    calculate_tax_details_batch,
+    encode_evaluation_methods,
+)
+from valuation.core import method_texts
+from valuation.parallel import shared_column_map
+from valuation.params import pinned_parameters
+
+# 입력값 저장("데이터 저장 및 불러오기") 파일과 동일한 컬럼 구성
+PORTFOLIO_COLUMNS = [
+    "company_name",
+    "total_equity",
+    "net_income1",
+    "net_income2",
+    "net_income3",
+    "shares",
+    "owned_shares",
+    "share_price",
+    "interest_rate",
+    "evaluation_method",
+]
+# 평가 계산에 사용하는 숫자 입력 컬럼 (share_price 는 없으면 0)
+NUMERIC_COLUMNS = [
+    "total_equity",
+    "net_income1",
+    "net_income2",
+    "net_income3",
+    "shares",
+    "owned_shares",
+    "share_price",
+    "interest_rate",
+]
+REQUIRED_COLUMNS = [
+    "total_equity",
+    "net_income1",
+    "net_income2",
+    "net_income3",
+    "shares",
+    "owned_shares",
+    "interest_rate",
+]
+
+# 결과 컬럼 (주식가치 결과 페이지의 다운로드 항목과 동일한 이름)
+RESULT_COLUMNS = {
+    "netAssetPerShare": "순자산가치(주당)",
+    "incomeValue": "손익가치(주당)",
+    "assetValueWithGoodwill": "영업권고려후자산가치(주당)",
+    "finalValue": "최종평가액(주당)",
+    "totalValue": "회사총가치",
+    "ownedValue": "보유주식가치",
+    "increasePercentage": "증가율(%)",
+}
+TAX_COLUMNS = {
+    "inheritanceTax": "증여세",
+    "transferTax": "양도소득세",
+    "totalTax": "청산소득세",
+}
+FUTURE_COLUMNS = {
+    "finalValue": "미래 최종평가액(주당)",
+    "totalValue": "미래 회사총가치",
+    "ownedValue": "미래 보유주식가치",
+}
+FUTURE_TAX_COLUMNS = {
+    "inheritanceTax": "미래 증여세",
+    "transferTax": "미래 양도소득세",
+    "totalTax": "미래 청산소득세",
+}
+
+
+def read_portfolio(file, filename):
+    """업로드된 xlsx/csv/parquet 파일을 포트폴리오 DataFrame 으로 읽습니다 (검증은 valuation.importer)."""
+    from valuation.importer import read_table
+    return read_table(file, filename)
+
+
+def value_portfolio(df, growth_rate=None, future_years=None, parameter_version=None, workers=1):
+    """포트폴리오의 모든 행을 한 번에 평가하여 입력값 + 평가결과 + 세금 DataFrame 을 반환합니다.
+
+    growth_rate 와 future_years 를 지정하면 미래 주식가치와 미래 세금 컬럼을 함께 계산합니다.
+    parameter_version 을 지정하면 해당 연도 파라미터로 고정하여 계산합니다 (워커 프로세스에서도 동일).
+    workers 가 2 이상이면 숫자 컬럼을 공유 메모리에 올려 행 구간별로 여러 프로세스에서 계산합니다.
+    """
+    with pinned_parameters(parameter_version):
+        return _value_portfolio(df, growth_rate, future_years, workers)
+
+
+def value_columns(columns, growth_rate=None, future_years=None):
+    """NUMERIC_COLUMNS 와 methodCode 배열 dict 로 결과·세금 컬럼 배열 dict 를 계산합니다 (DataFrame 을 만들지 않음)."""
+    value = calculate_stock_value_batch(
+        columns["total_equity"],
+        columns["net_income1"],
+        columns["net_income2"],
+        columns["net_income3"],
+        columns["shares"],
+        columns["interest_rate"],
+        columns["methodCode"],
+        columns["owned_shares"],
+    )
+    tax = calculate_tax_details_batch(value["ownedValue"], columns["owned_shares"], columns["share_price"])
+    result = {column: value[key] for key, column in RESULT_COLUMNS.items()}
+    result.update((column, tax[key]) for key, column in TAX_COLUMNS.items())
+
+    if growth_rate is not None and future_years is not None:
+        future_value = calculate_future_stock_value_batch(
+            value,
+            columns["total_equity"],
+            columns["shares"],
+            columns["owned_shares"],
+            columns["interest_rate"],
+            columns["methodCode"],
+            growth_rate,
+            future_years,
+        )
+        future_tax = calculate_tax_details_batch(future_value["ownedValue"], columns["owned_shares"],
+                                                 columns["share_price"])
+        result.update((column, future_value[key]) for key, column in FUTURE_COLUMNS.items())
+        result.update((column, future_tax[key]) for key, column in FUTURE_TAX_COLUMNS.items())
+    return result
+
+
+def value_column_names(growth_rate=None, future_years=None):
+    """value_columns 가 반환하는 결과 컬럼 이름 (DataFrame 컬럼 순서)."""
+    names = list(RESULT_COLUMNS.values()) + list(TAX_COLUMNS.values())
+    if growth_rate is not None and future_years is not None:
+        names += list(FUTURE_COLUMNS.values()) + list(FUTURE_TAX_COLUMNS.values())
+    return names
+
+
+def _value_portfolio(df, growth_rate, future_years, workers):
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    n = len(df)
+    company_name = df["company_name"] if "company_name" in df.columns else pd.Series([""] * n, index=df.index)
+    evaluation_method = (df["evaluation_method"].fillna("일반법인").astype(str).to_numpy()
+                         if "evaluation_method" in df.columns else np.full(n, "일반법인"))
+
+    # 계산에는 숫자 컬럼 배열만 사용 (병렬 계산 시 이 배열들이 공유 메모리 버퍼로 전달됨)
+    columns = {col: (df[col].to_numpy(dtype=np.float64) if col in df.columns else np.zeros(n))
+               for col in NUMERIC_COLUMNS}
+    columns["methodCode"] = encode_evaluation_methods(evaluation_method)
+    values = shared_column_map(value_columns, columns, value_column_names(growth_rate, future_years), workers,
+                               growth_rate=growth_rate, future_years=future_years)
+
+    result = pd.DataFrame({
+        "회사명": company_name.to_numpy(),
+        "평가방법": np.asarray(method_texts())[columns["methodCode"]],
+        "자본총계": df["total_equity"].to_numpy(),
+        "총발행주식수": df["shares"].to_numpy(),
+        "보유주식수": df["owned_shares"].to_numpy(),
+    })
+    for column, value in values.items():
+        result[column] = value
+    return result
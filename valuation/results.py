@@ -0,0 +1,60 @@
+# 계산 결과 레코드 (대량으로 보관하는 결과에 dict 대신 __slots__ 객체를 사용해 결과 하나당 메모리를 줄임)
+#
+# calculate_stock_value 등 단건 계산 함수는 그대로 dict 를 반환하고, 레코드는 ResultBatch.row 처럼 많은 결과를
+# 보관하는 곳에서 사용합니다. 레코드는 읽기 전용 Mapping 이므로 result["finalValue"], result.get(...) 로 읽을 수 있고,
+# dict 와 값이 같으면 == 비교도 참입니다. JSON 저장이나 수정이 필요하면 to_dict() 사본을 사용하세요.
+from collections.abc import Mapping
+
+
+class _Record(Mapping):
+    __slots__ = ()
+    FIELDS = ()
+
+    def __init__(self, *values):
+        if len(values) != len(self.FIELDS):
+            raise TypeError(f"{type(self).__name__} 에는 값 {len(self.FIELDS)}개가 필요합니다 (받은 값: {len(values)}개)")
+        for field, value in zip(self.FIELDS, values):
+            object.__setattr__(self, field, value)
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __contains__(self, key):
+        return key in self.FIELDS
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} 는 수정할 수 없습니다 (to_dict() 사본을 사용하세요)")
+
+    def __reduce__(self):
+        return type(self), tuple(getattr(self, field) for field in self.FIELDS)
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self):
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.FIELDS)
+        return f"{type(self).__name__}({values})"
+
+
+class StockValue(_Record):
+    """calculate_stock_value 결과 dict 와 같은 필드의 레코드입니다."""
+
+    FIELDS = ("netAssetPerShare", "assetValueWithGoodwill", "incomeValue", "finalValue", "totalValue",
+              "ownedValue", "methodText", "increasePercentage", "weightedIncome")
+    __slots__ = FIELDS
+
+
+class FutureStockValue(_Record):
+    """calculate_future_stock_value 결과 dict 와 같은 필드의 레코드입니다."""
+
+    FIELDS = ("netAssetPerShare", "assetValueWithGoodwill", "incomeValue", "finalValue", "totalValue",
+              "ownedValue", "methodText", "futureTotalEquity", "futureWeightedIncome", "growthRate", "futureYears")
+    __slots__ = FIELDS
@@ -0,0 +1,108 @@
+import numpy as np
+
+from valuation.batch import (
+    EVALUATION_METHODS,
+    calculate_future_stock_value_batch,
+    calculate_stock_value_batch,
+)
+
+# 민감도 분석 대상 숫자 입력값
+PRESENT_INPUTS = ("total_equity", "net_income1", "net_income2", "net_income3", "shares", "interest_rate",
+                  "owned_shares")
+FUTURE_INPUTS = ("growth_rate", "future_years")
+
+
+def evaluate_scenarios(columns, future=False):
+    """입력값 컬럼(dict)의 모든 시나리오를 한 번의 배열 연산으로 평가합니다.
+
+    future 가 True 이면 growth_rate, future_years 컬럼으로 미래 주식가치를 계산해 반환합니다.
+    """
+    value = calculate_stock_value_batch(
+        columns["total_equity"], columns["net_income1"], columns["net_income2"], columns["net_income3"],
+        columns["shares"], columns["interest_rate"], columns["evaluation_method"], columns["owned_shares"],
+    )
+    if not future:
+        return value
+    return calculate_future_stock_value_batch(
+        value, columns["total_equity"], columns["shares"], columns["owned_shares"], columns["interest_rate"],
+        value["methodCode"], columns["growth_rate"], columns["future_years"],
+    )
+
+
+def _scenario_columns(base, overrides):
+    """기준 입력값에 시나리오별 변경값(overrides: 입력값 → 배열)을 적용한 컬럼을 만듭니다."""
+    n = max(len(values) for values in overrides.values())
+    columns = {}
+    for name, value in base.items():
+        if name in overrides:
+            columns[name] = np.asarray(overrides[name])
+        elif name == "evaluation_method":
+            columns[name] = np.full(n, value, dtype=object).astype(str)
+        else:
+            columns[name] = np.full(n, value, dtype=np.float64)
+    return columns
+
+
+def tornado_analysis(base, ranges=None, spread=0.2, output="finalValue", future=False):
+    """입력값을 하나씩 하한/상한으로 바꿨을 때의 결과 변화를 계산합니다 (토네이도 차트용).
+
+    base 는 입력값 dict (calculate_stock_value 인자, 미래 가치는 growth_rate, future_years 포함),
+    ranges 는 입력값별 (하한, 상한) 이며 지정하지 않은 입력값은 기준값 ±spread 비율을 사용합니다.
+    평가 방식은 세 가지 방식을 모두 평가하여 최솟값/최댓값을 범위로 사용합니다.
+    결과는 영향(swing)이 큰 순서로 정렬된 목록과 기준 결과값입니다.
+    """
+    ranges = dict(ranges or {})
+    names = [name for name in PRESENT_INPUTS + (FUTURE_INPUTS if future else ()) if name in base]
+    for name in names:
+        if name not in ranges:
+            ranges[name] = (base[name] * (1 - spread), base[name] * (1 + spread))
+    names = [name for name in names if name in ranges]
+
+    # 0행: 기준값, 이후 입력값별 하한/상한, 마지막으로 평가 방식별 시나리오
+    rows = 1 + 2 * len(names) + len(EVALUATION_METHODS)
+    overrides = {name: np.full(rows, base[name], dtype=np.float64) for name in names}
+    for i, name in enumerate(names):
+        overrides[name][1 + 2 * i] = ranges[name][0]
+        overrides[name][2 + 2 * i] = ranges[name][1]
+    methods = np.full(rows, base["evaluation_method"], dtype=object)
+    methods[1 + 2 * len(names):] = EVALUATION_METHODS
+    overrides["evaluation_method"] = methods.astype(str)
+
+    values = evaluate_scenarios(_scenario_columns(base, overrides), future=future)[output]
+    base_value = float(values[0])
+
+    results = []
+    for i, name in enumerate(names):
+        low_value, high_value = float(values[1 + 2 * i]), float(values[2 + 2 * i])
+        results.append({
+            "input": name,
+            "low": ranges[name][0],
+            "high": ranges[name][1],
+            "lowValue": low_value,
+            "highValue": high_value,
+            "swing": abs(high_value - low_value),
+        })
+    method_values = values[1 + 2 * len(names):]
+    results.append({
+        "input": "evaluation_method",
+        "low": EVALUATION_METHODS[int(np.argmin(method_values))],
+        "high": EVALUATION_METHODS[int(np.argmax(method_values))],
+        "lowValue": float(method_values.min()),
+        "highValue": float(method_values.max()),
+        "swing": float(method_values.max() - method_values.min()),
+    })
+    results.sort(key=lambda item: item["swing"], reverse=True)
+    return results, base_value
+
+
+def heatmap_analysis(base, x_input, x_values, y_input, y_values, output="finalValue", future=False):
+    """두 입력값을 동시에 바꾼 격자 전체의 결과를 한 번에 계산합니다.
+
+    shape (len(y_values), len(x_values)) 배열을 반환합니다.
+    """
+    x_values = np.asarray(x_values, dtype=np.float64)
+    y_values = np.asarray(y_values, dtype=np.float64)
+    x_grid, y_grid = np.meshgrid(x_values, y_values)
+    overrides = {x_input: x_grid.ravel(), y_input: y_grid.ravel()}
+    values = evaluate_scenarios(_scenario_columns(base, overrides), future=future)[output]
+    return values.reshape(len(y_values), len(x_values))
@@ -0,0 +1,44 @@
+import numpy as np
+
+from valuation.batch import _value_kernel, encode_evaluation_methods
+
+
+def growth_rate_range(start, stop, step):
+    """start ~ stop (포함) 구간의 성장률(%) 배열을 step 간격으로 만듭니다."""
+    if step <= 0:
+        raise ValueError("성장률 간격은 0보다 커야 합니다.")
+    # stop 을 넘지 않는 마지막 배수까지 (나눠떨어지는 경우의 부동소수점 오차는 허용)
+    count = int(np.floor((stop - start) / step + 1e-9)) + 1
+    if count < 1:
+        raise ValueError("성장률 범위가 올바르지 않습니다.")
+    # 0.1% 간격 등에서 부동소수점 오차가 누적되지 않도록 정수 배수로 생성
+    return np.round(start + np.arange(count) * step, 10)
+
+
+def calculate_future_stock_value_grid(stock_value, total_equity, shares, owned_shares,
+                                      interest_rate, evaluation_method, growth_rates, future_years):
+    """성장률 × 예측기간 전체 격자의 미래 주식가치를 한 번에 계산합니다.
+
+    calculate_future_stock_value 를 (growth_rates[i], future_years[j]) 마다 호출한 결과와 같은 값(부동소수점
+    반올림 오차 이내)을 shape (len(growth_rates), len(future_years)) 배열로 담은 dict 를 반환합니다.
+    """
+    if not stock_value:
+        return None
+
+    growth_rates = np.asarray(growth_rates, dtype=np.float64)
+    future_years = np.asarray(future_years, dtype=np.float64)
+
+    # 복리 성장률 적용 (성장률 축 × 기간 축 브로드캐스팅)
+    growth_factor = (1 + (growth_rates[:, None] / 100)) ** future_years[None, :]
+
+    # 미래 자산 및 수익 계산
+    future_total_equity = total_equity * growth_factor
+    future_weighted_income = stock_value["weightedIncome"] * growth_factor
+
+    result = _value_kernel(future_total_equity, future_weighted_income, float(shares), float(owned_shares),
+                           float(interest_rate), encode_evaluation_methods(evaluation_method))
+    result["futureTotalEquity"] = future_total_equity
+    result["futureWeightedIncome"] = future_weighted_income
+    result["growthRates"] = growth_rates
+    result["futureYears"] = future_years
+    return result
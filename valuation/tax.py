@@ -0,0 +1,92 @@
+import numpy as np
+
+from valuation.cache import get_cache
+from valuation.params import get_parameters, parameter_key
+
+# 세율표 파라미터 버전(및 파일 해시)별로 구간 배열을 미리 계산해 둔 캐시
+_compiled = get_cache("tax_tables", maxsize=16)
+
+
+def _compile_brackets(brackets):
+    """구간 하한, 세율 배열과 각 구간 하한까지의 누적 세액(누진공제 반영)을 계산합니다."""
+    lower = np.asarray(brackets["lower"], dtype=np.float64)
+    rates = np.asarray(brackets["rates"], dtype=np.float64)
+    base_tax = np.concatenate(([0.0], np.cumsum(np.diff(lower) * rates[:-1])))
+    return lower, rates, base_tax
+
+
+def get_tax_table(tax_year):
+    """tax_year 에 적용되는 세율표(파라미터 파일의 tax 항목)를 구간 배열이 미리 계산된 형태로 반환합니다."""
+    # 키는 연도가 아니라 적용되는 버전이므로 같은 버전을 쓰는 연도들은 세율표 하나를 공유
+    key = parameter_key(tax_year)
+    table = _compiled.get(key)
+    if table is None:
+        table = dict(get_parameters(tax_year)["tax"])
+        for name in ("inheritance", "corporate", "transfer"):
+            table[name] = _compile_brackets(table[name])
+        table["year"] = key[0]
+        _compiled.set(key, table)
+    return table
+
+
+def progressive_tax(base, brackets):
+    """과세표준 배열에 누진세율을 적용합니다. 구간은 np.searchsorted 로 한 번에 찾습니다."""
+    lower, rates, base_tax = brackets
+    base = np.maximum(np.asarray(base, dtype=np.float64), 0.0)
+    index = np.searchsorted(lower, base, side="right") - 1
+    return base_tax[index] + (base - lower[index]) * rates[index]
+
+
+def calculate_progressive_tax_details_batch(owned_value, owned_shares, share_price, tax_year, prior_gifts=0,
+                                            gift_deduction=None):
+    """calculate_tax_details_batch 와 같은 필드를 누진세율표로 계산합니다.
+
+    증여세는 최근 10년 내 동일인 증여재산(prior_gifts)을 합산한 과세표준에서 증여재산공제를 뺀 뒤 누진세율을
+    적용하고, 합산분에 대한 세액(기납부세액)을 차감합니다. gift_deduction 을 지정하지 않으면 세율표 값을 사용합니다.
+    양도소득세는 대주주 세율에 지방소득세를, 청산소득세는 법인세 누진세율과 배당소득세율을 적용합니다.
+    taxYear 는 요청한 연도(지정하지 않으면 적용된 버전), tableVersion 은 실제로 적용된 세율표 버전입니다.
+    """
+    table = get_tax_table(tax_year)
+    owned_value = np.asarray(owned_value, dtype=np.float64)
+    owned_shares = np.asarray(owned_shares, dtype=np.float64)
+    share_price = np.asarray(share_price, dtype=np.float64)
+    prior_gifts = np.asarray(prior_gifts, dtype=np.float64)
+    deduction = table["giftDeduction"] if gift_deduction is None else gift_deduction
+
+    # 상속증여세 (10년 합산, 증여재산공제)
+    gift_tax_base = np.maximum(prior_gifts + owned_value - deduction, 0.0)
+    prior_tax = progressive_tax(prior_gifts - deduction, table["inheritance"])
+    inheritance_tax = progressive_tax(gift_tax_base, table["inheritance"]) - prior_tax
+
+    # 양도소득세 (대주주 세율 + 지방소득세)
+    acquisition_value = owned_shares * share_price
+    transfer_profit = owned_value - acquisition_value
+    transfer_tax = progressive_tax(transfer_profit, table["transfer"]) * (1 + table["transferLocalRate"])
+
+    # 청산소득세 계산
+    corporate_tax = progressive_tax(owned_value, table["corporate"])
+    after_tax_value = owned_value - corporate_tax
+    liquidation_tax = after_tax_value * table["dividendRate"]
+
+    return {
+        "inheritanceTax": inheritance_tax,
+        "transferTax": transfer_tax,
+        "corporateTax": corporate_tax,
+        "liquidationTax": liquidation_tax,
+        "acquisitionValue": acquisition_value,
+        "transferProfit": transfer_profit,
+        "afterTaxValue": after_tax_value,
+        "totalTax": corporate_tax + liquidation_tax,
+        "giftTaxBase": gift_tax_base,
+        "taxYear": table["year"] if tax_year is None else int(tax_year),
+        "tableVersion": table["year"],
+    }
+
+
+def calculate_progressive_tax_details(value, owned_shares, share_price, tax_year, prior_gifts=0):
+    """calculate_progressive_tax_details_batch 의 단일 회사 버전입니다."""
+    if not value:
+        return None
+    details = calculate_progressive_tax_details_batch(value["ownedValue"], owned_shares, share_price, tax_year,
+                                                      prior_gifts)
+    return {key: item if key in ("taxYear", "tableVersion") else float(item) for key, item in details.items()}